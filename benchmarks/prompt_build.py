@@ -0,0 +1,115 @@
+"""
+Benchmark of the time it takes the ReAct agent to build the prompt of a step.
+
+Compares rendering the whole template with `str.format` on every step (what the agent
+used to do) with the compiled template, where the static sections are rendered once
+per agent configuration.
+
+Run with:
+    python -m benchmarks.prompt_build
+"""
+
+import json
+import timeit
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from paaf.agents import ReactAgent
+from paaf.llms.base_llm import BaseLLM
+from paaf.models.react import ReactAgentActionType, ReactAgentResponse
+from paaf.models.react.react_run_state import ReactSession
+from paaf.models.shared_models import Message
+from paaf.tools.tool_registory import ToolRegistry
+
+
+class Report(BaseModel):
+    title: str = Field(..., description="Title of the report")
+    summary: str = Field(..., description="Short summary of the findings")
+    sources: List[str] = Field(..., description="Where the findings come from")
+
+
+class NoopLLM(BaseLLM):
+    def generate(self, prompt: str, response_format=None):
+        raise NotImplementedError("The benchmark doesn't call the LLM.")
+
+
+def build_registry(tool_count: int) -> ToolRegistry:
+    registry = ToolRegistry()
+    for index in range(tool_count):
+
+        def tool(query: str, limit: int = 10) -> str:
+            """
+            Search a data source.
+
+            query: What to search for
+            limit: Maximum number of results
+            """
+            return query
+
+        tool.__name__ = f"search_{index}"
+        registry.register_tool(tool)
+
+    return registry
+
+
+def legacy_build_prompt(agent: ReactAgent, session: ReactSession) -> str:
+    """Build the prompt the way `think()` did before templates were compiled."""
+    answer_structure = ReactAgentResponse.get_example_json_for_action(
+        action_type=ReactAgentActionType.ANSWER,
+    )
+    answer_structure["answer"] = agent.get_output_format()
+
+    handoff_structure = "null"
+    if agent.handoffs_enabled and agent.handoff_capabilities:
+        handoff_structure = json.dumps(
+            ReactAgentResponse.get_example_json_for_action(
+                action_type=ReactAgentActionType.HANDOFF,
+            )
+        )
+
+    tool_call_json = json.dumps(
+        ReactAgentResponse.get_example_json_for_action(
+            action_type=ReactAgentActionType.TOOL_CALL,
+        )
+    )
+
+    return agent.template.format(
+        system_prompt=agent.get_system_prompt(),
+        query=session.query,
+        history=agent.load_message_history(session),
+        tools=[tool.to_dict() for tool in agent.tools_registry.available_tools()],
+        tool_call_structure=tool_call_json,
+        answer_structure=answer_structure,
+        available_agents=agent.get_available_agents_description(),
+        handoff_structure=handoff_structure,
+    )
+
+
+def main(tool_count: int = 20, history_length: int = 10, number: int = 2000):
+    agent = ReactAgent(
+        llm=NoopLLM(),
+        tool_registry=build_registry(tool_count),
+        output_format=Report,
+    )
+
+    session = agent.start("Write a short report about the history of Lagos.")
+    for index in range(history_length):
+        session.messages.append(
+            Message(role="assistant", content=f"Observation {index}: some result")
+        )
+
+    # Both approaches must build the exact same prompt
+    assert legacy_build_prompt(agent, session) == agent._build_prompt(session)
+
+    legacy = timeit.timeit(lambda: legacy_build_prompt(agent, session), number=number)
+    compiled = timeit.timeit(lambda: agent._build_prompt(session), number=number)
+
+    print(f"Tools: {tool_count}, history messages: {history_length + 1}")
+    print(f"str.format per step:  {legacy / number * 1e6:8.1f} us")
+    print(f"compiled per step:    {compiled / number * 1e6:8.1f} us")
+    print(f"speedup:              {legacy / compiled:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
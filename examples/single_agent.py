@@ -147,6 +147,9 @@ def single_agent_example():
 
     response = react_agent.run("I have a problem, please help me solve it.")
 
+    # Steps are delivered on a background thread; wait for the last ones to print
+    react_agent.events.flush()
+
     output: OutputFormat = response.content
     print("Response:", output.answer)
     print()
@@ -1,17 +1,46 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Any
+import asyncio
+import json
+import threading
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
 from pydantic import BaseModel
 
+from paaf.checkpoints.base_checkpoint_store import BaseCheckpointStore
+from paaf.config.logging import get_logger
 from paaf.llms.base_llm import BaseLLM
 from paaf.models.multi_agent_architecture import AgentArchitectureType
 from paaf.models.shared_models import Message
 from paaf.models.tool import Tool
+from paaf.models.utils.json_extraction import extract_json, parse_json_as
 from paaf.models.utils.model_example_json_generator import generate_example_json
+from paaf.models.utils.prompt_template import CompiledTemplate
 from paaf.models.agent_handoff import HandoffCapability, AgentHandoff
 from paaf.models.agent_response import AgentResponse
 from paaf.tools.tool_registory import ToolRegistry
 
+logger = get_logger(__name__)
+
+SessionT = TypeVar("SessionT", bound=BaseModel)
+
+JSON_REPAIR_PROMPT = """Your previous response could not be used: {error}
+
+Previous response:
+{response}
+
+Respond again with only the corrected JSON and no other text.{expected}"""
+
 
 class BaseAgent(ABC):
     """
@@ -40,6 +69,16 @@ class BaseAgent(ABC):
         self.handoffs_enabled = False
         self.system_prompt = system_prompt or self.get_default_system_prompt()
 
+        # Prompt templates with their static fields rendered, keyed by template name
+        self._compiled_prompts: Dict[str, Tuple[tuple, CompiledTemplate]] = {}
+        self._handoffs_version = 0
+
+        # Where run sessions are checkpointed after each step, if anywhere
+        self.checkpoint_store: Optional[BaseCheckpointStore] = None
+
+        # Extra LLM calls allowed to fix a response whose JSON couldn't be repaired locally
+        self.max_json_repairs = 1
+
     def get_default_system_prompt(self) -> str:
         """
         Get the default system prompt for this agent type.
@@ -75,6 +114,168 @@ Key principles:
         """
         pass
 
+    def save_session(self, session: BaseModel):
+        """
+        Checkpoint the state of a run, if the agent has a checkpoint store.
+
+        A failing store doesn't fail the run; it's logged and the run carries on.
+        """
+        if self.checkpoint_store is None:
+            return
+
+        try:
+            # Tool results can be anything, so fall back to their string form
+            state = session.model_dump_json(fallback=str)
+            self.checkpoint_store.save(session.run_id, state)
+        except Exception as e:
+            logger.error(f"Failed to checkpoint run {session.run_id}: {e}")
+
+    def load_session(self, run_id: str, session_type: Type[SessionT]) -> SessionT:
+        """
+        Load the last checkpoint of a run.
+
+        Args:
+            run_id: The id of the run.
+            session_type: The session model of the agent.
+
+        Returns:
+            The session of the run, as of its last completed step.
+
+        Raises:
+            ValueError: If the agent has no checkpoint store or the run has no checkpoint.
+        """
+        if self.checkpoint_store is None:
+            raise ValueError("The agent has no checkpoint store to resume runs from.")
+
+        state = self.checkpoint_store.load(run_id)
+        if state is None:
+            raise ValueError(f"No checkpoint found for run {run_id}.")
+
+        return session_type.model_validate_json(state)
+
+    def parse_llm_json(self, response: Any, target: Any = None) -> Any:
+        """
+        Parse the JSON value of an LLM response.
+
+        Prose around the JSON, code fences, trailing commas and cut off output are
+        handled locally (see `extract_json`). Only if that fails is the LLM asked to
+        correct its response, at most `max_json_repairs` times.
+
+        Args:
+            response: The LLM response.
+            target: The type to validate the value against, e.g. a pydantic model.
+                The value is returned as parsed if not given.
+
+        Returns:
+            Any: The parsed (and validated) value.
+
+        Raises:
+            ValueError: If no valid value could be obtained.
+        """
+        repairs = 0
+        while True:
+            try:
+                if target is None:
+                    return extract_json(response)
+                return parse_json_as(response, target)
+            except ValueError as e:
+                if repairs >= self.max_json_repairs:
+                    raise ValueError(
+                        f"Could not parse the LLM response as {getattr(target, '__name__', target or 'JSON')}: {e}"
+                    ) from e
+
+                repairs += 1
+                logger.warning(
+                    f"LLM response isn't valid JSON, asking for a corrected one ({repairs}/{self.max_json_repairs}): {e}"
+                )
+                response = self.llm.generate(
+                    prompt=self._json_repair_prompt(response, target, e)
+                )
+
+    def _json_repair_prompt(self, response: Any, target: Any, error: Exception) -> str:
+        """Prompt asking the LLM to correct a response that couldn't be parsed."""
+        expected = ""
+        if isinstance(target, type) and issubclass(target, BaseModel):
+            example = json.dumps(generate_example_json(target))
+            expected = f"\n\nExpected structure:\n{example}"
+
+        return JSON_REPAIR_PROMPT.format(
+            error=error, response=response, expected=expected
+        )
+
+    def run_stream(self, query: str, **kwargs) -> Iterator[Any]:
+        """
+        Run the agent, yielding its steps as they happen.
+
+        The last item yielded is the final AgentResponse. Agents that report progress
+        override this; by default the run has no intermediate steps.
+
+        Args:
+            query: The user query to process
+            **kwargs: Passed on to `run()`.
+        """
+        yield self.run(query, **kwargs)
+
+    async def arun_stream(
+        self, query: str, max_buffer: int = 16, **kwargs
+    ) -> AsyncIterator[Any]:
+        """
+        Async version of `run_stream()`.
+
+        The run executes on a worker thread and hands its steps over through a queue of
+        at most `max_buffer` items, so a slow consumer pauses the run instead of
+        letting steps pile up. Closing the iterator early stops the run after the step
+        in progress.
+
+        Args:
+            query: The user query to process
+            max_buffer: Maximum number of steps produced but not consumed yet.
+            **kwargs: Passed on to `run_stream()`.
+        """
+        loop = asyncio.get_running_loop()
+        buffer: asyncio.Queue = asyncio.Queue(maxsize=max_buffer)
+        stop = threading.Event()
+        done = object()
+
+        def hand_over(item, error=None):
+            asyncio.run_coroutine_threadsafe(buffer.put((item, error)), loop).result()
+
+        def produce():
+            try:
+                stream = self.run_stream(query, **kwargs)
+                try:
+                    for item in stream:
+                        if stop.is_set():
+                            return
+                        hand_over(item)
+                        # Don't start another step for a consumer that went away
+                        if stop.is_set():
+                            return
+                finally:
+                    stream.close()
+            except BaseException as e:
+                if not stop.is_set():
+                    hand_over(None, e)
+                return
+            hand_over(done)
+
+        producer = loop.run_in_executor(None, produce)
+        try:
+            while True:
+                item, error = await buffer.get()
+                if error is not None:
+                    raise error
+                if item is done:
+                    break
+                yield item
+        finally:
+            stop.set()
+            # Unblock the producer if it's waiting for room in the buffer
+            while not buffer.empty():
+                buffer.get_nowait()
+            if producer.done():
+                await producer
+
     def get_output_format(self) -> dict | str | None:
         """
         Get the output format as a JSON-compatible dictionary.
@@ -90,6 +291,53 @@ Key principles:
         """Enable handoffs and set available agent capabilities."""
         self.handoff_capabilities = capabilities
         self.handoffs_enabled = True
+        self._handoffs_version += 1
+
+    def _prompt_config_key(self) -> tuple:
+        """
+        Key of everything the static parts of the prompts are rendered from.
+
+        It's cheap to build (no serialization), so it can be checked on every step.
+        """
+        return (
+            self.system_prompt,
+            self.output_format,
+            self.handoffs_enabled,
+            self._handoffs_version,
+            self.tools_registry.catalog_fingerprint(),
+        )
+
+    def get_compiled_prompt(
+        self,
+        name: str,
+        template: str,
+        static_values: Callable[[], Dict[str, Any]],
+    ) -> CompiledTemplate:
+        """
+        Get a prompt template with its static fields already rendered.
+
+        The static fields are only rendered again when the template or the agent
+        configuration (system prompt, output format, handoffs, available tools) changes,
+        so building a prompt on each step only has to fill in the dynamic fields.
+
+        Args:
+            name: Name the compiled template is cached under.
+            template: The template text.
+            static_values: Builds the values of the static fields. Only called when
+                the template has to be compiled again.
+
+        Returns:
+            CompiledTemplate: The template, left with only its dynamic fields.
+        """
+        key = (template, self._prompt_config_key())
+
+        cached = self._compiled_prompts.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        compiled = CompiledTemplate(template).partial(**static_values())
+        self._compiled_prompts[name] = (key, compiled)
+        return compiled
 
     def should_handoff(self, query: str) -> Optional[AgentHandoff]:
         """
@@ -1,13 +1,20 @@
 import json
-from typing import List, Optional
+from typing import Iterator, Optional, Union
 from pydantic import BaseModel
 
 from paaf.config.logging import get_logger
 from paaf.agents.base_agent import BaseAgent
 from paaf.llms.base_llm import BaseLLM
 from paaf.models.shared_models import Message
+from paaf.models.chain_of_thought.chain_of_thought_models import ChainOfThoughtSession
 from paaf.models.agent_handoff import AgentHandoff
 from paaf.models.agent_response import AgentResponse
+from paaf.models.agent_step_event import AgentStepEvent
+from paaf.models.utils.json_extraction import (
+    JSONExtractionError,
+    extract_json,
+    strip_code_fence,
+)
 from paaf.models.react.react_agent_response import (
     ReactAgentActionType,
     ReactAgentResponse,
@@ -38,9 +45,9 @@ class ChainOfThoughtAgent(BaseAgent):
             system_prompt=system_prompt,
         )
         self.max_steps = max_steps
-        self.messages: List[Message] = []
-        self.current_step = 0
-        self.query = None
+
+        # The conversation of each run lives in a ChainOfThoughtSession, so the
+        # agent itself holds configuration only.
 
         self.load_template()
 
@@ -91,18 +98,53 @@ Key principles:
         Returns:
             AgentResponse: The response with potential handoff information
         """
-        self.query = query
-        self.messages = [Message(role="user", content=query)]
-        self.current_step = 0
+        session = ChainOfThoughtSession(
+            query=query,
+            messages=[Message(role="user", content=query)],
+        )
+
+        return self._start_reasoning(session)
+
+    def run_stream(self, query: str) -> Iterator[Union[AgentStepEvent, AgentResponse]]:
+        """
+        Run the Chain of Thought agent, yielding its reasoning steps.
+
+        The whole chain comes back from a single LLM call, so the steps are yielded
+        together once it returns.
+
+        Args:
+            query: The user query to process
+
+        Yields:
+            An AgentStepEvent per reasoning step given by the model, then the final
+            AgentResponse.
+        """
+        session = ChainOfThoughtSession(
+            query=query,
+            messages=[Message(role="user", content=query)],
+        )
+
+        response = self._start_reasoning(session)
+
+        for step_number, step in enumerate(session.reasoning_steps, start=1):
+            details = step if isinstance(step, dict) else {"reasoning": step}
+            yield AgentStepEvent(
+                run_id=session.run_id,
+                agent_name=self.__class__.__name__,
+                step_type="reasoning",
+                step_number=step_number,
+                description=details.get("step_description") or details.get("reasoning"),
+                details=details,
+            )
 
-        return self._start_reasoning()
+        yield response
 
-    def _start_reasoning(self) -> AgentResponse:
+    def _start_reasoning(self, session: ChainOfThoughtSession) -> AgentResponse:
         """Start the reasoning process with handoff awareness."""
         # Remove immediate handoff check - let LLM decide through reasoning
 
         # Perform step-by-step reasoning
-        reasoning_result = self._perform_structured_reasoning()
+        reasoning_result = self._perform_structured_reasoning(session)
 
         # Check if the result indicates a handoff
         if (
@@ -113,7 +155,7 @@ Key principles:
 
         # Generate final answer
         final_answer = reasoning_result
-        return self.wrap_response_with_handoff_check(final_answer, self.query)
+        return self.wrap_response_with_handoff_check(final_answer, session.query)
 
     def should_handoff(self, query: str) -> Optional[AgentHandoff]:
         """
@@ -121,15 +163,31 @@ Key principles:
         """
         return None
 
-    def _perform_structured_reasoning(self):
-        """Perform structured reasoning using the template."""
-        # Prepare the prompt using the template
+    def _static_prompt_values(self) -> dict:
+        """
+        Values of the template fields that only depend on the agent configuration.
+        """
         reasoning_steps_structure = {
             "step_number": 1,
             "step_description": "Analyze the query and identify key components",
             "reasoning": "Detailed reasoning for this step",
         }
 
+        output_format = self.get_output_format()
+        if output_format is None:
+            output_format = "string"
+
+        return {
+            "system_prompt": self.get_system_prompt(),
+            "tools": [tool.to_dict() for tool in self.tools_registry.available_tools()],
+            "available_agents": self.get_available_agents_description(),
+            "reasoning_steps_structure": json.dumps(reasoning_steps_structure),
+            "output_format": json.dumps(output_format),
+        }
+
+    def _perform_structured_reasoning(self, session: ChainOfThoughtSession):
+        """Perform structured reasoning using the template."""
+        # The handoff example carries the query, so it's rendered per run
         handoff_structure = "null"
         if self.handoffs_enabled and self.handoff_capabilities:
             handoff_structure = json.dumps(
@@ -137,42 +195,40 @@ Key principles:
                     "agent_name": "specialist_agent_name",
                     "context": "Reason for handoff to specialist",
                     "input_data": {
-                        "original_query": self.query,
+                        "original_query": session.query,
                         "domain": "relevant_domain",
                     },
                 }
             )
 
-        output_format = self.get_output_format()
-        if output_format is None:
-            output_format = "string"
-
-        prompt = self.template.format(
-            system_prompt=self.get_system_prompt(),
-            query=self.query,
+        compiled = self.get_compiled_prompt(
+            "chain_of_thought", self.template, self._static_prompt_values
+        )
+        prompt = compiled.render(
+            query=session.query,
             max_steps=self.max_steps,
-            history=self._format_message_history(),
-            tools=[tool.to_dict() for tool in self.tools_registry.tools.values()],
-            available_agents=self.get_available_agents_description(),
+            history=self._format_message_history(session),
             handoff_structure=handoff_structure,
-            reasoning_steps_structure=json.dumps(reasoning_steps_structure),
-            output_format=json.dumps(output_format),
         )
 
         # Generate response from LLM
         llm_response = self.llm.generate(prompt=prompt)
 
         # Parse the response
-        return self._parse_reasoning_response(llm_response)
+        return self._parse_reasoning_response(session, llm_response)
 
-    def _parse_reasoning_response(self, response: str):
+    def _parse_reasoning_response(self, session: ChainOfThoughtSession, response: str):
         """Parse the LLM response and handle different action types."""
-        clean_response = response.strip().strip("`").strip()
-        if clean_response.startswith("json"):
-            clean_response = clean_response[4:].strip()
+        clean_response = strip_code_fence(response)
 
         try:
-            response_json = json.loads(clean_response)
+            response_json = extract_json(clean_response)
+            if not isinstance(response_json, dict):
+                raise JSONExtractionError("Expected a JSON object", clean_response)
+
+            reasoning_steps = response_json.get("reasoning_steps")
+            if isinstance(reasoning_steps, list):
+                session.reasoning_steps = reasoning_steps
 
             # Check if this is a handoff response
             if "handoff" in response_json and response_json["handoff"]:
@@ -186,38 +242,38 @@ Key principles:
 
             # Check if this is a tool usage response
             elif "tool_usage" in response_json and response_json["tool_usage"]:
-                return self._handle_tool_usage(response_json)
+                return self._handle_tool_usage(session, response_json)
 
             # Otherwise, treat as final reasoning result
             else:
                 final_answer = response_json.get(
                     "final_answer", response_json.get("conclusion", str(response_json))
                 )
-                self.messages.append(
+                session.messages.append(
                     Message(role="assistant", content=str(final_answer))
                 )
                 return final_answer
 
-        except json.JSONDecodeError:
+        except JSONExtractionError:
             # Fallback: treat as plain text response
-            self.messages.append(Message(role="assistant", content=clean_response))
+            session.messages.append(Message(role="assistant", content=clean_response))
             return clean_response
         except Exception as e:
             logger.error(f"Error parsing reasoning response: {e}")
             return f"Error in reasoning: {str(e)}"
 
-    def _handle_tool_usage(self, response_data):
+    def _handle_tool_usage(self, session: ChainOfThoughtSession, response_data):
         """Handle tool usage within the reasoning process."""
         # This could be expanded to handle tool calls during reasoning
         # For now, we'll return the reasoning without tool execution
         reasoning_steps = response_data.get("reasoning_steps", [])
         conclusion = response_data.get("conclusion", "Analysis completed.")
 
-        self.messages.append(Message(role="assistant", content=str(conclusion)))
+        session.messages.append(Message(role="assistant", content=str(conclusion)))
         return conclusion
 
-    def _format_message_history(self) -> str:
+    def _format_message_history(self, session: ChainOfThoughtSession) -> str:
         """Format message history for the template."""
         return "\n".join(
-            [f"{message.role}: {message.content}" for message in self.messages]
+            [f"{message.role}: {message.content}" for message in session.messages]
         )
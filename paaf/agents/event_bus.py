@@ -0,0 +1,169 @@
+import queue
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from paaf.config.logging import get_logger
+
+logger = get_logger(__name__)
+
+_UNSET = object()
+
+
+class StepEvent:
+    """
+    A step of an agent run, published on an EventBus.
+
+    The payload handed to subscribers is only built the first time it's read, on the
+    dispatch thread, so the agent loop doesn't pay for payloads nobody reads.
+
+    Args:
+        run_id: The id of the run the step belongs to.
+        step: The step that happened.
+        payload_factory: Builds the full payload of the event.
+        metadata: Extra details about the step.
+    """
+
+    __slots__ = ("run_id", "step", "metadata", "_payload_factory", "_payload", "_lock")
+
+    def __init__(
+        self,
+        run_id: str,
+        step: Any,
+        payload_factory: Callable[[], Any],
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        self.run_id = run_id
+        self.step = step
+        self.metadata = metadata or {}
+        self._payload_factory = payload_factory
+        self._payload = _UNSET
+        self._lock = threading.Lock()
+
+    @property
+    def payload(self) -> Any:
+        """The full payload of the event, built on first access."""
+        if self._payload is _UNSET:
+            with self._lock:
+                if self._payload is _UNSET:
+                    self._payload = self._payload_factory()
+                    self._payload_factory = None
+        return self._payload
+
+
+class EventBus:
+    """
+    Delivers agent events to subscribers on a background thread.
+
+    Publishing only puts the event on a queue, so slow subscribers (websocket pushes,
+    database writes) don't add to the agent's latency. Events are delivered one at a
+    time, in the order they were published, and a subscriber raising doesn't affect
+    the other subscribers or the agent.
+
+    Args:
+        max_queue_size: Maximum number of events waiting to be delivered. 0 is unbounded.
+        block_when_full: Whether publishing waits for room when the queue is full. If
+            False, events published while it's full are dropped and counted, except
+            the ones published as required.
+    """
+
+    def __init__(self, max_queue_size: int = 1000, block_when_full: bool = True):
+        self._queue: "queue.Queue[StepEvent]" = queue.Queue(maxsize=max_queue_size)
+        self._block_when_full = block_when_full
+        self._subscribers: Tuple[Callable[[StepEvent], None], ...] = ()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self.dropped_events = 0
+
+    @property
+    def has_subscribers(self) -> bool:
+        """Whether anyone listens; publishers can skip building events otherwise."""
+        return bool(self._subscribers)
+
+    def subscribe(
+        self, handler: Callable[[StepEvent], None]
+    ) -> Callable[[StepEvent], None]:
+        """
+        Deliver every event published from now on to `handler`.
+
+        Returns:
+            The handler, so this can be used as a decorator.
+        """
+        with self._lock:
+            self._subscribers = self._subscribers + (handler,)
+        return handler
+
+    def unsubscribe(self, handler: Callable[[StepEvent], None]):
+        """Stop delivering events to `handler`."""
+        with self._lock:
+            self._subscribers = tuple(
+                subscriber for subscriber in self._subscribers if subscriber != handler
+            )
+
+    def publish(self, event: StepEvent, required: bool = False):
+        """
+        Queue an event for delivery to the subscribers.
+
+        Args:
+            event: The event to deliver.
+            required: Wait for room even if the bus drops events when full, e.g. for
+                the event ending a run.
+        """
+        if not self._subscribers:
+            return
+
+        self._ensure_worker()
+
+        try:
+            self._queue.put(event, block=self._block_when_full or required)
+        except queue.Full:
+            self.dropped_events += 1
+            logger.warning(
+                f"Event queue full, dropped event of run {event.run_id} "
+                f"({self.dropped_events} dropped so far)"
+            )
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every event published so far has been delivered.
+
+        Args:
+            timeout: Maximum number of seconds to wait. None waits as long as needed.
+
+        Returns:
+            bool: True if the queue was drained, False if the timeout elapsed first.
+        """
+        if timeout is None:
+            self._queue.join()
+            return True
+
+        done = threading.Event()
+
+        def wait():
+            self._queue.join()
+            done.set()
+
+        threading.Thread(target=wait, daemon=True).start()
+        return done.wait(timeout)
+
+    def _ensure_worker(self):
+        if self._worker is not None:
+            return
+
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._dispatch, name="paaf-event-bus", daemon=True
+                )
+                self._worker.start()
+
+    def _dispatch(self):
+        while True:
+            event = self._queue.get()
+            try:
+                for subscriber in self._subscribers:
+                    try:
+                        subscriber(event)
+                    except Exception as e:
+                        logger.error(f"Error in event subscriber: {e}")
+            finally:
+                self._queue.task_done()
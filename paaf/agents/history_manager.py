@@ -0,0 +1,190 @@
+import hashlib
+from typing import Any, List, Optional
+
+from paaf.config.logging import get_logger
+from paaf.llms.base_llm import BaseLLM
+from paaf.models.history import HistoryLimits, HistoryState, HistorySummaryMode
+from paaf.models.shared_models import Message
+from paaf.models.utils.token_estimation import estimate_tokens
+
+logger = get_logger(__name__)
+
+# How much of each folded message an extractive summary keeps
+EXTRACT_CHARS = 200
+
+SUMMARY_PROMPT = """Update the running summary of an agent's work on a query.
+
+Previous summary:
+{summary}
+
+New steps to fold into the summary:
+{steps}
+
+Write the updated summary in at most {max_chars} characters. Keep every fact, number,
+name and observation handle (like [obs-3]) needed to answer the query, and drop the rest.
+Respond with just the summary."""
+
+
+class HistoryManager:
+    """
+    Keeps the conversation history of a run small enough to send on every step.
+
+    - Each tool result is recorded once, as a single observation with a handle.
+    - A tool returning the same output again is recorded as a pointer to the first one,
+      as long as that one is still in the prompt rather than folded into the summary.
+    - Outputs longer than `max_observation_chars` are cut to a preview, and the full
+      text is kept in the run's artifacts under the observation's handle. The model
+      can't read artifacts back, so this is off unless set.
+    - Once the history is estimated over `summarize_after_tokens`, older turns are
+      folded into a running summary and only the latest messages are kept verbatim.
+      The summary loses detail, so this is off unless set.
+
+    Args:
+        llm: The LLM used when `summary_mode` is LLM.
+        limits: The caps on the history.
+    """
+
+    def __init__(
+        self, llm: Optional[BaseLLM] = None, limits: Optional[HistoryLimits] = None
+    ):
+        self.llm = llm
+        self.limits = limits or HistoryLimits()
+
+    def record_observation(
+        self,
+        messages: List[Message],
+        state: HistoryState,
+        tool_name: str,
+        result: Any,
+    ) -> str:
+        """
+        Append the result of a tool call to the history.
+
+        Args:
+            messages: The messages of the run.
+            state: The history state of the run.
+            tool_name: Name of the tool that produced the result.
+            result: The result of the tool.
+
+        Returns:
+            str: The handle of the observation.
+        """
+        text = result if isinstance(result, str) else str(result)
+
+        state.observation_count += 1
+        handle = f"obs-{state.observation_count}"
+
+        digest = hashlib.sha1(f"{tool_name}\0{text}".encode()).hexdigest()
+        first_handle = state.seen_observations.get(digest)
+
+        # A pointer to an observation folded into the summary would point at nothing
+        if first_handle is not None and self._is_live(state, first_handle):
+            content = f"[{handle}] Tool {tool_name} returned the same result as [{first_handle}]."
+        else:
+            state.seen_observations[digest] = handle
+            content = f"[{handle}] Result from tool {tool_name}: {self._truncate(state, handle, text)}"
+
+        state.observation_messages[handle] = len(messages)
+        messages.append(Message(role="tool", content=content))
+        return handle
+
+    def _is_live(self, state: HistoryState, handle: str) -> bool:
+        """Whether an observation is still rendered verbatim in the prompt."""
+        index = state.observation_messages.get(handle)
+        return index is not None and index >= state.summarized_count
+
+    def _truncate(self, state: HistoryState, handle: str, text: str) -> str:
+        """Cut an output to its preview, keeping the full text as an artifact."""
+        limit = self.limits.max_observation_chars
+        if limit is None or len(text) <= limit:
+            return text
+
+        state.artifacts[handle] = text
+        return f"{text[:limit]}... [truncated {len(text) - limit} characters, full output stored as {handle}]"
+
+    def compact(self, messages: List[Message], state: HistoryState):
+        """
+        Fold older turns into the running summary once the history is too large.
+
+        Args:
+            messages: The messages of the run. They're left untouched; only the state
+                records how many of them are covered by the summary.
+            state: The history state of the run.
+        """
+        threshold = self.limits.summarize_after_tokens
+        if threshold is None:
+            return
+
+        live = messages[state.summarized_count :]
+        tokens = estimate_tokens(state.summary) + sum(
+            estimate_tokens(message.content) for message in live
+        )
+        if tokens <= threshold:
+            return
+
+        fold_until = len(messages) - self.limits.keep_recent_messages
+        if fold_until <= state.summarized_count:
+            return
+
+        folded = messages[state.summarized_count : fold_until]
+        state.summary = self._summarize(state.summary, folded)
+        state.summarized_count = fold_until
+
+        logger.debug(
+            f"Folded {len(folded)} message(s) into the history summary "
+            f"(~{tokens} tokens before compaction)"
+        )
+
+    def render(self, messages: List[Message], state: HistoryState) -> str:
+        """
+        Format the history for a prompt: the summary, then the messages not folded into it.
+        """
+        lines = []
+        if state.summary:
+            lines.append(f"summary of earlier steps: {state.summary}")
+        lines.extend(
+            f"{message.role}: {message.content}"
+            for message in messages[state.summarized_count :]
+        )
+        return "\n".join(lines)
+
+    def _summarize(self, summary: Optional[str], folded: List[Message]) -> str:
+        if self.limits.summary_mode == HistorySummaryMode.LLM and self.llm is not None:
+            try:
+                return self._summarize_with_llm(summary, folded)
+            except Exception as e:
+                logger.warning(f"LLM history summary failed, using extractive: {e}")
+
+        return self._summarize_extractive(summary, folded)
+
+    def _summarize_with_llm(self, summary: Optional[str], folded: List[Message]) -> str:
+        prompt = SUMMARY_PROMPT.format(
+            summary=summary or "None yet.",
+            steps="\n".join(f"{message.role}: {message.content}" for message in folded),
+            max_chars=self.limits.max_summary_chars,
+        )
+        response = self.llm.generate(prompt=prompt)
+        text = response if isinstance(response, str) else str(response)
+        return text.strip()[: self.limits.max_summary_chars]
+
+    def _summarize_extractive(
+        self, summary: Optional[str], folded: List[Message]
+    ) -> str:
+        lines = [summary] if summary else []
+        for message in folded:
+            content = str(message.content).strip()
+            first_line = content.splitlines()[0] if content else ""
+            if len(first_line) > EXTRACT_CHARS:
+                first_line = first_line[:EXTRACT_CHARS] + "..."
+            lines.append(f"- {message.role}: {first_line}")
+
+        text = "\n".join(lines)
+        max_chars = self.limits.max_summary_chars
+        if len(text) > max_chars:
+            # Keep the most recent part, starting at a line boundary
+            text = text[-max_chars:]
+            newline = text.find("\n")
+            if 0 <= newline < len(text) - 1:
+                text = text[newline + 1 :]
+
+        return text
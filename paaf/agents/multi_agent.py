@@ -50,6 +50,10 @@ class MultiAgent:
             self.current_leader = "primary"
             self.agents["primary"] = primary_agent
 
+        # Agents that plan handoffs ahead of time (ReWOO) execute them through us
+        if hasattr(primary_agent, "set_handoff_executor"):
+            primary_agent.set_handoff_executor(self.execute_handoff)
+
     def register_agent(self, agent: BaseAgent, capability: HandoffCapability):
         """Register an agent with its handoff capability."""
         self.agents[capability.name] = agent
@@ -63,6 +67,9 @@ class MultiAgent:
         if hasattr(agent, "set_multi_agent_mode"):
             agent.set_multi_agent_mode(True)
 
+        if hasattr(agent, "set_handoff_executor"):
+            agent.set_handoff_executor(self.execute_handoff)
+
         self.primary_agent.enable_handoffs(list(self.handoff_capabilities.values()))
 
     def _update_agent_handoff_capabilities(self):
@@ -344,6 +351,31 @@ Based on your analysis so far, please provide the best answer you can.
         else:
             return self._run_vertical_architecture(query, max_handoffs)
 
+    def execute_handoff(
+        self, handoff: AgentHandoff, original_query: str
+    ) -> AgentHandoffResponse:
+        """
+        Run a specialist for an agent that planned the handoff as one of its steps.
+
+        The specialist answers under the calling agent's direction, as in a vertical
+        handoff, and its response goes back to the caller instead of the user.
+
+        A run may execute several planned handoffs at the same time, from its worker
+        threads. They only read the conversation history, which the MultiAgent doesn't
+        change until the calling agent's run returns, so they don't interfere with
+        each other, but handoffs to the same specialist run its `run()` concurrently.
+        The built-in agents keep each run's state in its own session and allow that;
+        a custom agent that doesn't must not be the target of parallel handoff plans.
+
+        Args:
+            handoff: The planned handoff.
+            original_query: The query the calling agent is working on.
+
+        Returns:
+            AgentHandoffResponse: The specialist's response, or why it failed.
+        """
+        return self._execute_vertical_handoff(handoff, original_query)
+
     def _execute_vertical_handoff(
         self, handoff: AgentHandoff, original_query: str
     ) -> AgentHandoffResponse:
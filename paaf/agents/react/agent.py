@@ -1,5 +1,6 @@
 import json
-from typing import List, Callable, Optional
+import time
+from typing import Callable, Iterator, Optional, Union
 from datetime import datetime
 
 from pydantic import BaseModel
@@ -8,6 +9,9 @@ from paaf.models.react.react_agent_response import (
     ReactAgentActionType,
     ReactAgentResponse,
 )
+from paaf.models.react.react_loop_detection import ReactLoopLimits
+from paaf.models.react.react_run_state import ReactPhase, ReactSession
+from paaf.models.react.react_speculation import ReactSpeculationLimits, SpeculationStats
 from paaf.models.react.react_step_callback import (
     ReactStepCallback,
     ReactStepSummary,
@@ -15,8 +19,16 @@ from paaf.models.react.react_step_callback import (
     ReactStepType,
 )
 from paaf.agents.base_agent import BaseAgent
+from paaf.agents.event_bus import EventBus, StepEvent
+from paaf.agents.history_manager import HistoryManager
+from paaf.agents.react.loop_detector import LoopDetector
+from paaf.agents.react.speculative_executor import SpeculativeExecutor, ToolPredictor
 from paaf.llms.base_llm import BaseLLM
+from paaf.checkpoints.base_checkpoint_store import BaseCheckpointStore
+from paaf.models.history import HistoryLimits
 from paaf.models.shared_models import Message, ToolChoice
+from paaf.models.tool import ToolArgumentError, ToolUnavailableError
+from paaf.models.tool_stream import ToolStreamLimits
 from paaf.tools.tool_registory import ToolRegistry
 from paaf.models.agent_handoff import AgentHandoff
 from paaf.models.agent_response import AgentResponse
@@ -24,6 +36,12 @@ from paaf.models.agent_response import AgentResponse
 
 logger = get_logger(__name__)
 
+FORCED_ANSWER_PROMPT = """{prompt}
+
+You may not call any more tools. Respond with a final answer, using the information you
+already have, in the following JSON format:
+{answer_structure}"""
+
 
 class ReactAgent(BaseAgent):
     """
@@ -38,6 +56,12 @@ class ReactAgent(BaseAgent):
         output_format: BaseModel | None = None,
         system_prompt: str | None = None,
         step_callback: Optional[Callable[[ReactStepCallback], None]] = None,
+        stream_limits: Optional[ToolStreamLimits] = None,
+        history_limits: Optional[HistoryLimits] = None,
+        checkpoint_store: Optional[BaseCheckpointStore] = None,
+        loop_limits: Optional[ReactLoopLimits] = None,
+        speculation_limits: Optional[ReactSpeculationLimits] = None,
+        tool_predictor: Optional[ToolPredictor] = None,
     ):
         super().__init__(
             llm=llm,
@@ -46,14 +70,26 @@ class ReactAgent(BaseAgent):
             system_prompt=system_prompt,
         )
         self.max_iterations = max_iterations
-        self.messages: List[Message] = []  # Conversation history
-        self.current_iteration = 0
-        self.query = None
         self.step_callback = step_callback
-        
-        # Execution tracking
-        self.execution_summary = None
-        self.current_step_number = 0
+
+        # Steps are delivered to subscribers on a background thread, off the agent loop
+        self.events = EventBus()
+        if step_callback is not None:
+            self.events.subscribe(self._dispatch_step_callback)
+        self.stream_limits = stream_limits or ToolStreamLimits()
+        self.history_manager = HistoryManager(llm=llm, limits=history_limits)
+        self.checkpoint_store = checkpoint_store
+        self.loop_detector = LoopDetector(loop_limits)
+
+        # Speculative tool calls are opt-in: they cost tool calls that may go unused
+        self.speculative_executor = None
+        if speculation_limits is not None or tool_predictor is not None:
+            self.speculative_executor = SpeculativeExecutor(
+                speculation_limits, tool_predictor
+            )
+
+        # Run state (query, messages, iterations, execution summary) lives in a
+        # ReactSession per run, so the agent itself holds configuration only.
 
         self.load_template()
 
@@ -89,112 +125,240 @@ Your capabilities:
         with open(template_path, "r") as file:
             self.template = file.read()
 
-    def run(self, query: str) -> AgentResponse:
+    def run(self, query: str, run_id: Optional[str] = None) -> AgentResponse:
         """
         Run the ReAct agent with the provided query.
 
+        Each call gets its own ReactSession, so the same agent can serve concurrent runs.
+
         Args:
             query: The user query to process
+            run_id: Id to give the run, e.g. to `resume()` it later. Generated if not given.
 
         Returns:
             Any: The generated response from the agent
         """
-        self.query = query
-        
+        session = self.start(query, run_id=run_id)
+
+        return self._drive(session)
+
+    def run_stream(
+        self, query: str, run_id: Optional[str] = None
+    ) -> Iterator[Union[ReactStepSummary, AgentResponse]]:
+        """
+        Run the ReAct agent, yielding each step summary as soon as the step completes.
+
+        Args:
+            query: The user query to process
+            run_id: Id to give the run, e.g. to `resume()` it later. Generated if not given.
+
+        Yields:
+            ReactStepSummary for every think, act, observe and final step, then the final
+            AgentResponse.
+        """
+        session = self.start(query, run_id=run_id)
+        steps = session.execution_summary.steps
+        reported = len(steps)
+
+        result = None
+        while result is None:
+            try:
+                result = self.step(session)
+            except Exception:
+                # Report the steps that led to the error before raising it
+                yield from steps[reported:]
+                raise
+
+            yield from steps[reported:]
+            reported = len(steps)
+
+        yield result
+
+    def resume(self, run_id: str) -> AgentResponse:
+        """
+        Continue a run from its last checkpoint, e.g. after the worker running it died.
+
+        The step that was interrupted is executed again; every step completed before it
+        (LLM calls and tool calls) is not.
+
+        Args:
+            run_id: The id of the run to resume.
+
+        Returns:
+            AgentResponse: The final response of the run.
+
+        Raises:
+            ValueError: If the agent has no checkpoint store or the run has no checkpoint.
+        """
+        session = self.load_session(run_id, ReactSession)
+
+        return self._drive(session)
+
+    def _drive(self, session: ReactSession) -> AgentResponse:
+        """Step a run until it's done, in a flat loop."""
+        result = session.result
+        while result is None:
+            result = self.step(session)
+
+        return result
+
+    def start(self, query: str, run_id: Optional[str] = None) -> ReactSession:
+        """
+        Start a new run of the ReAct agent without executing any step.
+
+        React basically follows the following steps:
+        Think -> Act -> Observe
+
+        The run is driven by calling `step(session)` until it returns the final response,
+        which lets an external scheduler interleave the steps of many runs. `run()` does
+        exactly that in a flat loop, so the Python stack doesn't grow with the number of
+        iterations.
+
+        Args:
+            query: The user query to process
+            run_id: Id to give the run. Generated if not given.
+
+        Returns:
+            ReactSession: The state of the new run.
+        """
+        if query is None:
+            raise ValueError("Query must be provided before starting the agent.")
+
         # Initialize execution summary
-        self.execution_summary = ReactExecutionSummary(
+        session = ReactSession(
+            **({"run_id": run_id} if run_id is not None else {}),
             query=query,
-            agent_name=self.__class__.__name__,
-            start_time=datetime.now(),
+            execution_summary=ReactExecutionSummary(
+                query=query,
+                agent_name=self.__class__.__name__,
+                start_time=datetime.now(),
+            ),
         )
-        self.current_step_number = 0
-        
+
+        session.messages.append(Message(role="user", content=session.query))
+        self.save_session(session)
+
+        return session
+
+    def step(self, session: ReactSession) -> Optional[AgentResponse]:
+        """
+        Execute the next step of a run.
+
+        A THINK step makes one LLM call and decides the next action; an ACT step executes the
+        chosen tool and records the observation. The session is checkpointed after each
+        completed step; a step that raises isn't, so resuming the run retries it.
+
+        Args:
+            session: The run to advance, as returned by `start()`.
+
+        Returns:
+            The final AgentResponse once the run is done, None while there are steps left.
+        """
+        if session.phase == ReactPhase.DONE:
+            return session.result
+
         try:
-            result = self._start()
-            
-            # Finalize execution summary
-            self.execution_summary.end_time = datetime.now()
-            self.execution_summary.total_steps = self.current_step_number
-            self.execution_summary.final_response = result.content if isinstance(result, AgentResponse) else result
-            self.execution_summary.success = True
-            
-            if isinstance(result, AgentResponse) and result.handoff:
-                self.execution_summary.handoff_occurred = True
-                self.execution_summary.handoff_target = result.handoff.agent_name
-            
-            # Send final callback
-            if self.step_callback and self.execution_summary.steps:
-                final_step = self.execution_summary.steps[-1]
-                final_step.is_final_step = True
-                final_step.final_answer = self.execution_summary.final_response
-                
-                callback_data = ReactStepCallback(
-                    current_step=final_step,
-                    execution_summary=self.execution_summary,
-                    conversation_history=[msg.content for msg in self.messages[-5:]],
-                    metadata={"is_final": True}
-                )
-                self.step_callback(callback_data)
-            
-            return result
-            
+            if session.phase == ReactPhase.THINK:
+                response = self.think(session)
+                if (
+                    session.loop.force_answer
+                    and response.action_type == ReactAgentActionType.TOOL_CALL
+                ):
+                    response = self._forced_answer(session, response)
+
+                session.phase = self.decide_action(session, response)
+
+                if session.phase == ReactPhase.ACT:
+                    session.pending_response = response
+                elif session.phase == ReactPhase.DONE:
+                    session.result = self._finish_run(session, response)
+
+            elif session.phase == ReactPhase.ACT:
+                response = session.pending_response
+                session.pending_response = None
+
+                self.act(session, response.tool_choice, response.tool_arguments or {})
+                session.phase = ReactPhase.THINK
+
         except Exception as e:
-            # Handle execution error
-            self.execution_summary.end_time = datetime.now()
-            self.execution_summary.success = False
-            self.execution_summary.error_message = str(e)
-            
-            # Send error callback
-            if self.step_callback:
-                error_step = ReactStepSummary(
-                    step_type=ReactStepType.FINAL,
-                    step_number=self.current_step_number + 1,
-                    error=str(e),
-                    is_final_step=True
-                )
-                
-                callback_data = ReactStepCallback(
-                    current_step=error_step,
-                    execution_summary=self.execution_summary,
-                    conversation_history=[msg.content for msg in self.messages[-5:]],
-                    metadata={"is_error": True}
-                )
-                self.step_callback(callback_data)
-            
+            session.phase = ReactPhase.DONE
+            self._fail_run(session, e)
             raise
 
-    def load_message_history(self) -> str:
-        """
-        Load the message history for the ReAct agent.
+        self.save_session(session)
 
-        This method should return the conversation history as a string.
-        It can be overridden by subclasses to provide a custom message history format.
-        """
-        return "\n".join(
-            [f"{message.role}: {message.content}" for message in self.messages]
-        )
+        return session.result
 
-    def _start(self) -> AgentResponse:
-        """
-        Start the ReAct agent.
+    def _finish_run(
+        self, session: ReactSession, response: ReactAgentResponse
+    ) -> AgentResponse:
+        """Build the final response of the run and finalize the execution summary."""
+        self._discard_predictions(session)
+        result = self._build_result(session, response)
 
-        React basically follows the following steps:
-        Think -> Act -> Observe
+        # Finalize execution summary
+        session.execution_summary.end_time = datetime.now()
+        session.execution_summary.total_steps = session.current_step_number
+        session.execution_summary.final_response = result.content if isinstance(result, AgentResponse) else result
+        session.execution_summary.success = True
+        
+        if isinstance(result, AgentResponse) and result.handoff:
+            session.execution_summary.handoff_occurred = True
+            session.execution_summary.handoff_target = result.handoff.agent_name
+        
+        # Send final callback
+        if session.execution_summary.steps:
+            final_step = session.execution_summary.steps[-1]
+            final_step.is_final_step = True
+            final_step.final_answer = session.execution_summary.final_response
+
+            self._publish_step(
+                session, final_step, {"is_final": True}, required=True
+            )
 
-        So The Model first thinks about the next action to take, then it acts by choosing a tool, and finally it observes the result of the action.
+        return result
 
-        This method is called to start the ReAct agent.
+    def _fail_run(self, session: ReactSession, error: Exception):
+        """Finalize the execution summary of a run that raised."""
+        self._discard_predictions(session)
 
-        So there would be a loop that runs until the maximum number of iterations is reached or the agent decides to stop.
+        # Handle execution error
+        session.execution_summary.end_time = datetime.now()
+        session.execution_summary.success = False
+        session.execution_summary.error_message = str(error)
+        
+        # Send error callback
+        if self.events.has_subscribers:
+            error_step = ReactStepSummary(
+                step_type=ReactStepType.FINAL,
+                step_number=session.current_step_number + 1,
+                error=str(error),
+                is_final_step=True
+            )
+
+            self._publish_step(
+                session, error_step, {"is_error": True}, required=True
+            )
+
+    def load_message_history(self, session: ReactSession) -> str:
         """
+        Load the message history for the ReAct agent.
 
-        if self.query is None:
-            raise ValueError("Query must be provided before starting the agent.")
+        This method should return the conversation history as a string.
+        It can be overridden by subclasses to provide a custom message history format.
 
-        self.messages.append(Message(role="user", content=self.query))
-        self.current_iteration = 0
+        Older turns are folded into a running summary once the history grows past
+        the agent's `history_limits`.
+        """
+        self.history_manager.compact(session.messages, session.history)
+        return self.history_manager.render(session.messages, session.history)
 
-        response = self.think()
+    def _build_result(
+        self, session: ReactSession, response: ReactAgentResponse
+    ) -> AgentResponse:
+        """
+        Build the final response of the run from the last decision of the model.
+        """
 
         # Check if we got a handoff response that should be returned directly
         if (
@@ -209,7 +373,7 @@ Your capabilities:
                 is_final=False,
             )
 
-        last_message = self.messages[-1]
+        last_message = session.messages[-1]
 
         final_response = None
         if self.output_format is not None:
@@ -219,8 +383,6 @@ Your capabilities:
                     final_response = self.output_format(**last_message.content)
                 elif isinstance(last_message.content, str):
                     # Try to parse JSON string
-                    import json
-
                     try:
                         content_dict = json.loads(last_message.content)
                         final_response = self.output_format(**content_dict)
@@ -236,33 +398,12 @@ Your capabilities:
             final_response = last_message.content
 
         # Wrap response with handoff check at the base agent level
-        return self.wrap_response_with_handoff_check(final_response, self.query)
+        return self.wrap_response_with_handoff_check(final_response, session.query)
 
-    def think(self):
+    def _answer_structure(self) -> dict:
         """
-        Think about the next action to take based on the conversation history and available tools.
-
-        This function generates a response from the language model based on the conversation history and available tools.
-
-        After thinking, it decides the next action depending on the response
+        Example of an answer response, with the agent's output format as its answer.
         """
-        
-        # Create step summary for thinking
-        self.current_step_number += 1
-        think_step = ReactStepSummary(
-            step_type=ReactStepType.THINK,
-            step_number=self.current_step_number,
-            action_taken="Analyzing query and determining next action"
-        )
-        
-        if self.current_iteration > self.max_iterations:
-            error_msg = f"Maximum number of iterations ({self.max_iterations}) reached."
-            think_step.error = error_msg
-            self._send_callback(think_step)
-            raise ValueError(error_msg)
-            
-        self.current_iteration += 1
-
         answer_structure = ReactAgentResponse.get_example_json_for_action(
             action_type=ReactAgentActionType.ANSWER,
         )
@@ -273,6 +414,14 @@ Your capabilities:
             output_format = "string"
         answer_structure["answer"] = output_format
 
+        return answer_structure
+
+    def _static_prompt_values(self) -> dict:
+        """
+        Values of the template fields that only depend on the agent configuration.
+        """
+        answer_structure = self._answer_structure()
+
         # Prepare the handoff structure if handoffs are enabled
         handoff_structure = "null"
         if self.handoffs_enabled and self.handoff_capabilities:
@@ -289,17 +438,64 @@ Your capabilities:
             )
         )
 
-        # Include system prompt in the template
-        prompt = self.template.format(
-            system_prompt=self.get_system_prompt(),
-            query=self.query,
-            history=self.load_message_history(),
-            tools=[tool.to_dict() for tool in self.tools_registry.tools.values()],
-            tool_call_structure=tool_call_json,
-            answer_structure=answer_structure,
-            available_agents=self.get_available_agents_description(),
-            handoff_structure=handoff_structure,
+        return {
+            "system_prompt": self.get_system_prompt(),
+            "tools": [tool.to_dict() for tool in self.tools_registry.available_tools()],
+            "tool_call_structure": tool_call_json,
+            "answer_structure": answer_structure,
+            "available_agents": self.get_available_agents_description(),
+            "handoff_structure": handoff_structure,
+        }
+
+    def _build_prompt(self, session: ReactSession) -> str:
+        """
+        Build the prompt for the next step of a run.
+
+        The static sections are rendered once per agent configuration, so each step
+        only formats the query and the history.
+        """
+        compiled = self.get_compiled_prompt(
+            "react", self.template, self._static_prompt_values
+        )
+
+        return compiled.render(
+            query=session.query,
+            history=self.load_message_history(session),
+        )
+
+    def think(self, session: ReactSession) -> ReactAgentResponse:
+        """
+        Think about the next action to take based on the conversation history and available tools.
+
+        This function generates a response from the language model based on the conversation history and available tools.
+
+        Returns:
+            ReactAgentResponse: The decision of the model, to be passed to `decide_action`.
+        """
+        
+        # Create step summary for thinking
+        session.current_step_number += 1
+        think_step = ReactStepSummary(
+            step_type=ReactStepType.THINK,
+            step_number=session.current_step_number,
+            action_taken="Analyzing query and determining next action"
         )
+        
+        if session.current_iteration > self.max_iterations:
+            error_msg = f"Maximum number of iterations ({self.max_iterations}) reached."
+            think_step.error = error_msg
+            self._send_callback(session, think_step)
+            raise ValueError(error_msg)
+            
+        session.current_iteration += 1
+
+        prompt = self._build_prompt(session)
+
+        if self.speculative_executor is not None:
+            # Start the likely next tool calls, so they run while the model decides
+            self.speculative_executor.prefetch(
+                session, self.tools_registry.available_tools()
+            )
 
         response = None
 
@@ -315,55 +511,40 @@ Your capabilities:
         if not isinstance(response, ReactAgentResponse):
             error_msg = f"Response is not a valid ReactAgentResponse: {response}"
             think_step.error = error_msg
-            self._send_callback(think_step)
+            self._send_callback(session, think_step)
             raise ValueError(error_msg)
 
         # Update step summary with reasoning
         think_step.reasoning = response.reasoning
         think_step.action_taken = f"Decided to {response.action_type.value}"
         
-        logger.info(f"Iteration {self.current_iteration}: {response}\n")
+        logger.info(f"Iteration {session.current_iteration}: {response}\n")
         
         # Send callback for thinking step
-        self._send_callback(think_step)
+        self._send_callback(session, think_step)
 
-        return self.decide_action(response)
+        return response
 
     def convert_response_to_react_agent_response(
         self, response: str
     ) -> ReactAgentResponse:
         """
         Convert the response from the language model to a ReactAgentResponse.
-        """
-
-        clean_response = response.strip().strip("`").strip()
-        if clean_response.startswith("json"):
-            clean_response = clean_response[4:].strip()
-
-        try:
-            response_json = json.loads(clean_response)
-            return ReactAgentResponse(**response_json)
 
-        except json.JSONDecodeError:
-            raise ValueError(
-                f"Response is not a valid ReactAgentResponse JSON: {clean_response}"
-            )
-
-        except TypeError as e:
-            raise ValueError(
-                f"Response does not match ReactAgentResponse structure: {clean_response}",
-            ) from e
-
-        except Exception as e:
-            raise ValueError(
-                f"An unexpected error occurred while converting response: {clean_response}"
-            ) from e
+        Malformed JSON is repaired if possible, see `BaseAgent.parse_llm_json`.
+        """
+        return self.parse_llm_json(response, ReactAgentResponse)
 
-    def decide_action(self, response: ReactAgentResponse):
+    def decide_action(
+        self, session: ReactSession, response: ReactAgentResponse
+    ) -> ReactPhase:
         """
         Decide the next action based on the response from the language model.
 
         This function analyzes the response and decides whether to use a tool or generate a final answer.
+
+        Returns:
+            ReactPhase: ACT if a tool should be executed next, DONE if the run is over.
         """
 
         if response.action_type == ReactAgentActionType.TOOL_CALL:
@@ -374,35 +555,33 @@ Your capabilities:
                     "Response does not contain a tool choice for TOOL_CALL action."
                 )
 
-            tool_arguments = response.tool_arguments or {}
-
-            self.act(response.tool_choice, tool_arguments)
+            return ReactPhase.ACT
 
         elif response.action_type == ReactAgentActionType.ANSWER:
             # Create step summary for final answer
-            self.current_step_number += 1
+            session.current_step_number += 1
             answer_step = ReactStepSummary(
                 step_type=ReactStepType.FINAL,
-                step_number=self.current_step_number,
+                step_number=session.current_step_number,
                 action_taken="Providing final answer",
                 final_answer=response.answer,
                 is_final_step=True
             )
             
             # If the action type is ANSWER, store the structured answer
-            self.messages.append(Message(role="assistant", content=response.answer))
+            session.messages.append(Message(role="assistant", content=response.answer))
             
             # Send callback for final answer
-            self._send_callback(answer_step)
+            self._send_callback(session, answer_step)
             
-            return None  # End the thinking loop
+            return ReactPhase.DONE  # End the thinking loop
 
         elif response.action_type == ReactAgentActionType.HANDOFF:
             # Create step summary for handoff
-            self.current_step_number += 1
+            session.current_step_number += 1
             handoff_step = ReactStepSummary(
                 step_type=ReactStepType.HANDOFF,
-                step_number=self.current_step_number,
+                step_number=session.current_step_number,
                 action_taken="Handing off to another agent",
                 handoff_target=response.handoff.agent_name if response.handoff else None,
                 handoff_context=response.handoff.context if response.handoff else None,
@@ -413,47 +592,47 @@ Your capabilities:
             if not response.handoff:
                 error_msg = "Response does not contain handoff information for HANDOFF action."
                 handoff_step.error = error_msg
-                self._send_callback(handoff_step)
+                self._send_callback(session, handoff_step)
                 raise ValueError(error_msg)
 
             # Send callback for handoff
-            self._send_callback(handoff_step)
+            self._send_callback(session, handoff_step)
             
-            # Return the handoff response directly
-            return response
+            # The handoff response is returned directly as the result of the run
+            return ReactPhase.DONE
 
         else:
             raise ValueError(f"Unknown action type: {response.action_type}")
 
-    def act(self, tool_choice: ToolChoice, tool_arguments: dict):
+    def act(self, session: ReactSession, tool_choice: ToolChoice, tool_arguments: dict):
         """
         Act by choosing a tool based on the decision made in the previous step.
 
-        This function executes the chosen tool and returns the result.
+        This function executes the chosen tool and records the observation; the next
+        `step()` thinks again to decide the next action.
         """
         
         # Create step summary for acting
-        self.current_step_number += 1
+        session.current_step_number += 1
         act_step = ReactStepSummary(
             step_type=ReactStepType.ACT,
-            step_number=self.current_step_number,
+            step_number=session.current_step_number,
             action_taken=f"Executing tool: {tool_choice.name}",
             tool_used=tool_choice.name,
             tool_arguments=tool_arguments
         )
 
-        if tool_choice.tool_id not in self.tools_registry.tools:
+        tool = self.tools_registry.get_tool(tool_choice)
+        if tool is None:
             error_msg = f"Tool {tool_choice.name} not found in registry."
             act_step.error = error_msg
-            self._send_callback(act_step)
+            self._send_callback(session, act_step)
             raise ValueError(error_msg)
 
-        tool = self.tools_registry.tools[tool_choice.tool_id]
-
         if not tool.callable:
             error_msg = f"Tool {tool_choice.name} does not have a callable function."
             act_step.error = error_msg
-            self._send_callback(act_step)
+            self._send_callback(session, act_step)
             raise ValueError(error_msg)
 
         # Log the tool choice and arguments
@@ -461,86 +640,258 @@ Your capabilities:
             f"Executing tool: {tool_choice.name} with arguments: {tool_arguments}\n"
         )
 
+        signature = self.loop_detector.call_signature(tool_choice.name, tool_arguments)
+        cached_result = self.loop_detector.cached_observation(session.loop, signature)
+
+        prefetched, prefetched_result = False, None
+        if cached_result is not None:
+            # Nothing predicted for this step is used
+            self._discard_predictions(session)
+        elif self.speculative_executor is not None:
+            prefetched, prefetched_result = self.speculative_executor.take(
+                session.run_id, signature
+            )
+
+        start_time = time.perf_counter()
         try:
-            result = tool(**tool_arguments)
+            if cached_result is not None:
+                # The same call already ran in this run; don't pay for it again
+                result = cached_result
+                act_step.action_taken = f"Reusing earlier result of tool: {tool_choice.name}"
+            elif prefetched:
+                # Predicted and started while the model was thinking
+                result = prefetched_result
+                act_step.action_taken = (
+                    f"Using prefetched result of tool: {tool_choice.name}"
+                )
+            elif tool.is_streaming:
+                # Only consume (and record) as much of the stream as the limits allow
+                stream_result = tool.collect(tool_arguments, self.stream_limits)
+                result = stream_result.to_observation()
+            else:
+                result = tool(**tool_arguments)
             act_step.tool_result = result
+            act_step.duration_ms = (time.perf_counter() - start_time) * 1000
             
-            self.messages.append(
-                Message(
-                    role="tool",
-                    content=f"Tool {tool_choice.name} executed with result: {result}",
-                )
+            self.history_manager.record_observation(
+                session.messages, session.history, tool_choice.name, result
             )
-            self.messages.append(
-                Message(
-                    role="assistant",
-                    content=f"Result from tool {tool_choice.name}: {result}",
-                )
+            self._check_progress(
+                session,
+                tool_choice.name,
+                signature,
+                result,
+                side_effect_free=tool.side_effect_free,
             )
             
             # Send callback for successful action
-            self._send_callback(act_step)
+            self._send_callback(session, act_step)
             
             # Create observe step
-            self.current_step_number += 1
+            session.current_step_number += 1
             observe_step = ReactStepSummary(
                 step_type=ReactStepType.OBSERVE,
-                step_number=self.current_step_number,
+                step_number=session.current_step_number,
                 action_taken=f"Observing result from {tool_choice.name}",
                 tool_used=tool_choice.name,
-                tool_result=result
+                tool_result=result,
+                duration_ms=act_step.duration_ms,
+            )
+            self._send_callback(session, observe_step)
+
+        except ToolArgumentError as e:
+            # The tool was never executed, so feed the validation problems straight back
+            act_step.error = str(e)
+            act_step.tool_result = None
+
+            session.messages.append(
+                Message(
+                    role="tool",
+                    content=f"{e}. Fix the arguments to match the tool's arguments and try again.",
+                )
             )
-            self._send_callback(observe_step)
+
+            self._send_callback(session, act_step)
+
+        except ToolUnavailableError as e:
+            # The circuit is open, so don't spend another iteration retrying this tool
+            act_step.error = str(e)
+            act_step.tool_result = None
+
+            session.messages.append(
+                Message(
+                    role="tool",
+                    content=f"{e} Do not call it again; use a different tool or answer with the information you have.",
+                )
+            )
+
+            self._send_callback(session, act_step)
 
         except Exception as e:
             error_msg = f"Error executing tool {tool_choice.name}: {str(e)}"
             act_step.error = error_msg
             act_step.tool_result = None
+            act_step.duration_ms = (time.perf_counter() - start_time) * 1000
             
-            self.messages.append(
+            session.messages.append(
                 Message(
                     role="tool",
                     content=f"Tool {tool_choice.name} failed with error: {str(e)}",
                 )
             )
-            self.messages.append(
-                Message(
-                    role="assistant",
-                    content=f"Error executing tool {tool_choice.name}: {str(e)}",
-                )
+            self._check_progress(
+                session,
+                tool_choice.name,
+                signature,
+                error_msg,
+                succeeded=False,
+                side_effect_free=tool.side_effect_free,
             )
             
             # Send callback for failed action
-            self._send_callback(act_step)
-            
-        finally:
-            # After executing the tool, we can think again to decide the next action
-            self.think()
+            self._send_callback(session, act_step)
 
-    def _send_callback(self, step_summary: ReactStepSummary):
-        """Send callback with current step and execution summary."""
-        if not self.step_callback:
-            return
-            
+    def _check_progress(
+        self,
+        session: ReactSession,
+        tool_name: str,
+        signature: str,
+        observation,
+        succeeded: bool = True,
+        side_effect_free: bool = False,
+    ):
+        """Record a tool call and add a corrective hint if the run is stalling."""
+        hint = self.loop_detector.record_call(
+            session.loop,
+            tool_name,
+            signature,
+            observation,
+            succeeded=succeeded,
+            side_effect_free=side_effect_free,
+        )
+        if hint:
+            session.messages.append(Message(role="system", content=hint))
+
+    def _forced_answer(
+        self, session: ReactSession, response: ReactAgentResponse
+    ) -> ReactAgentResponse:
+        """
+        Replace a tool call the run was told not to make with a final answer.
+
+        The model is asked once more, for an answer only, so the answer still follows the
+        agent's output format. If it calls a tool again, the run ends with a note that
+        it couldn't conclude.
+        """
+        logger.warning(
+            f"Run {session.run_id} kept calling tools after stalling; asking for an answer."
+        )
+
+        prompt = FORCED_ANSWER_PROMPT.format(
+            prompt=self._build_prompt(session),
+            answer_structure=json.dumps(self._answer_structure()),
+        )
+        try:
+            forced = self.convert_response_to_react_agent_response(
+                self.llm.generate(prompt=prompt)
+            )
+            if forced.action_type == ReactAgentActionType.ANSWER:
+                return forced
+        except Exception as e:
+            logger.warning(f"Forced answer of run {session.run_id} failed: {e}")
+
+        return ReactAgentResponse(
+            reasoning=f"{response.reasoning} (Stopped: tool calls kept returning no new information.)",
+            action_type=ReactAgentActionType.ANSWER,
+            answer=f"I could not reach a conclusive answer because my tool calls stopped producing new information. The last observation was: {session.loop.last_observation}",
+        )
+
+    def _discard_predictions(self, session: ReactSession):
+        """Drop the speculative calls of a run that ended before using them."""
+        if self.speculative_executor is not None:
+            self.speculative_executor.discard(session.run_id)
+
+    def get_speculation_stats(self) -> Optional[SpeculationStats]:
+        """
+        Get how many speculative tool calls were used or wasted across the agent's runs.
+
+        Returns:
+            Optional[SpeculationStats]: The counts, or None if speculation isn't enabled.
+        """
+        if self.speculative_executor is None:
+            return None
+        return self.speculative_executor.stats()
+
+    def _send_callback(self, session: ReactSession, step_summary: ReactStepSummary):
+        """Record a step in the execution summary and publish it to subscribers."""
         # Add step to execution summary
-        self.execution_summary.steps.append(step_summary)
-        
-        # Create callback data
-        callback_data = ReactStepCallback(
-            current_step=step_summary,
-            execution_summary=self.execution_summary,
-            conversation_history=[msg.content for msg in self.messages[-5:]],
-            metadata={
-                "iteration": self.current_iteration,
+        session.execution_summary.steps.append(step_summary)
+
+        self._publish_step(
+            session,
+            step_summary,
+            {
+                "iteration": session.current_iteration,
                 "max_iterations": self.max_iterations,
+            },
+        )
+
+    def _publish_step(
+        self,
+        session: ReactSession,
+        step_summary: ReactStepSummary,
+        metadata: dict,
+        required: bool = False,
+    ):
+        """
+        Publish a step on the agent's event bus.
+
+        The step and the summary, with each of its steps, are copied here, as the run
+        keeps updating them (e.g. when it finishes); the ReactStepCallback payload is
+        built from the copies on the dispatch thread, and only if a subscriber reads it.
+
+        Args:
+            session: The run the step belongs to.
+            step_summary: The step to publish.
+            metadata: Extra details about the step.
+            required: Whether the event must not be dropped, e.g. the last step of a run.
+        """
+        if not self.events.has_subscribers:
+            return
+
+        step = step_summary.model_copy()
+        # The summary as of this step, even if the run has moved on since
+        summary = session.execution_summary.model_copy(
+            update={
+                "steps": [
+                    step if previous is step_summary else previous.model_copy()
+                    for previous in session.execution_summary.steps
+                ]
             }
         )
-        
-        # Call the callback
-        try:
-            self.step_callback(callback_data)
-        except Exception as e:
-            logger.error(f"Error in step callback: {e}")
+        recent_messages = session.messages[-5:]
+
+        def build_payload() -> ReactStepCallback:
+            return ReactStepCallback(
+                current_step=step,
+                execution_summary=summary,
+                conversation_history=[msg.content for msg in recent_messages],
+                metadata=metadata,
+            )
+
+        self.events.publish(
+            StepEvent(
+                run_id=session.run_id,
+                step=step,
+                payload_factory=build_payload,
+                metadata=metadata,
+            ),
+            required=required,
+        )
+
+    def _dispatch_step_callback(self, event: StepEvent):
+        """Event subscriber forwarding steps to the `step_callback` given to the agent."""
+        if self.step_callback is not None:
+            self.step_callback(event.payload)
 
     def _format_available_agents(self) -> str:
         """Format available agents for the prompt."""
@@ -0,0 +1,116 @@
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from paaf.config.logging import get_logger
+from paaf.models.react.react_loop_detection import ReactLoopLimits, ReactLoopState
+
+logger = get_logger(__name__)
+
+
+class LoopDetector:
+    """
+    Spots ReAct runs that stopped making progress, so they don't spend their remaining
+    iterations on LLM round trips that can't change the outcome.
+
+    Args:
+        limits: How stalls are handled.
+    """
+
+    def __init__(self, limits: Optional[ReactLoopLimits] = None):
+        self.limits = limits or ReactLoopLimits()
+
+    @staticmethod
+    def call_signature(tool_name: str, arguments: Dict[str, Any]) -> str:
+        """Key identifying a tool call, independent of the order of its arguments."""
+        return f"{tool_name}:{json.dumps(arguments, sort_keys=True, default=str)}"
+
+    def cached_observation(
+        self, state: ReactLoopState, signature: str
+    ) -> Optional[str]:
+        """
+        Get the observation of an identical earlier call, if it may be reused.
+
+        Returns:
+            Optional[str]: The earlier observation, or None if the tool has to be called.
+        """
+        if not self.limits.reuse_observations:
+            return None
+        return state.cached_observations.get(signature)
+
+    def record_call(
+        self,
+        state: ReactLoopState,
+        tool_name: str,
+        signature: str,
+        observation: Any,
+        succeeded: bool = True,
+        side_effect_free: bool = False,
+    ) -> Optional[str]:
+        """
+        Record a tool call and check whether the run is stalling.
+
+        Args:
+            state: The loop state of the run.
+            tool_name: Name of the tool called.
+            signature: The call's `call_signature`.
+            observation: What the call returned (or its error).
+            succeeded: Whether the call returned normally.
+            side_effect_free: Whether the tool changes nothing. Other tools (e.g. polling
+                a job) may do something or return something new on each call, so
+                repeating them isn't a stall and their observations are never reused.
+                Side effect free observations are only reused with `reuse_observations`.
+
+        Returns:
+            Optional[str]: A hint to add to the history if the run is stalling.
+        """
+        text = observation if isinstance(observation, str) else str(observation)
+        digest = hashlib.sha1(text.encode()).hexdigest()
+
+        repeats = state.call_counts.get(signature, 0)
+        state.call_counts[signature] = repeats + 1
+        if succeeded and side_effect_free and self.limits.reuse_observations:
+            state.cached_observations.setdefault(signature, text)
+
+        if text == state.last_observation:
+            state.unchanged_streak += 1
+        else:
+            state.unchanged_streak = 0
+        state.last_observation = text
+
+        if not side_effect_free:
+            return None
+
+        state.recent_outcomes.append(f"{tool_name}:{digest}")
+        del state.recent_outcomes[: -self.limits.oscillation_window]
+
+        if repeats:
+            problem = f"You already called {tool_name} with these arguments {repeats} time(s) before."
+        elif state.unchanged_streak:
+            problem = f"The last {state.unchanged_streak + 1} tool calls all returned the same observation."
+        elif self._is_cycling(state):
+            problem = "You are cycling between the same tool calls without getting any new information."
+        else:
+            return None
+
+        state.stalls += 1
+        logger.info(f"Stall {state.stalls} detected: {problem}")
+
+        if state.stalls > self.limits.max_hints:
+            state.force_answer = True
+            return f"{problem} Do not call any more tools: respond with a final answer now, using the information you already have."
+
+        return f"{problem} Use a different tool or different arguments, or answer with the information you already have."
+
+    def _is_cycling(self, state: ReactLoopState) -> bool:
+        """Whether the latest calls repeat a cycle of 2 or 3 distinct (tool, observation) pairs."""
+        outcomes = state.recent_outcomes
+        for period in (2, 3):
+            if len(outcomes) < 2 * period:
+                continue
+
+            cycle = outcomes[-period:]
+            if cycle == outcomes[-2 * period : -period] and len(set(cycle)) == period:
+                return True
+
+        return False
@@ -0,0 +1,226 @@
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from paaf.agents.react.loop_detector import LoopDetector
+from paaf.config.logging import get_logger
+from paaf.models.react.react_run_state import ReactSession
+from paaf.models.react.react_speculation import ReactSpeculationLimits, SpeculationStats
+from paaf.models.react.react_step_callback import ReactStepType
+from paaf.models.tool import Tool
+
+logger = get_logger(__name__)
+
+# A tool call expected to come next: the tool and its arguments
+ToolPrediction = Tuple[Tool, Dict[str, Any]]
+ToolPredictor = Callable[[ReactSession, List[Tool]], List[ToolPrediction]]
+
+# Capitalized words, or runs of them, e.g. "Paris" or "Ada Lovelace"
+_ENTITY_PATTERN = re.compile(r"\b[A-Z][\w-]+(?:\s+[A-Z][\w-]+)*")
+_TEXT_TYPES = (str, "str", "string")
+
+
+def _text_argument(tool: Tool) -> Optional[str]:
+    """The name of the tool's only argument if it takes a single text value."""
+    if len(tool.arguments) != 1:
+        return None
+
+    name, details = next(iter(tool.arguments.items()))
+    argument_type = details.get("type") if isinstance(details, dict) else None
+    if argument_type in _TEXT_TYPES or (
+        isinstance(argument_type, str) and "use str by default" in argument_type
+    ):
+        return name
+    return None
+
+
+def _entities(text: str) -> List[str]:
+    """
+    Names mentioned in a text, in order of first mention.
+
+    A single capitalized word opening a sentence is most likely just the start of the
+    sentence, so it's skipped.
+    """
+    entities = {}
+    for match in _ENTITY_PATTERN.finditer(text):
+        entity = match.group()
+        opens_sentence = text[: match.start()].rstrip()[-1:] in ("", ".", "!", "?", ":")
+        if " " not in entity and opens_sentence:
+            continue
+        entities.setdefault(entity, None)
+
+    return list(entities)
+
+
+class HeuristicToolPredictor:
+    """
+    Guesses the next tool calls of a ReAct run without asking the model.
+
+    - Before the first observation, each text lookup tool called with the query.
+    - After an observation, the tool just used, called again with the entities the
+      observation mentions (capitalized names) that weren't looked up yet.
+    """
+
+    def __call__(
+        self, session: ReactSession, tools: List[Tool]
+    ) -> List[ToolPrediction]:
+        lookups = {tool.name: tool for tool in tools if _text_argument(tool)}
+        if not lookups:
+            return []
+
+        last_act = next(
+            (
+                step
+                for step in reversed(session.execution_summary.steps)
+                if step.step_type == ReactStepType.ACT
+            ),
+            None,
+        )
+        if last_act is None:
+            return [
+                (tool, {_text_argument(tool): session.query})
+                for tool in lookups.values()
+            ]
+
+        tool = lookups.get(last_act.tool_used)
+        if tool is None or not session.loop.last_observation:
+            return []
+
+        argument = _text_argument(tool)
+        predictions = []
+        for entity in _entities(session.loop.last_observation):
+            arguments = {argument: entity}
+            signature = LoopDetector.call_signature(tool.name, arguments)
+            if signature not in session.loop.call_counts:
+                predictions.append((tool, arguments))
+
+        return predictions
+
+
+class SpeculativeExecutor:
+    """
+    Runs predicted tool calls of ReAct runs in the background, while the model thinks.
+
+    `prefetch` starts the predicted calls of a run before its LLM call; `take` then hands
+    over the call matching what the model actually chose, if it was predicted. The
+    other predictions of the step are dropped, and counted as wasted.
+
+    Args:
+        limits: How many calls may be made speculatively.
+        predictor: Guesses the next calls of a run from its session and the tools that
+            may be called speculatively. Defaults to HeuristicToolPredictor.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[ReactSpeculationLimits] = None,
+        predictor: Optional[ToolPredictor] = None,
+    ):
+        self.limits = limits or ReactSpeculationLimits()
+        self.predictor = predictor or HeuristicToolPredictor()
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.limits.max_workers, thread_name_prefix="paaf-speculation"
+        )
+        self._pending: Dict[str, Dict[str, Future]] = {}
+        self._stats = SpeculationStats()
+        self._lock = threading.Lock()
+
+    def prefetch(self, session: ReactSession, tools: List[Tool]):
+        """
+        Start the predicted next calls of a run.
+
+        Args:
+            session: The run about to think.
+            tools: The tools available to the run.
+        """
+        self.discard(session.run_id)
+
+        candidates = [
+            tool
+            for tool in tools
+            if tool.side_effect_free and tool.is_available and not tool.is_streaming
+        ]
+        if not candidates or self.limits.max_predictions <= 0:
+            return
+
+        try:
+            predictions = self.predictor(session, candidates)
+        except Exception as e:
+            logger.warning(f"Tool call prediction failed: {e}")
+            return
+
+        futures: Dict[str, Future] = {}
+        for tool, arguments in predictions:
+            if len(futures) >= self.limits.max_predictions:
+                break
+            if not tool.side_effect_free:
+                continue
+
+            signature = LoopDetector.call_signature(tool.name, arguments)
+            if signature in futures or signature in session.loop.cached_observations:
+                continue
+
+            futures[signature] = self._pool.submit(tool, **arguments)
+
+        if not futures:
+            return
+
+        logger.debug(f"Prefetching {list(futures)} for run {session.run_id}")
+        with self._lock:
+            self._pending[session.run_id] = futures
+            self._stats.launched += len(futures)
+
+    def take(self, run_id: str, signature: str) -> Tuple[bool, Any]:
+        """
+        Get the result of a predicted call, dropping the other predictions of the run.
+
+        Waits for the call if it's still running.
+
+        Args:
+            run_id: The id of the run.
+            signature: The `LoopDetector.call_signature` of the call the model chose.
+
+        Returns:
+            Tuple[bool, Any]: Whether the call was predicted and succeeded, and its result.
+        """
+        with self._lock:
+            futures = self._pending.pop(run_id, {})
+        future = futures.pop(signature, None)
+        self._drop(futures)
+
+        if future is None:
+            return False, None
+
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.debug(f"Predicted call {signature} failed, calling it again: {e}")
+            with self._lock:
+                self._stats.failed += 1
+            return False, None
+
+        with self._lock:
+            self._stats.hits += 1
+        return True, result
+
+    def discard(self, run_id: str):
+        """Drop the predictions of a run that weren't used."""
+        with self._lock:
+            futures = self._pending.pop(run_id, {})
+        self._drop(futures)
+
+    def _drop(self, futures: Dict[str, Future]):
+        if not futures:
+            return
+
+        for future in futures.values():
+            # Calls already running can't be stopped; they finish in the background
+            future.cancel()
+        with self._lock:
+            self._stats.wasted += len(futures)
+
+    def stats(self) -> SpeculationStats:
+        """A snapshot of the hit and waste counts so far."""
+        with self._lock:
+            return self._stats.model_copy()
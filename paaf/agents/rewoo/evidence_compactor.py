@@ -0,0 +1,195 @@
+import json
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+from paaf.config.logging import get_logger
+from paaf.models.rewoo.rewoo_evidence_limits import RewooEvidenceLimits
+from paaf.models.rewoo.rewoo_models import RewooEvidence, RewooPlan
+from paaf.models.utils.token_estimation import CHARS_PER_TOKEN, estimate_tokens
+
+logger = get_logger(__name__)
+
+# Evidence is split into snippets at sentence ends and line breaks
+_SNIPPET_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD = re.compile(r"\w+")
+
+# Snippets shorter than this, like "Yes." or "N/A", are too generic to count as repeats
+MIN_DUPLICATE_CHARS = 30
+
+_STOP_WORDS = frozenset(
+    "the and for are was were with that this from what which who how when where "
+    "does did has have had into about than then them they their there".split()
+)
+
+
+def _snippets(text: str) -> List[str]:
+    return [
+        snippet.strip() for snippet in _SNIPPET_BOUNDARY.split(text) if snippet.strip()
+    ]
+
+
+def _fingerprint(snippet: str) -> str:
+    """A snippet's words, so repeats match despite case and punctuation."""
+    return " ".join(_WORD.findall(snippet.lower()))
+
+
+def _terms(text: str) -> Set[str]:
+    return {
+        word
+        for word in _WORD.findall(text.lower())
+        if len(word) > 2 and word not in _STOP_WORDS
+    }
+
+
+def render_plan(plan: RewooPlan) -> str:
+    """
+    A plan as the solver sees it: its reasoning, then its action on one line, like
+    `#E1 = search({"query": "capital of France"})`.
+    """
+    if plan.handoff is not None:
+        action = f"handoff to {plan.handoff.agent_name}: {plan.handoff.context}"
+    else:
+        tool_name = plan.tool_choice.name if plan.tool_choice else None
+        arguments = json.dumps(plan.tool_arguments or {}, default=str)
+        action = f"{tool_name}({arguments})"
+
+    return f"Plan: {plan.reasoning}\n#{plan.step_id} = {action}"
+
+
+class EvidenceCompactor:
+    """
+    Shrinks the plans and evidence of a ReWOO run to what the solver needs.
+
+    - Plans are rendered as one line each instead of their full dump.
+    - Sentences an earlier step's evidence already gave are dropped, and evidence
+      that only repeats earlier evidence is replaced by a pointer to it.
+    - Evidence over `max_evidence_tokens` is cut to its opening, or, with
+      `relevance_filter`, to the sentences sharing the most words with the query
+      and the plan that produced it.
+
+    Args:
+        limits: How far the evidence is compacted.
+    """
+
+    def __init__(self, limits: Optional[RewooEvidenceLimits] = None):
+        self.limits = limits or RewooEvidenceLimits()
+
+    def compact(
+        self, query: str, plan_and_evidence: List[Tuple[RewooPlan, RewooEvidence]]
+    ) -> str:
+        """
+        Render the plans and evidence of a run for the solver prompt.
+
+        Args:
+            query: The query of the run.
+            plan_and_evidence: Each executed plan with its evidence.
+
+        Returns:
+            str: The compacted plans and evidence.
+        """
+        # The step that first gave each snippet, by fingerprint
+        seen: Dict[str, str] = {}
+        blocks = []
+        original_tokens = 0
+
+        for plan, evidence in plan_and_evidence:
+            text = f"{evidence.content}"
+            original_tokens += estimate_tokens(text)
+
+            text = self._compact_evidence(query, plan, text, seen)
+            blocks.append(f"{render_plan(plan)}\nEvidence: {text}")
+
+        compacted = "\n".join(blocks)
+        logger.debug(
+            f"Compacted evidence from ~{original_tokens} to ~{estimate_tokens(compacted)} tokens"
+        )
+        return compacted
+
+    def _compact_evidence(
+        self, query: str, plan: RewooPlan, text: str, seen: Dict[str, str]
+    ) -> str:
+        snippets = _snippets(text)
+        if not self.limits.deduplicate:
+            return self._fit(query, plan, text, snippets)
+
+        kept = []
+        repeated_from: List[str] = []
+        for snippet in snippets:
+            first_step = seen.get(_fingerprint(snippet))
+            if first_step is not None:
+                repeated_from.append(first_step)
+            else:
+                kept.append(snippet)
+
+        if snippets and not kept:
+            return f"(same as #{repeated_from[0]})"
+        if repeated_from:
+            steps = ", ".join(f"#{step}" for step in dict.fromkeys(repeated_from))
+            text = " ".join(kept) + f" [repeats of {steps} removed]"
+
+        text = self._fit(query, plan, text, kept)
+
+        # Only what the solver actually sees counts as given
+        for snippet in kept:
+            fingerprint = _fingerprint(snippet)
+            if len(fingerprint) >= MIN_DUPLICATE_CHARS and snippet in text:
+                seen.setdefault(fingerprint, plan.step_id)
+
+        return text
+
+    def _fit(self, query: str, plan: RewooPlan, text: str, snippets: List[str]) -> str:
+        """Cut a piece of evidence down to the token budget."""
+        budget = self.limits.max_evidence_tokens
+        if budget is None or estimate_tokens(text) <= budget:
+            return text
+
+        if self.limits.relevance_filter:
+            terms = _terms(query) | _terms(
+                json.dumps(plan.tool_arguments or {}, default=str)
+            )
+            if plan.handoff is not None:
+                terms |= _terms(plan.handoff.context)
+
+            selected = self._select(snippets, terms, budget)
+            if selected is not None:
+                return selected
+
+        limit = budget * CHARS_PER_TOKEN
+        return f"{text[:limit]}... [truncated {len(text) - limit} characters]"
+
+    def _select(
+        self, snippets: List[str], terms: Set[str], budget: int
+    ) -> Optional[str]:
+        """
+        The most relevant snippets fitting the budget, in their original order. Snippets
+        sharing no words with the query are only used if none do.
+        """
+        scores = [len(_terms(snippet) & terms) for snippet in snippets]
+        ranked = sorted(range(len(snippets)), key=lambda index: (-scores[index], index))
+        if scores and max(scores) > 0:
+            ranked = [index for index in ranked if scores[index] > 0]
+
+        chosen = []
+        used = 0
+        for index in ranked:
+            cost = estimate_tokens(snippets[index])
+            if used + cost <= budget:
+                chosen.append(index)
+                used += cost
+
+        if not chosen:
+            return None
+
+        parts = []
+        previous = -1
+        for index in sorted(chosen):
+            if index != previous + 1:
+                parts.append("...")
+            parts.append(snippets[index])
+            previous = index
+        if previous != len(snippets) - 1:
+            parts.append("...")
+
+        return " ".join(parts) + (
+            f" [kept the {len(chosen)} of {len(snippets)} sentences most relevant to the query]"
+        )
@@ -0,0 +1,215 @@
+from collections import OrderedDict
+import re
+import string
+import threading
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from paaf.config.logging import get_logger
+from paaf.models.rewoo.rewoo_models import RewooPlan
+
+logger = get_logger(__name__)
+
+_formatter = string.Formatter()
+
+# Plan fields whose text may mention the query's parameters
+_PARAMETRIC_FIELDS = ("reasoning", "tool_arguments", "handoff")
+
+
+def _normalize_query(query: str) -> str:
+    """Collapse whitespace and drop trailing punctuation, keeping the case."""
+    return " ".join(query.split()).rstrip("?!.").strip()
+
+
+def _compile_query_template(template: str) -> "re.Pattern[str]":
+    """Turn `weather in {city}` into a pattern capturing `city`."""
+    parts = []
+    for literal, field_name, _, _ in _formatter.parse(_normalize_query(template)):
+        parts.append(r"\s+".join(re.escape(word) for word in literal.split(" ")))
+        if field_name is not None:
+            if not field_name.isidentifier():
+                raise ValueError(
+                    f"Query template fields must be named, got {{{field_name}}}."
+                )
+            parts.append(f"(?P<{field_name}>.+?)")
+
+    return re.compile("".join(parts), re.IGNORECASE)
+
+
+def _substitute(value: Any, pattern: "re.Pattern[str]", replacements: Dict[str, str]):
+    """Replace the old parameter values in every string of a (nested) plan field."""
+    if isinstance(value, str):
+        return pattern.sub(lambda match: replacements[match.group(0).lower()], value)
+    if isinstance(value, dict):
+        return {
+            key: _substitute(item, pattern, replacements) for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_substitute(item, pattern, replacements) for item in value]
+    return value
+
+
+def _mentions(value: Any, text: str) -> bool:
+    """Whether `text` appears, ignoring case, in any string of a (nested) value."""
+    if isinstance(value, str):
+        return text.lower() in value.lower()
+    if isinstance(value, dict):
+        return any(_mentions(item, text) for item in value.values())
+    if isinstance(value, list):
+        return any(_mentions(item, text) for item in value)
+    return False
+
+
+class PlanCache:
+    """
+    LRU cache of ReWOO plans, so repeated queries skip the planner's LLM call.
+
+    Plans are looked up by the query, normalized for case, whitespace and trailing
+    punctuation, and by a context key the agent derives from its tool catalog and
+    planner prompt. Registering a tool, a circuit opening or a prompt change therefore
+    starts from fresh entries, and stale ones age out.
+
+    Query templates like `weather in {city}` let one plan serve every query matching
+    the template: the cached plan's mentions of the earlier parameter values are
+    replaced with the new ones. A plan is only shared this way if its tool arguments
+    mention every parameter value; otherwise it's cached for its exact query only.
+
+    Args:
+        max_entries: Maximum number of plans kept.
+        query_templates: Query templates, with named `{field}` parameters.
+    """
+
+    def __init__(
+        self, max_entries: int = 256, query_templates: Optional[List[str]] = None
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+
+        self.max_entries = max_entries
+        # Dumped plans, and the parameter values they were made for, by key
+        self._entries: OrderedDict = OrderedDict()
+        self._templates: List[Tuple[str, "re.Pattern[str]"]] = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        for template in query_templates or []:
+            self.add_query_template(template)
+
+    def add_query_template(self, template: str):
+        """
+        Let every query matching `template` share a plan.
+
+        Args:
+            template: The query template, like `price of {product}`.
+        """
+        self._templates.append((template, _compile_query_template(template)))
+
+    def _key(
+        self, query: str, context: Hashable
+    ) -> Tuple[Tuple[Any, ...], Dict[str, str]]:
+        """The cache key of a query, and its parameter values if it matches a template."""
+        normalized = _normalize_query(query)
+        for template, pattern in self._templates:
+            match = pattern.fullmatch(normalized)
+            if match:
+                return ("template", template, context), match.groupdict()
+
+        return ("query", normalized.lower(), context), {}
+
+    def get(self, query: str, context: Hashable) -> Optional[List[RewooPlan]]:
+        """
+        Get the cached plans for a query.
+
+        Args:
+            query: The query to plan for.
+            context: Key of everything else the plans depend on.
+
+        Returns:
+            Optional[List[RewooPlan]]: Fresh copies of the plans, or None on a miss.
+        """
+        key, values = self._key(query, context)
+        exact_key = ("query", _normalize_query(query).lower(), context)
+
+        entry = None
+        with self._lock:
+            for candidate in dict.fromkeys((key, exact_key)):
+                entry = self._entries.get(candidate)
+                if entry is not None:
+                    self._entries.move_to_end(candidate)
+                    break
+
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        plans, cached_values = entry
+        if values and cached_values:
+            replacements = {
+                cached_values[name].lower(): values[name] for name in cached_values
+            }
+            pattern = re.compile(
+                "|".join(
+                    re.escape(value)
+                    for value in sorted(replacements, key=len, reverse=True)
+                ),
+                re.IGNORECASE,
+            )
+            plans = [
+                {
+                    **plan,
+                    **{
+                        field: _substitute(plan[field], pattern, replacements)
+                        for field in _PARAMETRIC_FIELDS
+                    },
+                }
+                for plan in plans
+            ]
+
+        return [RewooPlan.model_validate(plan) for plan in plans]
+
+    def put(self, query: str, context: Hashable, plans: List[RewooPlan]):
+        """
+        Cache the plans made for a query.
+
+        Args:
+            query: The query the plans were made for.
+            context: Key of everything else the plans depend on.
+            plans: The plans.
+        """
+        key, values = self._key(query, context)
+        dumped = [plan.model_dump(mode="json") for plan in plans]
+
+        if values and not all(
+            any(_mentions(plan["tool_arguments"], value) for plan in dumped)
+            for value in values.values()
+        ):
+            # The plans don't carry the parameters over, so they only fit this query
+            logger.debug(f"Plans for {query!r} don't use its parameters, caching as is")
+            key, values = ("query", _normalize_query(query).lower(), context), {}
+
+        with self._lock:
+            self._entries[key] = (dumped, values)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, query: str, context: Hashable):
+        """
+        Remove the plans cached for a query, e.g. because they failed when executed.
+
+        Args:
+            query: The query the plans were made for.
+            context: Key of everything else the plans depend on.
+        """
+        key, _ = self._key(query, context)
+        exact_key = ("query", _normalize_query(query).lower(), context)
+
+        with self._lock:
+            for candidate in dict.fromkeys((key, exact_key)):
+                self._entries.pop(candidate, None)
+
+    def clear(self):
+        """Remove every cached plan."""
+        with self._lock:
+            self._entries.clear()
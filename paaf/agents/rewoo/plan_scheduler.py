@@ -0,0 +1,216 @@
+import re
+from typing import Any, Dict, List, Set
+
+from paaf.config.logging import get_logger
+from paaf.models.rewoo.rewoo_models import RewooPlan
+
+logger = get_logger(__name__)
+
+# A reference to the evidence of a step, like #E1
+EVIDENCE_REFERENCE = re.compile(r"#(\w+)")
+
+
+def assign_step_ids(plans: List[RewooPlan]):
+    """
+    Give every plan a unique step id, numbering the plans without one (or with the
+    id of an earlier plan) by position, or with the next id not taken if that's used.
+    """
+    # The plan keeping each id given by the planner: the first one using it
+    owners: Dict[str, int] = {}
+    for index, plan in enumerate(plans):
+        if plan.step_id:
+            owners.setdefault(plan.step_id, index)
+
+    used = set(owners)
+    for index, plan in enumerate(plans):
+        if plan.step_id and owners[plan.step_id] == index:
+            continue
+
+        number = index + 1
+        while f"E{number}" in used:
+            number += 1
+
+        if plan.step_id:
+            logger.warning(
+                f"Duplicate plan step id {plan.step_id}, renaming it to E{number}"
+            )
+        plan.step_id = f"E{number}"
+        used.add(plan.step_id)
+
+
+def _references(value: Any) -> Set[str]:
+    """The step ids referenced anywhere in a (nested) argument value."""
+    if isinstance(value, str):
+        return set(EVIDENCE_REFERENCE.findall(value))
+    if isinstance(value, dict):
+        return set().union(*(_references(item) for item in value.values()))
+    if isinstance(value, (list, tuple)):
+        return set().union(*(_references(item) for item in value))
+    return set()
+
+
+def plan_dependencies(plan: RewooPlan, step_ids: Set[str]) -> Set[str]:
+    """
+    The steps a plan has to wait for: those it declares in `depends_on`, and those
+    whose evidence its tool arguments or handoff reference.
+
+    Args:
+        plan: The plan.
+        step_ids: The ids of all the steps of the run. Other references are ignored.
+    """
+    declared = set(plan.depends_on)
+    unknown = declared - step_ids
+    if unknown:
+        logger.warning(
+            f"Plan step {plan.step_id} depends on unknown step(s) {sorted(unknown)}"
+        )
+
+    referenced = _references(plan.tool_arguments or {})
+    if plan.handoff is not None:
+        referenced |= _references([plan.handoff.context, plan.handoff.input_data])
+
+    return ((declared | referenced) & step_ids) - {plan.step_id}
+
+
+def acyclic_dependencies(plans: List[RewooPlan]) -> Dict[str, Set[str]]:
+    """
+    The steps each plan has to wait for, with dependency cycles broken.
+
+    Plans depending on each other in a cycle fall back to plan order: within the cycle,
+    each only waits for the plans before it, and its references to the later ones stay
+    unresolved.
+
+    Args:
+        plans: The plans of the run, with their step ids assigned.
+
+    Returns:
+        Dict[str, Set[str]]: The steps each plan waits for, by step id.
+    """
+    step_ids = {plan.step_id for plan in plans}
+    dependencies = {plan.step_id: plan_dependencies(plan, step_ids) for plan in plans}
+
+    def waits_on(start: str, target: str) -> bool:
+        """Whether `start` waits for `target`, directly or through other steps."""
+        seen, frontier = set(), [start]
+        while frontier:
+            step_id = frontier.pop()
+            if step_id == target:
+                return True
+            if step_id not in seen:
+                seen.add(step_id)
+                frontier.extend(dependencies[step_id])
+        return False
+
+    # An edge to a later plan that leads back to the plan closes a cycle
+    position = {plan.step_id: index for index, plan in enumerate(plans)}
+    dropped = {
+        (step_id, used)
+        for step_id, uses in dependencies.items()
+        for used in uses
+        if position[used] > position[step_id] and waits_on(used, step_id)
+    }
+
+    if dropped:
+        logger.warning(
+            f"Plan steps {sorted({step for edge in dropped for step in edge})} depend on "
+            "each other in a cycle, running them in plan order"
+        )
+        for step_id, used in dropped:
+            dependencies[step_id].discard(used)
+
+    return dependencies
+
+
+def dependent_steps(plans: List[RewooPlan], step_ids: Set[str]) -> Set[str]:
+    """
+    The steps using the evidence of the given steps, directly or through other steps.
+
+    Args:
+        plans: The plans of the run.
+        step_ids: The steps whose dependents to find.
+    """
+    all_step_ids = {plan.step_id for plan in plans}
+    dependencies = {
+        plan.step_id: plan_dependencies(plan, all_step_ids) for plan in plans
+    }
+
+    dependents: Set[str] = set()
+    frontier = set(step_ids)
+    while frontier:
+        frontier = {
+            step_id
+            for step_id, uses in dependencies.items()
+            if uses & frontier and step_id not in dependents | step_ids
+        }
+        dependents |= frontier
+
+    return dependents
+
+
+def schedule_waves(plans: List[RewooPlan]) -> List[List[int]]:
+    """
+    Order the plans of a run into waves that can each run in parallel.
+
+    Every plan runs in the wave after the last of its dependencies, so each wave is as
+    large as the data dependencies allow. Plans in a dependency cycle run in plan order,
+    see `acyclic_dependencies`. Plans need their step ids assigned.
+
+    Args:
+        plans: The plans of the run.
+
+    Returns:
+        List[List[int]]: The indices of the plans in each wave, in plan order.
+    """
+    dependencies = acyclic_dependencies(plans)
+    index_of = {plan.step_id: index for index, plan in enumerate(plans)}
+    remaining = {
+        index: {index_of[step_id] for step_id in dependencies[plan.step_id]}
+        for index, plan in enumerate(plans)
+    }
+
+    waves: List[List[int]] = []
+    while remaining:
+        wave = [index for index, waits_on in remaining.items() if not waits_on]
+
+        for index in wave:
+            del remaining[index]
+        for waits_on in remaining.values():
+            waits_on.difference_update(wave)
+
+        waves.append(sorted(wave))
+
+    return waves
+
+
+def resolve_arguments(value: Any, evidence: Dict[str, Any]) -> Any:
+    """
+    Replace the evidence references in tool arguments with the evidence.
+
+    An argument that is just a reference (`"#E1"`) gets the evidence as is; a reference
+    inside a longer string is replaced by the evidence's text.
+
+    Args:
+        value: The tool arguments, or a value nested in them.
+        evidence: The evidence gathered so far, by step id.
+
+    Returns:
+        Any: The arguments with the known references substituted.
+    """
+    if isinstance(value, str):
+        whole = EVIDENCE_REFERENCE.fullmatch(value.strip())
+        if whole and whole.group(1) in evidence:
+            return evidence[whole.group(1)]
+
+        return EVIDENCE_REFERENCE.sub(
+            lambda match: (
+                str(evidence[match.group(1)])
+                if match.group(1) in evidence
+                else match.group(0)
+            ),
+            value,
+        )
+    if isinstance(value, dict):
+        return {key: resolve_arguments(item, evidence) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve_arguments(item, evidence) for item in value]
+    return value
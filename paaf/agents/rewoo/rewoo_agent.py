@@ -1,5 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import json
-from typing import Any, Dict, List, Optional, Tuple
+import math
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 from pydantic import BaseModel
 from pydantic import BaseModel
@@ -7,17 +10,57 @@ from paaf.config.logging import get_logger
 
 
 from paaf.agents.base_agent import BaseAgent
+from paaf.agents.rewoo.evidence_compactor import EvidenceCompactor, render_plan
+from paaf.agents.rewoo.plan_cache import PlanCache
+from paaf.agents.rewoo.plan_scheduler import (
+    assign_step_ids,
+    dependent_steps,
+    resolve_arguments,
+    schedule_waves,
+)
+from paaf.agents.rewoo.step_runner import StepRunner
+from paaf.checkpoints.base_checkpoint_store import BaseCheckpointStore
 from paaf.llms.base_llm import BaseLLM
 from paaf.models.shared_models import Message, ToolChoice
+from paaf.models.tool import Tool
+from paaf.models.tool_stream import ToolStreamLimits
 from paaf.tools.tool_registory import ToolRegistry
-from paaf.models.agent_handoff import AgentHandoff
+from paaf.models.agent_handoff import AgentHandoff, AgentHandoffResponse
 from paaf.models.agent_response import AgentResponse
+from paaf.models.agent_step_event import AgentStepEvent
+from paaf.models.utils.json_extraction import (
+    JSONExtractionError,
+    extract_json,
+    strip_code_fence,
+)
+
+
+from paaf.models.rewoo.rewoo_early_solve import LateEvidenceMode, RewooEarlySolveLimits
+from paaf.models.rewoo.rewoo_evidence_limits import RewooEvidenceLimits
+from paaf.models.rewoo.rewoo_models import (
+    RewooPlan,
+    RewooEvidence,
+    RewooActionType,
+    RewooSession,
+)
 
+logger = get_logger(__name__)
 
-from paaf.models.rewoo.rewoo_models import RewooPlan, RewooEvidence, RewooActionType
+# Evidence of a step whose tool or handoff failed
+NO_EVIDENCE = "No Evidence Found"
 
+# How much of each completed step's evidence the replanner is shown
+REPLAN_EVIDENCE_PREVIEW_CHARS = 200
 
-logger = get_logger(__name__)
+
+def _is_missing(content: Any) -> bool:
+    """Whether a step's evidence is a failure or empty."""
+    return (
+        content is None
+        or content == NO_EVIDENCE
+        or (isinstance(content, str) and not content.strip())
+        or (isinstance(content, (list, dict, tuple)) and not content)
+    )
 
 
 class ReWOOAgent(BaseAgent):
@@ -31,6 +74,13 @@ class ReWOOAgent(BaseAgent):
         tool_registry: ToolRegistry | None = None,
         output_format: BaseModel | None = None,
         system_prompt: str | None = None,
+        stream_limits: Optional[ToolStreamLimits] = None,
+        checkpoint_store: Optional[BaseCheckpointStore] = None,
+        max_workers: int = 4,
+        plan_cache: Optional[PlanCache] = None,
+        evidence_limits: Optional[RewooEvidenceLimits] = None,
+        max_replans: int = 1,
+        early_solve: Optional[RewooEarlySolveLimits] = None,
     ):
         super().__init__(
             llm=llm,
@@ -39,14 +89,40 @@ class ReWOOAgent(BaseAgent):
             system_prompt=system_prompt,
         )
 
+        self.stream_limits = stream_limits or ToolStreamLimits()
+        self.checkpoint_store = checkpoint_store
+        # Planned tool calls executed at the same time; 1 runs them one after another
+        self.max_workers = max_workers
+
+        # Plans of earlier queries, reused instead of calling the planner again
+        self.plan_cache = plan_cache
+
+        # Shrinks the evidence given to the solver
+        self.evidence_compactor = EvidenceCompactor(evidence_limits)
+
+        # Times a run may replan the steps that got no evidence; 0 never replans
+        self.max_replans = max_replans
+
+        # Lets the solver start on a quorum of the evidence; None waits for all of it
+        self.early_solve = early_solve
+
+        # Runs the specialists of handoff plans; set by MultiAgent
+        self.handoff_executor: Optional[
+            Callable[[AgentHandoff, str], AgentHandoffResponse]
+        ] = None
+
         self.planner_template = None
         self.solver_template = None
+        self.replanner_template = None
+        self.refiner_template = None
 
-        self.plans: List[RewooPlan] = []
-        self.plan_and_evidence: List[Tuple[RewooPlan, RewooEvidence]] = []
+        # Plans and evidence of each run live in a RewooSession, so the agent
+        # itself holds configuration only.
 
         self.load_planner_template()
         self.load_solver_template()
+        self.load_replanner_template()
+        self.load_refiner_template()
 
     def load_planner_template(self):
         """
@@ -86,26 +162,189 @@ class ReWOOAgent(BaseAgent):
         with open(template_path, "r") as file:
             self.solver_template = file.read()
 
-    def _clean_response(self, response: str) -> str:
-        clean_response = response.strip().strip("`").strip()
-        if clean_response.startswith("json"):
-            clean_response = clean_response[4:].strip()
+    def load_replanner_template(self):
+        """
+        Loads the replanner template for replacing the plans that got no evidence.
+        """
+
+        # Get the current enclosing directory
+        import os
 
-        return clean_response
+        current_dir = os.path.dirname(os.path.abspath(__file__))
 
-    def run(self, query: str):
+        # Construct the path to the template file
+        template_path = os.path.join(current_dir, "rewoo_replanner_template.txt")
+
+        if not os.path.exists(template_path):
+            raise FileNotFoundError(f"Template file not found: {template_path}")
+
+        with open(template_path, "r") as file:
+            self.replanner_template = file.read()
+
+    def load_refiner_template(self):
+        """
+        Loads the refiner template for updating an early answer with late evidence.
+        """
+
+        # Get the current enclosing directory
+        import os
+
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+
+        # Construct the path to the template file
+        template_path = os.path.join(current_dir, "rewoo_refiner_template.txt")
+
+        if not os.path.exists(template_path):
+            raise FileNotFoundError(f"Template file not found: {template_path}")
+
+        with open(template_path, "r") as file:
+            self.refiner_template = file.read()
+
+    def run(self, query: str, run_id: Optional[str] = None):
         """
         Run the ReWOO agent to generate a plan and evidence.
         This method should be overridden by subclasses to implement specific logic.
+
+        Args:
+            query: The user query to process
+            run_id: Id to give the run, e.g. to `resume()` it later. Generated if not given.
+        """
+
+        session = RewooSession(
+            **({"run_id": run_id} if run_id is not None else {}),
+            query=query,
+        )
+        self.save_session(session)
+
+        return self._continue(session)
+
+    def resume(self, run_id: str):
+        """
+        Continue a run from its last checkpoint, e.g. after the worker running it died.
+
+        Planning and evidence gathering are checkpointed once done, so a resumed run
+        only repeats the stage that was interrupted.
+
+        Args:
+            run_id: The id of the run to resume.
+
+        Raises:
+            ValueError: If the agent has no checkpoint store or the run has no checkpoint.
+        """
+        session = self.load_session(run_id, RewooSession)
+
+        return self._continue(session)
+
+    def run_stream(
+        self, query: str, run_id: Optional[str] = None
+    ) -> Iterator[Union[AgentStepEvent, AgentResponse]]:
+        """
+        Run the ReWOO agent, yielding its progress as each stage completes.
+
+        Args:
+            query: The user query to process
+            run_id: Id to give the run, e.g. to `resume()` it later. Generated if not given.
+
+        Yields:
+            An AgentStepEvent per plan once planning is done, one with the new plans if
+            steps were replanned, one per piece of evidence once the tools ran, one when
+            the solver answered, then the final AgentResponse. With `early_solve`, the
+            solver's answer is also yielded chunk by chunk as it's generated.
         """
+        session = RewooSession(
+            **({"run_id": run_id} if run_id is not None else {}),
+            query=query,
+        )
+        self.save_session(session)
+
+        yield from self._continue_stream(session)
+
+    def _continue(self, session: RewooSession):
+        """Execute the stages of a run that haven't completed yet."""
+        result = None
+        for result in self._continue_stream(session):
+            pass
+
+        return result
+
+    def _continue_stream(self, session: RewooSession):
+        """Execute the stages of a run that haven't completed yet, yielding progress."""
+        step_number = 0
+
+        def event(step_type: str, description: str, **details) -> AgentStepEvent:
+            nonlocal step_number
+            step_number += 1
+            return AgentStepEvent(
+                run_id=session.run_id,
+                agent_name=self.__class__.__name__,
+                step_type=step_type,
+                step_number=step_number,
+                description=description,
+                details=details,
+            )
+
+        if not session.plans:
+            self._plan(session)
+            self.save_session(session)
+
+            for plan in session.plans:
+                yield event("plan", plan.reasoning, plan=plan.model_dump())
+
+        gathering = not session.plan_and_evidence
+        try:
+            if self.early_solve is not None and not session.plan_and_evidence:
+                yield from self._solve_early(session, event)
+
+            if not session.plan_and_evidence:
+                self._worker(session)
+                self.save_session(session)
+
+                if session.replan_count:
+                    yield event(
+                        "replan",
+                        "Replanned the steps that got no evidence",
+                        replan_count=session.replan_count,
+                        plans=[plan.model_dump() for plan in session.plans],
+                    )
+
+                yield from self._evidence_events(event, session.plan_and_evidence)
+        except Exception:
+            self._cache_plans(session, worked=False)
+            raise
 
-        self.query = query
+        if gathering:
+            self._cache_plans(session)
 
-        self._plan()
-        self._worker()
+        if session.response is None:
+            session.response = self._solve(session)
+            self.save_session(session)
 
-        response = self._solve()
+            yield event("solve", "Solved the query from the evidence")
 
+        yield self._build_result(session, session.response)
+
+    def _evidence_events(
+        self,
+        event: Callable[..., AgentStepEvent],
+        plan_and_evidence: List[Tuple[RewooPlan, RewooEvidence]],
+    ) -> Iterator[AgentStepEvent]:
+        for plan, evidence in plan_and_evidence:
+            tool_name = plan.tool_choice.name if plan.tool_choice else None
+            source = (
+                f"agent {plan.handoff.agent_name}"
+                if plan.handoff is not None
+                else f"tool {tool_name}"
+            )
+            yield event(
+                "evidence",
+                f"Evidence from {source}",
+                tool_used=tool_name,
+                tool_arguments=plan.tool_arguments,
+                evidence=evidence.content,
+            )
+
+    def _build_result(self, session: RewooSession, response: str):
+        """Format the solver's response as the final response of the run."""
         final_response = None
         if self.output_format is not None:
             # If an output format is defined, try to parse the last message content as the structured format
@@ -114,12 +353,10 @@ class ReWOOAgent(BaseAgent):
                     final_response = self.output_format(response)
                 elif isinstance(response, str):
                     # Try to parse JSON string
-                    import json
-
                     try:
-                        content_dict = json.loads(response)
+                        content_dict = extract_json(response)
                         final_response = self.output_format(**content_dict)
-                    except (json.JSONDecodeError, TypeError):
+                    except (JSONExtractionError, TypeError):
                         # If it's not JSON, treat it as a string answer
                         final_response = str(response)
                 else:
@@ -132,17 +369,28 @@ class ReWOOAgent(BaseAgent):
 
         return self.wrap_response_with_handoff_check(
             content=final_response,
-            query=query,
+            query=session.query,
         )
 
+    def set_handoff_executor(
+        self, executor: Callable[[AgentHandoff, str], AgentHandoffResponse]
+    ):
+        """
+        Set how handoff plans are executed. Without an executor they're skipped.
+
+        Args:
+            executor: Runs the specialist of a handoff for a query, e.g.
+                `MultiAgent.execute_handoff`, which is set when the agent joins one.
+        """
+        self.handoff_executor = executor
+
     def should_handoff(self, query):
         return None
 
-    def _plan(self):
+    def _static_planner_values(self) -> dict:
         """
-        Generate a plan based on the current state and available tools.
+        Values of the planner template fields that only depend on the agent configuration.
         """
-
         handoff_structure = "null"
         if self.handoffs_enabled and self.handoff_capabilities:
             handoff_structure = json.dumps(
@@ -158,83 +406,511 @@ class ReWOOAgent(BaseAgent):
             )
         )
 
-        prompt = self.planner_template.format(
-            available_tools=[
-                tool.to_dict() for tool in self.tools_registry.tools.values()
+        return {
+            "available_tools": [
+                tool.to_dict() for tool in self.tools_registry.available_tools()
             ],
-            available_agents=self.get_available_agents_description(),
-            tool_plan_structure=tool_call_json,
-            agent_handoff_structure=handoff_structure,
-            query=self.query,
+            "available_agents": self.get_available_agents_description(),
+            "tool_plan_structure": tool_call_json,
+            "agent_handoff_structure": handoff_structure,
+        }
+
+    def _static_solver_values(self) -> dict:
+        """
+        Values of the solver template fields that only depend on the agent configuration.
+        """
+        response_format = ""
+        if self.output_format is not None:
+            response_format = (
+                f"Respond JUST in the JSON format:\n{self.get_output_format()}"
+            )
+
+        return {"response_format": response_format}
+
+    def _plan(self, session: RewooSession):
+        """
+        Generate a plan based on the current state and available tools.
+        """
+
+        if self.plan_cache is not None:
+            cached_plans = self.plan_cache.get(
+                session.query, self._plan_cache_context()
+            )
+            if cached_plans is not None:
+                logger.debug("Planner: Reusing cached plans")
+                session.plans = cached_plans
+                return
+
+        compiled = self.get_compiled_prompt(
+            "rewoo_planner", self.planner_template, self._static_planner_values
         )
+        prompt = compiled.render(query=session.query)
 
         logger.debug(f"Planner: Planning Steps...")
 
         response = self.llm.generate(prompt=prompt)
 
-        response = self._clean_response(response)
-
         logger.debug(f"Planned steps done..\n")
 
         # Parse the response to extract the plans
         try:
-            plans_data = json.loads(response)
-            if isinstance(plans_data, list):
-                self.plans = [RewooPlan(**plan) for plan in plans_data]
+            plans = self.parse_llm_json(response, Union[List[RewooPlan], RewooPlan])
+        except ValueError as e:
+            logger.error(f"Failed to parse planning response: {e}")
+            raise ValueError("Invalid response format from planner") from e
 
-            elif isinstance(plans_data, dict):
-                self.plans = [RewooPlan(**plans_data)]
+        session.plans = plans if isinstance(plans, list) else [plans]
+        assign_step_ids(session.plans)
 
-            else:
-                logger.error("Invalid response format from planner")
-                raise ValueError("Invalid response format from planner")
+    def _cache_plans(self, session: RewooSession, worked: bool = True):
+        """
+        Cache the plans of a run once they were executed, or evict them if they failed,
+        so plans that don't work aren't reused.
 
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse planning response: {e}")
-            raise ValueError("Invalid response format from planner") from e
+        Args:
+            session: The run, with its evidence gathered.
+            worked: False if executing the plans raised.
+        """
+        if self.plan_cache is None:
+            return
+
+        failed = self._failed_steps(session)
+        if self.early_solve is not None:
+            # Steps still running when the solver started got no evidence, but didn't fail
+            failed = [step_id for step_id in failed if step_id in session.step_evidence]
+
+        context = self._plan_cache_context()
+        if worked and not failed:
+            self.plan_cache.put(session.query, context, session.plans)
+        else:
+            logger.debug(f"Not caching the plans of run {session.run_id}: they failed")
+            self.plan_cache.discard(session.query, context)
+
+    def _plan_cache_context(self) -> str:
+        """
+        Key of what plans depend on besides the query: the tool catalog, the planner
+        template and the prompt configuration.
+        """
+        return hashlib.sha1(
+            repr((self.planner_template, self._prompt_config_key())).encode()
+        ).hexdigest()
 
-    def _worker(self):
+    def _worker(self, session: RewooSession):
         """
         Generate evidence based on the generated plans.
+
+        The plans are executed in waves: every plan runs once the steps whose evidence
+        it uses are done, with its `#E<n>` argument references replaced by that
+        evidence, and the plans of a wave run in parallel. Handoff plans run their
+        specialist agent through the handoff executor, alongside the tools, and the
+        specialist's answer is their evidence. The run is checkpointed after each wave.
+
+        Steps that get no evidence are then replanned, along with the steps using their
+        evidence, up to `max_replans` times; the evidence of the other steps is kept.
         """
 
         logger.debug("Worker: Executing all tools to get Evidence for plans")
 
-        if not self.plans:
+        if not session.plans:
             logger.error("No plans available for evidence generation")
             raise ValueError("No plans available for evidence generation")
 
-        # Run the solver for each plan
-        for plan in self.plans:
-            if plan.action_type == RewooActionType.HANDOFF:
-                continue
+        assign_step_ids(session.plans)
+        wave_count = self._execute_plans(session)
 
-            if plan.action_type != RewooActionType.TOOL_CALL:
-                logger.error(f"Unsupported action type: {plan.action_type}")
-                continue
+        while session.replan_count < self.max_replans and self._replan(session):
+            wave_count += self._execute_plans(session)
+
+        self._collect_plan_and_evidence(session)
 
-            tool_choice = plan.tool_choice
-            tool_arguments = plan.tool_arguments or {}
+        logger.debug(
+            f"Solver: Executed all tools for {len(session.plans)} plan(s) in {wave_count} wave(s)\n"
+        )
+
+    def _collect_plan_and_evidence(self, session: RewooSession):
+        """
+        Pair each plan that has evidence with it, in plan order, reporting the plans
+        with the arguments they were actually called with. If no plan has evidence,
+        every plan is paired with NO_EVIDENCE.
+        """
+        session.plan_and_evidence = []
+        evidence = {
+            step_id: step_evidence.content
+            for step_id, step_evidence in session.step_evidence.items()
+        }
+
+        for plan in session.plans:
+            step_evidence = session.step_evidence.get(plan.step_id)
+            if step_evidence is None:
+                continue
 
-            if not isinstance(tool_choice, ToolChoice):
-                logger.error(
-                    f"Invalid tool choice format: {tool_choice}. Expected ToolChoice."
+            if isinstance(plan.tool_arguments, dict):
+                plan = plan.model_copy(
+                    update={
+                        "tool_arguments": resolve_arguments(
+                            plan.tool_arguments, evidence
+                        )
+                    }
+                )
+            if plan.handoff is not None:
+                plan = plan.model_copy(
+                    update={"handoff": self._resolve_handoff(plan.handoff, evidence)}
                 )
+            session.plan_and_evidence.append((plan, step_evidence))
+
+        if not session.plan_and_evidence:
+            # None of the plans could be executed; the solver still answers, knowing that
+            logger.warning("No plan could be executed, solving without evidence")
+            session.plan_and_evidence = [
+                (plan, RewooEvidence(content=NO_EVIDENCE)) for plan in session.plans
+            ]
+
+    def _execute_plans(self, session: RewooSession) -> int:
+        """
+        Execute the plans of a run that have no evidence yet, wave by wave.
+
+        Returns:
+            int: The number of waves.
+        """
+        waves = schedule_waves(session.plans)
+
+        evidence = {
+            step_id: step_evidence.content
+            for step_id, step_evidence in session.step_evidence.items()
+        }
+
+        for wave in waves:
+            pending_calls: List[Tuple[RewooPlan, ToolChoice, dict]] = []
+            pending_handoffs: List[Tuple[RewooPlan, AgentHandoff]] = []
+
+            # Collect the tool calls for each plan
+            for index in wave:
+                plan = session.plans[index]
+                if plan.step_id in session.step_evidence:
+                    # Executed before the run was resumed
+                    continue
+
+                if not self._is_executable(plan):
+                    continue
+
+                if plan.action_type == RewooActionType.HANDOFF:
+                    pending_handoffs.append(
+                        (plan, self._resolve_handoff(plan.handoff, evidence))
+                    )
+                else:
+                    pending_calls.append(
+                        (
+                            plan,
+                            plan.tool_choice,
+                            resolve_arguments(plan.tool_arguments or {}, evidence),
+                        )
+                    )
+
+            if not pending_calls and not pending_handoffs:
                 continue
 
-            if not isinstance(tool_arguments, dict):
-                logger.error(
-                    f"Invalid tool arguments format: {tool_arguments}. Expected dict."
+            # Call the tools and the specialist agents at the same time
+            jobs = [
+                lambda: self._call_tools(
+                    [
+                        (tool_choice, tool_arguments)
+                        for _, tool_choice, tool_arguments in pending_calls
+                    ]
                 )
+            ] + [
+                lambda handoff=handoff: self._call_handoff(handoff, session.query)
+                for _, handoff in pending_handoffs
+            ]
+            results = self._map_parallel(lambda job: job(), jobs)
+
+            finished = [
+                (plan, result)
+                for (plan, _, _), result in zip(pending_calls, results[0])
+            ] + [
+                (plan, result)
+                for (plan, _), result in zip(pending_handoffs, results[1:])
+            ]
+            for plan, result in finished:
+                session.step_evidence[plan.step_id] = RewooEvidence(content=result)
+                evidence[plan.step_id] = result
+
+            self.save_session(session)
+
+        return len(waves)
+
+    def _is_executable(self, plan: RewooPlan) -> bool:
+        """Whether a plan can be executed, logging why if it can't."""
+        if plan.action_type == RewooActionType.HANDOFF:
+            if self.handoff_executor is None or plan.handoff is None:
+                logger.warning(
+                    f"Skipping handoff plan {plan.step_id}: no handoff executor or handoff details"
+                )
+                return False
+            return True
+
+        if plan.action_type != RewooActionType.TOOL_CALL:
+            logger.error(f"Unsupported action type: {plan.action_type}")
+            return False
+
+        tool_choice = plan.tool_choice
+        tool_arguments = plan.tool_arguments or {}
+
+        if not isinstance(tool_choice, ToolChoice):
+            logger.error(
+                f"Invalid tool choice format: {tool_choice}. Expected ToolChoice."
+            )
+            return False
+
+        if not isinstance(tool_arguments, dict):
+            logger.error(
+                f"Invalid tool arguments format: {tool_arguments}. Expected dict."
+            )
+            return False
+
+        return True
+
+    def _failed_steps(self, session: RewooSession) -> List[str]:
+        """The steps that got no evidence, or empty evidence."""
+        failed = []
+        for plan in session.plans:
+            if (
+                plan.action_type == RewooActionType.HANDOFF
+                and self.handoff_executor is None
+            ):
+                # Not executed by this agent at all, so replanning wouldn't help
                 continue
 
-            # Call the tool based on the decision made by the planner
-            result = self._call_tool(tool_choice, tool_arguments)
-            evidence = RewooEvidence(content=result)
+            step_evidence = session.step_evidence.get(plan.step_id)
+            if step_evidence is None or _is_missing(step_evidence.content):
+                failed.append(plan.step_id)
+
+        return failed
+
+    def _replan(self, session: RewooSession) -> bool:
+        """
+        Replace the plans of the steps that got no evidence, and of the steps using
+        their evidence, with new plans from one replanner call.
+
+        Returns:
+            bool: Whether plans were replaced and need executing.
+        """
+        failed = self._failed_steps(session)
+        if not failed:
+            return False
+
+        replaced = set(failed) | dependent_steps(session.plans, set(failed))
+        session.replan_count += 1
+        logger.debug(
+            f"Replanner: Steps {failed} got no evidence, replanning {sorted(replaced)}"
+        )
+
+        completed_steps = []
+        for plan in session.plans:
+            if plan.step_id in replaced:
+                continue
+
+            step_evidence = session.step_evidence.get(plan.step_id)
+            if step_evidence is None:
+                # Never executed, e.g. a handoff without a handoff executor
+                completed_steps.append(f"{render_plan(plan)}\nEvidence: (not executed)")
+                continue
+
+            content = f"{step_evidence.content}"
+            if len(content) > REPLAN_EVIDENCE_PREVIEW_CHARS:
+                content = content[:REPLAN_EVIDENCE_PREVIEW_CHARS] + "..."
+            completed_steps.append(f"{render_plan(plan)}\nEvidence: {content}")
+
+        compiled = self.get_compiled_prompt(
+            "rewoo_replanner", self.replanner_template, self._static_planner_values
+        )
+        prompt = compiled.render(
+            query=session.query,
+            completed_steps="\n".join(completed_steps) or "None",
+            failed_steps="\n".join(
+                render_plan(plan) for plan in session.plans if plan.step_id in failed
+            ),
+            replaced_steps="\n".join(
+                render_plan(plan) for plan in session.plans if plan.step_id in replaced
+            ),
+        )
+
+        response = self.llm.generate(prompt=prompt)
+
+        try:
+            new_plans = self.parse_llm_json(response, Union[List[RewooPlan], RewooPlan])
+        except ValueError as e:
+            logger.error(f"Failed to parse replanning response: {e}")
+            return False
+
+        new_plans = new_plans if isinstance(new_plans, list) else [new_plans]
+        if not new_plans:
+            logger.debug("Replanner: No other way to get the missing evidence")
+            return False
+
+        session.plans = self._merge_replanned(session.plans, replaced, new_plans)
+        for step_id in replaced:
+            session.step_evidence.pop(step_id, None)
+        self.save_session(session)
+
+        return True
+
+    def _merge_replanned(
+        self, plans: List[RewooPlan], replaced: Set[str], new_plans: List[RewooPlan]
+    ) -> List[RewooPlan]:
+        """
+        Put the new plans where the first replaced plan was, renaming any whose step id
+        is missing or taken by a kept plan.
+        """
+        kept = [plan for plan in plans if plan.step_id not in replaced]
+        position = next(
+            index for index, plan in enumerate(plans) if plan.step_id in replaced
+        )
+
+        taken = {plan.step_id for plan in kept}
+        for plan in new_plans:
+            if plan.step_id in taken:
+                plan.step_id = None
+            taken.add(plan.step_id)
+
+        number = len(plans)
+        for plan in new_plans:
+            if not plan.step_id:
+                while f"E{number}" in taken:
+                    number += 1
+                plan.step_id = f"E{number}"
+                taken.add(plan.step_id)
+
+        return kept[:position] + new_plans + kept[position:]
+
+    def _resolve_handoff(
+        self, handoff: AgentHandoff, evidence: Dict[str, Any]
+    ) -> AgentHandoff:
+        """The handoff with the evidence references in its context and input replaced."""
+        return handoff.model_copy(
+            update={
+                "context": str(resolve_arguments(handoff.context, evidence)),
+                "input_data": resolve_arguments(handoff.input_data, evidence),
+            }
+        )
+
+    def _call_handoff(self, handoff: AgentHandoff, query: str) -> Any:
+        """
+        Run the specialist of a handoff plan, returning its answer as evidence.
+        """
+        logger.debug(f"Handing off to {handoff.agent_name} for evidence")
+
+        try:
+            response = self.handoff_executor(handoff, query)
+        except Exception as e:
+            logger.error(f"Error executing handoff to {handoff.agent_name}: {e}")
+            return NO_EVIDENCE
+
+        if not response.success:
+            logger.error(
+                f"Handoff to {handoff.agent_name} failed: {response.error_message}"
+            )
+            return NO_EVIDENCE
+
+        logger.debug(f"Got evidence from agent {handoff.agent_name}")
+
+        result = response.response
+        return result.content if isinstance(result, AgentResponse) else result
+
+    def _call_tools(self, calls: List[Tuple[ToolChoice, dict]]) -> List[Any]:
+        """
+        Execute the planned tool calls, coalescing calls to batch-capable tools.
+
+        Calls to a tool that registered a batch implementation are grouped into a single
+        batched invocation. The invocations are independent of each other, so up to
+        `max_workers` of them run at the same time, and the results are scattered back
+        in plan order.
+
+        Args:
+            calls: The (tool choice, tool arguments) pairs to execute.
+
+        Returns:
+            List[Any]: The result of each call, in the same order as `calls`.
+        """
+        # Indices of the calls made by each invocation
+        groups: List[List[int]] = []
+
+        batch_groups: Dict[str, List[int]] = {}
+        for index, (tool_choice, _) in enumerate(calls):
+            tool = self.tools_registry.get_tool(tool_choice)
+            if tool is not None and tool.supports_batching:
+                batch_groups.setdefault(tool.tool_id, []).append(index)
+            else:
+                groups.append([index])
+        groups.extend(batch_groups.values())
+
+        def invoke(indices: List[int]) -> List[Any]:
+            if len(indices) == 1:
+                return [self._call_tool(*calls[indices[0]])]
+
+            return self._call_tool_batch(
+                self.tools_registry.get_tool(calls[indices[0]][0]),
+                [calls[index][1] for index in indices],
+            )
+
+        results: List[Any] = [None] * len(calls)
+        for indices, group_results in zip(groups, self._map_parallel(invoke, groups)):
+            for index, result in zip(indices, group_results):
+                results[index] = result
 
-            self.plan_and_evidence.append((plan, evidence))
+        return results
 
-        logger.debug(f"Solver: Executed all tools for {len(self.plans)} plan(s)\n")
+    def _map_parallel(self, func: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+        """
+        Apply `func` to independent items, up to `max_workers` at a time.
+
+        Returns:
+            List[Any]: The result for each item, in the same order as `items`.
+        """
+        if len(items) <= 1 or self.max_workers <= 1:
+            return [func(item) for item in items]
+
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(items)),
+            thread_name_prefix="paaf-rewoo-worker",
+        ) as executor:
+            return list(executor.map(func, items))
+
+    def _call_tool_batch(self, tool: Tool, arguments_list: List[dict]) -> List[Any]:
+        """
+        Call a batch-capable tool once for several argument sets.
+
+        Argument sets that fail validation get no evidence without failing the rest of the batch.
+        """
+        results: List[Any] = [NO_EVIDENCE] * len(arguments_list)
+
+        valid_indices = []
+        valid_arguments = []
+        for index, arguments in enumerate(arguments_list):
+            try:
+                valid_arguments.append(tool.validate_arguments(arguments))
+                valid_indices.append(index)
+            except Exception as e:
+                logger.error(f"Error executing tool {tool.name}: {e}")
+
+        if not valid_indices:
+            return results
+
+        logger.debug(
+            f"Executing tool: {tool.name} as a batch of {len(valid_indices)} call(s)\n"
+        )
+
+        try:
+            batch_results = tool.call_batch(valid_arguments, validate=False)
+        except Exception as e:
+            logger.error(f"Error executing batch for tool {tool.name}: {e}")
+            return results
+
+        for index, result in zip(valid_indices, batch_results):
+            results[index] = result
+
+        logger.debug(f"Executed tool: {tool.name} as a batch and gotten results")
+
+        return results
 
     def _call_tool(self, tool_choice: ToolChoice, tool_arguments: dict):
         """
@@ -243,10 +919,10 @@ class ReWOOAgent(BaseAgent):
         This function executes the chosen tool and returns the result.
         """
 
-        if tool_choice.tool_id not in self.tools_registry.tools:
-            return "No Evidence Found"
-
-        tool = self.tools_registry.tools[tool_choice.tool_id]
+        tool = self.tools_registry.get_tool(tool_choice)
+        if tool is None:
+            logger.error(f"Tool {tool_choice.name} not found in registry.")
+            return NO_EVIDENCE
 
         if not tool.callable:
             raise ValueError(
@@ -258,43 +934,187 @@ class ReWOOAgent(BaseAgent):
             f"Executing tool: {tool_choice.name} with arguments: {tool_arguments}\n"
         )
 
-        result = "No Evidence Found"
+        result = NO_EVIDENCE
         try:
-            result = tool(**tool_arguments)
+            if tool.is_streaming:
+                stream_result = tool.collect(tool_arguments, self.stream_limits)
+                result = stream_result.to_observation()
+            else:
+                result = tool(**tool_arguments)
         except Exception as e:
             logger.error(f"Error executing tool {tool_choice.name}: {e}")
-            result = "No Evidence Found"
+            result = NO_EVIDENCE
 
         logger.debug(f"Executed tool: {tool_choice.name} and gotten result")
 
         return result
 
-    def _solve(self):
+    def _solve(self, session: RewooSession):
         """
         Generate a final response based on the generated plans and evidence.
         """
 
-        if not self.plan_and_evidence:
+        prompt = self._solver_prompt(session)
+
+        logger.debug("Solver: Generating final response...")
+        response = self.llm.generate(prompt=prompt)
+        logger.debug("Solver: Generated final response..\n")
+
+        return strip_code_fence(response)
+
+    def _solver_prompt(self, session: RewooSession) -> str:
+        """The solver prompt for the plans and evidence of a run."""
+        if not session.plan_and_evidence:
             logger.error("No plan and evidence available for solving")
             raise ValueError("No plan and evidence available for solving")
 
-        plan_and_evidence_str = "\n".join(
-            f"Plan: {plan.model_dump()}\nEvidence: {evidence.content}"
-            for plan, evidence in self.plan_and_evidence
+        plan_and_evidence_str = self.evidence_compactor.compact(
+            session.query, session.plan_and_evidence
         )
 
-        response_format = ""
-        if self.output_format is not None:
-            response_format = f"Respond JUST in the JSON format:\n{self.get_output_format()}"
-
-        prompt = self.solver_template.format(
-            query=self.query,
+        compiled = self.get_compiled_prompt(
+            "rewoo_solver", self.solver_template, self._static_solver_values
+        )
+        return compiled.render(
+            query=session.query,
             plan_and_evidence=plan_and_evidence_str,
-            response_format=response_format,
         )
 
-        logger.debug("Solver: Generating final response...")
+    def _solve_early(
+        self, session: RewooSession, event: Callable[..., AgentStepEvent]
+    ) -> Iterator[AgentStepEvent]:
+        """
+        Gather evidence until the `early_solve` quorum is reached, then stream the
+        solver's answer while the remaining steps run.
+
+        Steps start as soon as the steps they use are done, one tool call each, and
+        aren't replanned. Depending on `late_evidence`, the evidence of the steps still
+        running when the solver starts is dropped, or used to refine the answer.
+        """
+        limits = self.early_solve
+
+        if not session.plans:
+            logger.error("No plans available for evidence generation")
+            raise ValueError("No plans available for evidence generation")
+
+        assign_step_ids(session.plans)
+
+        executable = [
+            plan.step_id
+            for plan in session.plans
+            if plan.step_id in session.step_evidence or self._is_executable(plan)
+        ]
+        skipped = {plan.step_id for plan in session.plans} - set(executable)
+        needed = math.ceil(limits.quorum * len(executable))
+        required = set(limits.required_steps) & set(executable)
+
+        runner = StepRunner(
+            session.plans,
+            finished=set(session.step_evidence) | skipped,
+            evidence={
+                step_id: step_evidence.content
+                for step_id, step_evidence in session.step_evidence.items()
+            },
+            execute=lambda plan, evidence: self._execute_step(
+                plan, evidence, session.query
+            ),
+            max_workers=self.max_workers,
+        )
+
+        def enough() -> bool:
+            gathered = {
+                step_id
+                for step_id, content in runner.evidence.items()
+                if not _is_missing(content)
+            }
+            return len(gathered) >= needed and required <= set(runner.evidence)
+
+        try:
+            runner.run_until(enough)
+            self._record_evidence(session, runner)
+            late_steps = runner.pending
+
+            logger.debug(
+                f"Solver: Starting with the evidence of {len(session.step_evidence)} of {len(executable)} step(s)"
+            )
+            yield from self._evidence_events(event, session.plan_and_evidence)
+
+            chunks = []
+            for chunk in self.llm.generate_stream(prompt=self._solver_prompt(session)):
+                chunks.append(chunk)
+                yield event("solve_chunk", chunk, text=chunk)
+            session.response = strip_code_fence("".join(chunks))
+            self.save_session(session)
+
+            if late_steps and limits.late_evidence == LateEvidenceMode.REFINE:
+                reported = set(session.step_evidence)
+                runner.run_until(lambda: False)
+                self._record_evidence(session, runner)
+
+                late = [
+                    (plan, evidence)
+                    for plan, evidence in session.plan_and_evidence
+                    if plan.step_id not in reported
+                ]
+                yield from self._evidence_events(event, late)
+
+                if late:
+                    session.response = self._refine(session, late)
+                    self.save_session(session)
+                    yield event(
+                        "refine",
+                        "Refined the answer with the evidence that came in late",
+                        steps=[plan.step_id for plan, _ in late],
+                    )
+        finally:
+            runner.close()
+
+        yield event("solve", "Solved the query from the evidence")
+
+    def _execute_step(
+        self, plan: RewooPlan, evidence: Dict[str, Any], query: str
+    ) -> Any:
+        """Execute a single plan, given the evidence gathered before it started."""
+        try:
+            if plan.action_type == RewooActionType.HANDOFF:
+                return self._call_handoff(
+                    self._resolve_handoff(plan.handoff, evidence), query
+                )
+
+            return self._call_tool(
+                plan.tool_choice, resolve_arguments(plan.tool_arguments or {}, evidence)
+            )
+        except Exception as e:
+            logger.error(f"Error executing plan {plan.step_id}: {e}")
+            return NO_EVIDENCE
+
+    def _record_evidence(self, session: RewooSession, runner: StepRunner):
+        """Store the evidence of the steps the runner finished, and checkpoint it."""
+        for step_id in runner.completed:
+            if step_id not in session.step_evidence:
+                session.step_evidence[step_id] = RewooEvidence(
+                    content=runner.evidence[step_id]
+                )
+
+        self._collect_plan_and_evidence(session)
+        self.save_session(session)
+
+    def _refine(
+        self,
+        session: RewooSession,
+        late: List[Tuple[RewooPlan, RewooEvidence]],
+    ) -> str:
+        """Update the solver's answer with the evidence that came in after it started."""
+        compiled = self.get_compiled_prompt(
+            "rewoo_refiner", self.refiner_template, self._static_solver_values
+        )
+        prompt = compiled.render(
+            query=session.query,
+            draft_response=session.response,
+            late_evidence=self.evidence_compactor.compact(session.query, late),
+        )
+
+        logger.debug("Solver: Refining the response with late evidence...")
         response = self.llm.generate(prompt=prompt)
-        logger.debug("Solver: Generated final response..\n")
 
-        return self._clean_response(response)
+        return strip_code_fence(response)
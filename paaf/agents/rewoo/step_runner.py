@@ -0,0 +1,91 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Set
+
+from paaf.agents.rewoo.plan_scheduler import acyclic_dependencies
+from paaf.config.logging import get_logger
+from paaf.models.rewoo.rewoo_models import RewooPlan
+
+logger = get_logger(__name__)
+
+
+class StepRunner:
+    """
+    Runs the steps of a ReWOO run as soon as the steps they use are done, instead of
+    in waves, so the caller can stop waiting once it has enough evidence.
+
+    Args:
+        plans: The plans of the run. Plans in a dependency cycle run in plan order.
+        finished: Steps that count as done already, e.g. executed before a resume.
+        evidence: The evidence gathered so far, by step id.
+        execute: Runs a step, given the evidence gathered before it was started, and
+            returns its evidence. Shouldn't raise.
+        max_workers: Steps run at the same time.
+    """
+
+    def __init__(
+        self,
+        plans: List[RewooPlan],
+        finished: Set[str],
+        evidence: Dict[str, Any],
+        execute: Callable[[RewooPlan, Dict[str, Any]], Any],
+        max_workers: int,
+    ):
+        dependencies = acyclic_dependencies(plans)
+        # The steps not started yet, with the steps they still wait for
+        self._waiting = {
+            plan.step_id: (plan, dependencies[plan.step_id] - finished)
+            for plan in plans
+            if plan.step_id not in finished
+        }
+        self._running: Dict[Future, str] = {}
+        self._execute = execute
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="paaf-rewoo-worker"
+        )
+
+        self.evidence = dict(evidence)
+        # The steps executed by this runner, in the order they finished
+        self.completed: List[str] = []
+
+    @property
+    def pending(self) -> bool:
+        """Whether some steps haven't finished yet."""
+        return bool(self._waiting or self._running)
+
+    def run_until(self, enough: Callable[[], bool]):
+        """
+        Run steps until `enough()` is true or every step is done.
+
+        Steps already running when it returns keep running, and are picked up by the
+        next call.
+        """
+        self._start_ready()
+        while self._running and not enough():
+            done, _ = wait(self._running, return_when=FIRST_COMPLETED)
+            for future in done:
+                step_id = self._running.pop(future)
+                self.evidence[step_id] = future.result()
+                self.completed.append(step_id)
+
+                for _, waits_on in self._waiting.values():
+                    waits_on.discard(step_id)
+
+            self._start_ready()
+
+    def close(self):
+        """
+        Drop the steps not started yet. Steps still running finish in the background,
+        and their evidence is discarded.
+        """
+        if self.pending:
+            logger.debug(f"Dropping {len(self._waiting) + len(self._running)} step(s)")
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _start_ready(self):
+        for step_id, (plan, waits_on) in list(self._waiting.items()):
+            if waits_on:
+                continue
+
+            del self._waiting[step_id]
+            future = self._pool.submit(self._execute, plan, dict(self.evidence))
+            self._running[future] = step_id
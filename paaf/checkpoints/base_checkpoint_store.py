@@ -0,0 +1,52 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+
+class BaseCheckpointStore(ABC):
+    """
+    Base Class for durable storage of agent run checkpoints.
+
+    Agents save the state of a run as JSON after each completed step, keyed by the
+    run id, so a run interrupted by a crash or preemption can be resumed later.
+    """
+
+    @abstractmethod
+    def save(self, run_id: str, state: str):
+        """
+        Save (or overwrite) the checkpoint of a run.
+
+        Args:
+            run_id: The id of the run.
+            state: The serialized state of the run.
+        """
+        pass
+
+    @abstractmethod
+    def load(self, run_id: str) -> Optional[str]:
+        """
+        Load the latest checkpoint of a run.
+
+        Args:
+            run_id: The id of the run.
+
+        Returns:
+            Optional[str]: The serialized state, or None if the run has no checkpoint.
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, run_id: str):
+        """
+        Delete the checkpoint of a run, if any.
+
+        Args:
+            run_id: The id of the run.
+        """
+        pass
+
+    @abstractmethod
+    def list_runs(self) -> List[str]:
+        """
+        Get the ids of the runs that have a checkpoint.
+        """
+        pass
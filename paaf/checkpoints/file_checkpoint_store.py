@@ -0,0 +1,64 @@
+import os
+import re
+import tempfile
+from typing import List, Optional
+
+from paaf.checkpoints.base_checkpoint_store import BaseCheckpointStore
+
+_RUN_ID_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+class FileCheckpointStore(BaseCheckpointStore):
+    """
+    Checkpoint store keeping one JSON file per run in a local directory.
+
+    Files are written to a temporary file and renamed into place, so a crash while
+    saving leaves the previous checkpoint intact.
+
+    Args:
+        directory: Where the checkpoint files are kept. Created if missing.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, run_id: str) -> str:
+        if not _RUN_ID_PATTERN.match(run_id):
+            raise ValueError(f"Invalid run id for a checkpoint file: {run_id}")
+        return os.path.join(self.directory, f"{run_id}.json")
+
+    def save(self, run_id: str, state: str):
+        path = self._path(run_id)
+
+        descriptor, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                file.write(state)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def load(self, run_id: str) -> Optional[str]:
+        path = self._path(run_id)
+        if not os.path.exists(path):
+            return None
+
+        with open(path, "r", encoding="utf-8") as file:
+            return file.read()
+
+    def delete(self, run_id: str):
+        path = self._path(run_id)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def list_runs(self) -> List[str]:
+        return sorted(
+            name[: -len(".json")]
+            for name in os.listdir(self.directory)
+            if name.endswith(".json")
+        )
@@ -0,0 +1,70 @@
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+from paaf.checkpoints.base_checkpoint_store import BaseCheckpointStore
+
+
+class SQLiteCheckpointStore(BaseCheckpointStore):
+    """
+    Checkpoint store keeping runs in a SQLite database.
+
+    Suited to many runs on one machine, or several worker processes sharing a
+    database file.
+
+    Args:
+        path: Path of the database file, created if missing.
+        table: Name of the table holding the checkpoints.
+    """
+
+    def __init__(self, path: str, table: str = "paaf_checkpoints"):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+
+        self.path = path
+        self.table = table
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "run_id TEXT PRIMARY KEY, state TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    def save(self, run_id: str, state: str):
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"INSERT INTO {self.table} (run_id, state, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(run_id) DO UPDATE SET "
+                "state = excluded.state, updated_at = excluded.updated_at",
+                (run_id, state, time.time()),
+            )
+
+    def load(self, run_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT state FROM {self.table} WHERE run_id = ?", (run_id,)
+            ).fetchone()
+
+        return row[0] if row else None
+
+    def delete(self, run_id: str):
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"DELETE FROM {self.table} WHERE run_id = ?", (run_id,)
+            )
+
+    def list_runs(self) -> List[str]:
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT run_id FROM {self.table} ORDER BY updated_at"
+            ).fetchall()
+
+        return [row[0] for row in rows]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, List
+from typing import Any, Iterator, List
 
 from paaf.models.shared_models import Message
 from paaf.models.tool import Tool
@@ -23,3 +23,20 @@ class BaseLLM(ABC):
             Message: The generated response.
         """
         pass
+
+    def generate_stream(
+        self, prompt: str, response_format: Any = None
+    ) -> Iterator[str]:
+        """
+        Generate a response, yielding its text as it's produced.
+
+        LLMs that can't stream yield the whole response at once.
+
+        Args:
+            prompt (str): The prompt
+            response_format : The base model to have the output in, can be a string or a custom format.
+
+        Yields:
+            str: The next chunk of the response.
+        """
+        yield self.generate(prompt=prompt, response_format=response_format)
@@ -1,4 +1,5 @@
 import os
+from typing import Iterator
 from dotenv import load_dotenv
 import openai
 
@@ -58,3 +59,33 @@ class OpenAILLM(BaseLLM):
         )
 
         return response.choices[0].message.content.strip()
+
+    def generate_stream(self, prompt: str, response_format=None) -> Iterator[str]:
+        """
+        Generate a response based on the provided prompt, yielding it as it's produced.
+
+        Structured responses are only parsed once complete, so they're not streamed.
+
+        Args:
+            prompt (str): The prompt to generate a response for.
+            response_format: The format of the response, if any.
+
+        Yields:
+            str: The next chunk of the response.
+        """
+        if response_format:
+            yield self.generate(prompt=prompt, response_format=response_format)
+            return
+
+        stream = self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            stream=True,
+            **self.kwargs,
+        )
+
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, Field
+
+
+class AgentStepEvent(BaseModel):
+    """
+    A step of an agent run, as yielded by `run_stream()`.
+
+    Agents without a dedicated step model (ReWOO, Chain of Thought) report their
+    progress with this; the ReAct agent yields its ReactStepSummary directly.
+    """
+
+    run_id: str = Field(..., description="The id of the run the step belongs to")
+    agent_name: str = Field(..., description="Name of the agent running the step")
+    step_type: str = Field(
+        ..., description="What the step did, e.g. plan, evidence, reasoning, solve"
+    )
+    step_number: int = Field(
+        ..., description="The sequential number of this step in the run"
+    )
+    timestamp: datetime = Field(
+        default_factory=datetime.now, description="When this step occurred"
+    )
+    description: Optional[str] = Field(
+        default=None, description="Description of what happened in the step"
+    )
+    details: Dict[str, Any] = Field(
+        default_factory=dict, description="Step specific details"
+    )
@@ -0,0 +1,28 @@
+from typing import Any, List
+import uuid
+
+from pydantic import BaseModel, Field
+
+from paaf.models.shared_models import Message
+
+
+class ChainOfThoughtSession(BaseModel):
+    """
+    State of a single Chain of Thought run.
+
+    The conversation lives here instead of on the agent, so one configured agent can
+    serve many runs at the same time without leaking history between them.
+    """
+
+    run_id: str = Field(
+        default_factory=lambda: str(uuid.uuid4()),
+        description="Unique identifier of the run",
+    )
+    query: str = Field(..., description="The query being processed")
+    messages: List[Message] = Field(
+        default_factory=list, description="Conversation history of the run"
+    )
+    current_step: int = Field(default=0, description="Current reasoning step")
+    reasoning_steps: List[Any] = Field(
+        default_factory=list, description="The reasoning steps given by the model"
+    )
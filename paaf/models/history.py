@@ -0,0 +1,69 @@
+from enum import StrEnum
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field
+
+
+class HistorySummaryMode(StrEnum):
+    """
+    How older turns are folded into the running summary.
+    """
+
+    EXTRACTIVE = "extractive"
+    """Keep the opening of each folded message. No extra LLM calls."""
+
+    LLM = "llm"
+    """Ask the agent's LLM to update the summary, falling back to extractive on failure."""
+
+
+class HistoryLimits(BaseModel):
+    """
+    Caps on how much conversation history an agent puts in each prompt.
+    """
+
+    max_observation_chars: Optional[int] = Field(
+        default=None,
+        description="Tool outputs longer than this are truncated to a preview and a reference handle; None keeps them whole",
+    )
+    summarize_after_tokens: Optional[int] = Field(
+        default=None,
+        description="Estimated history size above which older turns are folded into the summary; None never folds them",
+    )
+    keep_recent_messages: int = Field(
+        default=6, description="Number of latest messages always kept verbatim"
+    )
+    max_summary_chars: int = Field(
+        default=2000, description="Maximum length of the running summary"
+    )
+    summary_mode: HistorySummaryMode = Field(
+        default=HistorySummaryMode.EXTRACTIVE,
+        description="How older turns are folded into the summary",
+    )
+
+
+class HistoryState(BaseModel):
+    """
+    Compaction state of a run's conversation history.
+    """
+
+    summary: Optional[str] = Field(
+        default=None, description="Running summary of the folded turns"
+    )
+    summarized_count: int = Field(
+        default=0, description="Number of leading messages folded into the summary"
+    )
+    observation_count: int = Field(
+        default=0, description="Number of tool observations recorded"
+    )
+    artifacts: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Full tool outputs that were truncated in the history, by handle",
+    )
+    seen_observations: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Handle of the first observation with a given tool and output, by digest",
+    )
+    observation_messages: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Index in the messages of each observation, by handle",
+    )
@@ -1,2 +1,5 @@
 from .react_agent_response import *
-from .react_step_callback import *
\ No newline at end of file
+from .react_step_callback import *
+from .react_run_state import *
+from .react_loop_detection import *
+from .react_speculation import *
\ No newline at end of file
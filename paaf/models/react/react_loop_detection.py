@@ -0,0 +1,57 @@
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ReactLoopLimits(BaseModel):
+    """
+    How a ReAct run reacts when it stops making progress.
+
+    A run is stalled when it repeats a call to a side effect free tool, when such calls
+    keep returning the same observation, or when it cycles between such tools without
+    getting anything new. Calling other tools again, e.g. to poll a job, isn't a stall.
+    The first `max_hints` times this happens a corrective hint is added to the history;
+    after that the run is made to answer.
+    """
+
+    reuse_observations: bool = Field(
+        default=False,
+        description="Answer a repeated call to a side effect free tool from the earlier observation instead of calling the tool again",
+    )
+    max_hints: int = Field(
+        default=1,
+        description="Stalls corrected with a hint before the run is forced to answer",
+    )
+    oscillation_window: int = Field(
+        default=6,
+        description="Number of latest tool calls checked for cycles between tools",
+    )
+
+
+class ReactLoopState(BaseModel):
+    """
+    What a ReAct run has called so far, to detect when it stops making progress.
+    """
+
+    call_counts: Dict[str, int] = Field(
+        default_factory=dict, description="Times each (tool, arguments) pair was called"
+    )
+    cached_observations: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Observation of each successful (tool, arguments) pair that may be reused",
+    )
+    recent_outcomes: List[str] = Field(
+        default_factory=list,
+        description="Tool name and observation digest of the latest calls",
+    )
+    last_observation: Optional[str] = Field(
+        default=None, description="The latest observation"
+    )
+    unchanged_streak: int = Field(
+        default=0,
+        description="Number of latest calls that returned the previous observation again",
+    )
+    stalls: int = Field(default=0, description="Number of stalls detected")
+    force_answer: bool = Field(
+        default=False, description="Whether the run must answer on its next step"
+    )
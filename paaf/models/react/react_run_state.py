@@ -0,0 +1,76 @@
+from enum import StrEnum
+from typing import List, Optional
+import uuid
+
+from pydantic import BaseModel, Field
+
+from paaf.models.agent_response import AgentResponse
+from paaf.models.history import HistoryState
+from paaf.models.react.react_agent_response import ReactAgentResponse
+from paaf.models.react.react_loop_detection import ReactLoopState
+from paaf.models.react.react_step_callback import ReactExecutionSummary
+from paaf.models.shared_models import Message
+
+
+class ReactPhase(StrEnum):
+    """
+    The phase of a ReAct run, i.e. what its next step will do.
+    """
+
+    THINK = "think"
+    """The next step asks the model for the next action."""
+
+    ACT = "act"
+    """The next step executes the chosen tool and observes its result."""
+
+    DONE = "done"
+    """The run has finished."""
+
+
+class ReactSession(BaseModel):
+    """
+    State of a single ReAct run.
+
+    Everything that changes while a query is processed lives here instead of on the
+    agent, so one configured agent can serve many runs at the same time.
+    """
+
+    run_id: str = Field(
+        default_factory=lambda: str(uuid.uuid4()),
+        description="Unique identifier of the run",
+    )
+    query: str = Field(description="The query being processed")
+    messages: List[Message] = Field(
+        default_factory=list, description="Conversation history of the run"
+    )
+    current_iteration: int = Field(
+        default=0, description="Number of times the model has been asked to think"
+    )
+    current_step_number: int = Field(
+        default=0, description="Number of steps reported so far"
+    )
+    phase: ReactPhase = Field(
+        default=ReactPhase.THINK, description="What the next step will do"
+    )
+    pending_response: Optional[ReactAgentResponse] = Field(
+        default=None, description="The tool call decided on, waiting to be executed"
+    )
+    result: Optional[AgentResponse] = Field(
+        default=None, description="The final response once the run is done"
+    )
+    execution_summary: ReactExecutionSummary = Field(
+        description="Summary of the steps executed so far"
+    )
+    history: HistoryState = Field(
+        default_factory=HistoryState,
+        description="Summary and stored tool outputs of the compacted history",
+    )
+    loop: ReactLoopState = Field(
+        default_factory=ReactLoopState,
+        description="Tool calls made so far, to detect when the run stalls",
+    )
+
+    @property
+    def is_done(self) -> bool:
+        """Whether the run has finished."""
+        return self.phase == ReactPhase.DONE
@@ -0,0 +1,47 @@
+from pydantic import BaseModel, Field
+
+
+class ReactSpeculationLimits(BaseModel):
+    """
+    How many tool calls a ReAct run may make speculatively.
+
+    While the model thinks about the next step, the calls it's likely to ask for are
+    started in the background, so a correct guess doesn't wait for the tool at all.
+    Only tools registered as side-effect free are ever called this way.
+    """
+
+    max_predictions: int = Field(
+        default=2, description="Predicted tool calls started per step"
+    )
+    max_workers: int = Field(
+        default=4,
+        description="Threads running predicted calls, shared by every run of the agent",
+    )
+
+
+class SpeculationStats(BaseModel):
+    """
+    How well speculative tool calls paid off.
+    """
+
+    launched: int = Field(default=0, description="Predicted calls started")
+    hits: int = Field(
+        default=0, description="Predicted calls the model then asked for, used as is"
+    )
+    wasted: int = Field(
+        default=0, description="Predicted calls the model didn't ask for"
+    )
+    failed: int = Field(
+        default=0,
+        description="Predicted calls the model asked for that raised, so were made again",
+    )
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of the launched calls that were used."""
+        return self.hits / self.launched if self.launched else 0.0
+
+    @property
+    def waste_rate(self) -> float:
+        """Share of the launched calls whose result was thrown away."""
+        return self.wasted / self.launched if self.launched else 0.0
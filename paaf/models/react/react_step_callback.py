@@ -71,6 +71,11 @@ class ReactStepSummary(BaseModel):
         description="Result returned from the tool"
     )
     
+    duration_ms: Optional[float] = Field(
+        default=None,
+        description="How long the tool call took, in milliseconds"
+    )
+    
     error: Optional[str] = Field(
         default=None,
         description="Error message if step failed"
@@ -0,0 +1,51 @@
+from enum import StrEnum
+from typing import List
+
+from pydantic import BaseModel, Field, field_validator
+
+
+class LateEvidenceMode(StrEnum):
+    """
+    What happens to the evidence that comes in after the solver started.
+    """
+
+    IGNORE = "ignore"
+    """The answer from the evidence in at the quorum is final. Steps still running aren't waited for."""
+
+    REFINE = "refine"
+    """Once the remaining steps finish, one more LLM call updates the answer with their evidence."""
+
+
+class RewooEarlySolveLimits(BaseModel):
+    """
+    When a ReWOO run's solver may start before every step has its evidence.
+
+    Each step starts as soon as the steps it uses are done, and the solver starts, streaming its
+    answer, once the quorum is reached, so one slow tool doesn't hold up the answer.
+    """
+
+    quorum: float = Field(
+        default=0.8,
+        gt=0,
+        le=1,
+        description="Fraction of the steps that must have evidence before the solver starts",
+    )
+    required_steps: List[str] = Field(
+        default_factory=list,
+        description="Step ids whose evidence the solver always waits for",
+    )
+    late_evidence: LateEvidenceMode = Field(
+        default=LateEvidenceMode.IGNORE,
+        description="What happens to the evidence that comes in after the solver started",
+    )
+
+    @field_validator("required_steps", mode="before")
+    @classmethod
+    def normalize_required_steps(cls, v):
+        """Accept step ids written as references, like #E1."""
+        if isinstance(v, list):
+            return [
+                step.strip().lstrip("#") if isinstance(step, str) else step
+                for step in v
+            ]
+        return v
@@ -0,0 +1,24 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class RewooEvidenceLimits(BaseModel):
+    """
+    How the evidence of a ReWOO run is compacted before it's given to the solver.
+
+    The run keeps the full evidence; only the solver prompt sees the compacted text.
+    """
+
+    max_evidence_tokens: Optional[int] = Field(
+        default=1000,
+        description="Estimated size above which a piece of evidence is cut down; None keeps it whole",
+    )
+    deduplicate: bool = Field(
+        default=True,
+        description="Drop sentences of a piece of evidence already given by an earlier step",
+    )
+    relevance_filter: bool = Field(
+        default=False,
+        description="Cut evidence down to the sentences sharing the most words with the query and plan, instead of its opening",
+    )
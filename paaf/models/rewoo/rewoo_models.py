@@ -1,7 +1,8 @@
 from enum import StrEnum
 
 import json
-from typing import Any, Optional, Dict
+import uuid
+from typing import Any, Optional, Dict, List, Tuple
 
 from pydantic import BaseModel, Field, field_validator
 from paaf.models.shared_models import ToolChoice
@@ -26,6 +27,18 @@ class RewooActionType(StrEnum):
 
 
 class RewooPlan(BaseModel):
+    step_id: Optional[str] = Field(
+        default=None,
+        description="Identifier of the step, like E1, used to reference its evidence as #E1.",
+    )
+    """The identifier of the step. Assigned by position (E1, E2, ...) if the planner gives none."""
+
+    depends_on: List[str] = Field(
+        default_factory=list,
+        description="Identifiers of the earlier steps whose evidence this step uses.",
+    )
+    """The steps that must produce their evidence before this one runs."""
+
     reasoning: str = Field(
         ...,
         description="The content of the plan, which is a JSON string containing the plan details.",
@@ -63,6 +76,27 @@ class RewooPlan(BaseModel):
             return v.lower()
         return v
 
+    @field_validator("step_id", mode="before")
+    @classmethod
+    def normalize_step_id(cls, v):
+        """Accept step ids written as references, like #E1."""
+        if isinstance(v, str):
+            return v.strip().lstrip("#")
+        return v
+
+    @field_validator("depends_on", mode="before")
+    @classmethod
+    def normalize_depends_on(cls, v):
+        """Accept a single step id, references like #E1, and null."""
+        if v is None:
+            return []
+        if isinstance(v, str):
+            v = [v]
+        return [
+            step_id.strip().lstrip("#") if isinstance(step_id, str) else step_id
+            for step_id in v
+        ]
+
     @classmethod
     def get_schema_json(cls, indent: int = 2) -> str:
         """
@@ -90,6 +124,8 @@ class RewooPlan(BaseModel):
     def get_example_json_for_action(cls, action_type: RewooActionType) -> dict:
         """Get example JSON structure for a specific action type."""
         base_structure = {
+            "step_id": "E1",
+            "depends_on": [],
             "reasoning": "Explanation of the reasoning behind this plan step",
             "action_type": action_type.value,
             "tool_choice": None,
@@ -253,6 +289,12 @@ class RewooPlan(BaseModel):
                 return cls._generate_model_example(AgentHandoff)
             return None
 
+        elif field_name == "step_id":
+            return "E1"
+
+        elif field_name == "depends_on":
+            return []
+
         # Handle string types
         elif field_type == str:
             return field_info.description or f"Example {field_name}"
@@ -383,3 +425,35 @@ class RewooEvidence(BaseModel):
         description="The details gootten from a tool cool, the evidence",
     )
     
+
+
+class RewooSession(BaseModel):
+    """
+    State of a single ReWOO run.
+
+    Plans and evidence live here instead of on the agent, so one configured agent can
+    serve many runs at the same time.
+    """
+
+    run_id: str = Field(
+        default_factory=lambda: str(uuid.uuid4()),
+        description="Unique identifier of the run",
+    )
+    query: str = Field(..., description="The query being processed")
+    plans: List[RewooPlan] = Field(
+        default_factory=list, description="The plans generated by the planner"
+    )
+    step_evidence: Dict[str, RewooEvidence] = Field(
+        default_factory=dict,
+        description="Evidence of the steps executed so far, by step id",
+    )
+    plan_and_evidence: List[Tuple[RewooPlan, RewooEvidence]] = Field(
+        default_factory=list,
+        description="Each executed plan with the evidence it produced",
+    )
+    replan_count: int = Field(
+        default=0, description="Number of times steps without evidence were replanned"
+    )
+    response: Optional[str] = Field(
+        default=None, description="The solver's response once the run is solved"
+    )
@@ -1,6 +1,53 @@
-from typing import Any, Dict
+import asyncio
+from contextlib import nullcontext
+import importlib
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Type
 import uuid
 
+from pydantic import BaseModel, ValidationError
+
+from paaf.tools.tool_arguments import build_arguments_model, format_validation_error
+from paaf.tools.tool_limits import ToolLimiter
+from paaf.tools.circuit_breaker import CircuitBreaker
+from paaf.tools.tool_stats import ToolStats, result_size
+from paaf.tools.tool_streaming import collect_stream, is_streaming_callable
+from paaf.models.tool_stream import ToolStreamLimits, ToolStreamResult
+
+
+def tool_id_for(name: str) -> str:
+    """
+    The id of the tool with the given name.
+
+    It only depends on the name, so prompts, plans and checkpoints mentioning a tool
+    stay valid in another process that registers the same tools.
+    """
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"paaf:tool:{name}"))
+
+
+class ToolArgumentError(ValueError):
+    """
+    Raised when the arguments passed to a tool don't match its signature.
+    """
+
+    def __init__(self, tool_name: str, details: str):
+        self.tool_name = tool_name
+        self.details = details
+        super().__init__(f"Invalid arguments for tool {tool_name}: {details}")
+
+
+class ToolUnavailableError(RuntimeError):
+    """
+    Raised without calling the tool when its circuit breaker is open.
+    """
+
+    def __init__(self, tool_name: str):
+        self.tool_name = tool_name
+        super().__init__(
+            f"Tool {tool_name} is temporarily unavailable after repeated failures."
+        )
+
 
 class Tool:
     """
@@ -14,6 +61,11 @@ class Tool:
         callable: callable,
         arguments: Dict[str, Any] = None,
         returns: Any = None,
+        argument_model: Optional[Type[BaseModel]] = None,
+        batch_callable: Optional[Callable[[List[Dict[str, Any]]], List[Any]]] = None,
+        limiter: Optional[ToolLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        side_effect_free: bool = False,
     ):
         self.name = name
         self.description = description
@@ -22,7 +74,13 @@ class Tool:
         )  # The arguments of the tool is the name of the argument and the details of the argument
         self.returns = returns  # The return type of the tool, if any
         self.callable = callable  # The callable function that implements the tool
-        self.tool_id = uuid.uuid4().__str__()  # Unique identifier for the tool
+        self.argument_model = argument_model  # Pydantic model used to validate the arguments before calling the tool
+        self.batch_callable = batch_callable  # Optional callable that handles many argument sets in one invocation
+        self.limiter = limiter  # Concurrency and rate limits of the tool
+        self.circuit_breaker = circuit_breaker  # Rejects calls while failing
+        self.side_effect_free = side_effect_free  # Safe to call before it's asked for
+        self.stats = ToolStats(name)  # Call counts and latencies of the tool
+        self.tool_id = tool_id_for(name)  # Identifier of the tool, stable across processes
 
     def __repr__(self):
         return f"Tool(name={self.name}, description={self.description}, arguments={self.arguments}, returns={self.returns})"
@@ -42,5 +100,262 @@ class Tool:
             "tool_id": self.tool_id,
         }
 
+    def validate_arguments(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate and coerce keyword arguments against the tool's argument model.
+
+        Args:
+            arguments: The keyword arguments the tool is about to be called with.
+
+        Returns:
+            Dict[str, Any]: The coerced arguments.
+
+        Raises:
+            ToolArgumentError: If the arguments don't match the tool's signature.
+        """
+        if self.argument_model is None:
+            return arguments
+
+        try:
+            validated = self.argument_model.model_validate(arguments)
+        except ValidationError as e:
+            raise ToolArgumentError(self.name, format_validation_error(e)) from None
+
+        # Only pass through what was provided, so the function's own defaults still apply
+        return {name: getattr(validated, name) for name in arguments}
+
+    @property
+    def supports_batching(self) -> bool:
+        """Whether the tool registered a batch implementation."""
+        return self.batch_callable is not None
+
+    def call_batch(
+        self, arguments_list: List[Dict[str, Any]], validate: bool = True
+    ) -> List[Any]:
+        """
+        Call the tool once for many argument sets.
+
+        Uses the batch implementation when one is registered, otherwise falls back
+        to calling the tool once per argument set.
+
+        Args:
+            arguments_list: The keyword arguments for each call.
+            validate: Whether to validate the arguments. False when they already went
+                through `validate_arguments`.
+
+        Returns:
+            List[Any]: One result per argument set, in the same order.
+        """
+        validated = (
+            [self.validate_arguments(arguments) for arguments in arguments_list]
+            if validate
+            else arguments_list
+        )
+
+        if not self.supports_batching:
+            return [
+                self._execute(self.callable, **arguments) for arguments in validated
+            ]
+
+        # A batch is a single request to the backend, so it's a single guarded call
+        results = list(self._execute(self.batch_callable, validated))
+        if len(results) != len(validated):
+            raise ValueError(
+                f"Batch implementation of tool {self.name} returned {len(results)} result(s) for {len(validated)} call(s)."
+            )
+
+        return results
+
+    @property
+    def is_streaming(self) -> bool:
+        """Whether the tool is a generator (or async generator) producing partial results."""
+        return is_streaming_callable(self.callable)
+
+    def collect(
+        self, arguments: Dict[str, Any], limits: ToolStreamLimits
+    ) -> ToolStreamResult:
+        """
+        Call a generator tool and consume its output up to the given limits.
+
+        Consumption happens inside the guarded call, so the tool's limiter slot, circuit
+        breaker and latency cover the whole time spent pulling items.
+
+        Args:
+            arguments: The keyword arguments for the call.
+            limits: Caps on the number of items, characters or tokens to consume.
+
+        Returns:
+            ToolStreamResult: The consumed prefix of the tool's output.
+        """
+        arguments = self.validate_arguments(arguments)
+
+        return self._execute(lambda: collect_stream(self.callable(**arguments), limits))
+
+    async def acollect(
+        self, arguments: Dict[str, Any], limits: ToolStreamLimits
+    ) -> ToolStreamResult:
+        """
+        Async version of `collect`, for callers inside a running event loop.
+
+        The tool is consumed on a worker thread, so the loop isn't blocked meanwhile.
+
+        Args:
+            arguments: The keyword arguments for the call.
+            limits: Caps on the number of items, characters or tokens to consume.
+
+        Returns:
+            ToolStreamResult: The consumed prefix of the tool's output.
+        """
+        return await asyncio.to_thread(self.collect, arguments, limits)
+
+    @property
+    def is_available(self) -> bool:
+        """Whether the tool can currently be called (its circuit isn't open)."""
+        return self.circuit_breaker is None or self.circuit_breaker.is_available()
+
+    def _limit(self):
+        """Context manager holding a slot of the tool's limiter, if any."""
+        if self.limiter is None:
+            return nullcontext()
+        return self.limiter.limit()
+
+    def _execute(self, func: Callable, *args, **kwargs):
+        """
+        Run `func` behind the tool's circuit breaker and limiter, recording its stats.
+
+        Raises:
+            ToolUnavailableError: If the circuit is open, without calling `func`.
+        """
+        breaker = self.circuit_breaker
+        if breaker is not None and not breaker.allow_request():
+            raise ToolUnavailableError(self.name)
+
+        try:
+            with self._limit():
+                start = time.perf_counter()
+                try:
+                    result = func(*args, **kwargs)
+                except Exception:
+                    self.stats.record((time.perf_counter() - start) * 1000, error=True)
+                    raise
+
+                self.stats.record(
+                    (time.perf_counter() - start) * 1000, size=result_size(result)
+                )
+        except Exception:
+            if breaker is not None:
+                breaker.record_failure()
+            raise
+
+        if breaker is not None:
+            breaker.record_success()
+
+        return result
+
     def __call__(self, *args, **kwargs):
-        return self.callable(*args, **kwargs)
+        if not args:
+            kwargs = self.validate_arguments(kwargs)
+
+        return self._execute(self.callable, *args, **kwargs)
+
+
+class LazyTool(Tool):
+    """
+    Tool whose implementation is only imported on first use.
+
+    The name, description and arguments are known up front (usually from a cached
+    schema), so the tool can be listed in prompts without importing its module.
+
+    Args:
+        import_path: Where the implementation lives, as `package.module:function`.
+        batch_import_path: Where the batch implementation lives, if the tool has one.
+    """
+
+    def __init__(
+        self, import_path: str, batch_import_path: Optional[str] = None, **kwargs
+    ):
+        self.import_path = import_path
+        self.batch_import_path = batch_import_path
+        self._load_lock = threading.Lock()
+        self._callable = None
+        self._batch_callable = None
+        self._argument_model = None
+        super().__init__(callable=None, **kwargs)
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the implementation has been imported yet."""
+        return self._callable is not None
+
+    @property
+    def callable(self):
+        if self._callable is None:
+            self._load()
+        return self._callable
+
+    @callable.setter
+    def callable(self, value):
+        self._callable = value
+
+    @property
+    def batch_callable(self):
+        if self._batch_callable is None and self.batch_import_path is not None:
+            with self._load_lock:
+                if self._batch_callable is None:
+                    func = import_from_path(self.batch_import_path)
+                    if not callable(func):
+                        raise ValueError(f"{self.batch_import_path} is not callable.")
+                    self._batch_callable = func
+        return self._batch_callable
+
+    @batch_callable.setter
+    def batch_callable(self, value):
+        self._batch_callable = value
+
+    @property
+    def supports_batching(self) -> bool:
+        """Whether the tool has a batch implementation, without importing it."""
+        return self._batch_callable is not None or self.batch_import_path is not None
+
+    @property
+    def argument_model(self) -> Optional[Type[BaseModel]]:
+        if self._callable is None:
+            self._load()
+        return self._argument_model
+
+    @argument_model.setter
+    def argument_model(self, value):
+        self._argument_model = value
+
+    def _load(self):
+        """Import the implementation and compile its argument model."""
+        with self._load_lock:
+            if self._callable is not None:
+                return
+
+            func = import_from_path(self.import_path)
+            if not callable(func):
+                raise ValueError(f"{self.import_path} is not callable.")
+
+            if self._argument_model is None:
+                self._argument_model = build_arguments_model(func, self.name)
+            self._callable = func
+
+
+def import_from_path(import_path: str) -> Any:
+    """
+    Import an object from a `package.module:attribute` (or `package.module.attribute`) path.
+    """
+    if ":" in import_path:
+        module_path, attribute_path = import_path.split(":", 1)
+    else:
+        module_path, _, attribute_path = import_path.rpartition(".")
+
+    if not module_path or not attribute_path:
+        raise ValueError(f"Invalid import path: {import_path}")
+
+    obj = importlib.import_module(module_path)
+    for attribute in attribute_path.split("."):
+        obj = getattr(obj, attribute)
+
+    return obj
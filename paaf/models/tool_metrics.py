@@ -0,0 +1,125 @@
+from enum import StrEnum
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class ToolQueueMetrics(BaseModel):
+    """
+    Snapshot of the concurrency and rate limiting state of a tool.
+    """
+
+    tool_name: str = Field(description="Name of the tool")
+    max_concurrency: Optional[int] = Field(
+        default=None, description="Maximum number of concurrent calls, if limited"
+    )
+    rate_limit: Optional[float] = Field(
+        default=None, description="Maximum number of calls per second, if limited"
+    )
+    in_flight: int = Field(default=0, description="Calls currently executing")
+    queued: int = Field(default=0, description="Calls currently waiting for a slot")
+    total_calls: int = Field(default=0, description="Calls that acquired a slot")
+    total_wait_time: float = Field(
+        default=0.0, description="Total seconds calls spent waiting for a slot"
+    )
+    max_wait_time: float = Field(
+        default=0.0, description="Longest time in seconds a call waited for a slot"
+    )
+
+    @property
+    def average_wait_time(self) -> float:
+        """Average time in seconds a call waited for a slot."""
+        if not self.total_calls:
+            return 0.0
+        return self.total_wait_time / self.total_calls
+
+
+class CircuitState(StrEnum):
+    """
+    The state of a tool's circuit breaker.
+    """
+
+    CLOSED = "closed"
+    """The tool is healthy and calls go through."""
+
+    OPEN = "open"
+    """The tool is failing and calls are rejected immediately."""
+
+    HALF_OPEN = "half_open"
+    """The recovery timeout elapsed and a probe call is allowed through."""
+
+
+class ToolCircuitMetrics(BaseModel):
+    """
+    Snapshot of the circuit breaker of a tool.
+    """
+
+    tool_name: str = Field(description="Name of the tool")
+    state: CircuitState = Field(description="Current state of the circuit")
+    consecutive_failures: int = Field(
+        default=0, description="Failures since the last successful call"
+    )
+    failure_threshold: int = Field(
+        description="Consecutive failures that open the circuit"
+    )
+    recovery_timeout: float = Field(
+        description="Seconds the circuit stays open before a probe is allowed"
+    )
+    rejected_calls: int = Field(
+        default=0, description="Calls rejected because the circuit was open"
+    )
+    times_opened: int = Field(
+        default=0, description="Number of times the circuit opened"
+    )
+
+
+class ToolInvocationStats(BaseModel):
+    """
+    Snapshot of the invocation statistics of a tool.
+    """
+
+    tool_name: str = Field(description="Name of the tool")
+    call_count: int = Field(default=0, description="Number of calls that ran")
+    error_count: int = Field(default=0, description="Number of calls that raised")
+    total_latency_ms: float = Field(
+        default=0.0, description="Total time spent executing the tool"
+    )
+    min_latency_ms: Optional[float] = Field(
+        default=None, description="Fastest call in milliseconds"
+    )
+    max_latency_ms: Optional[float] = Field(
+        default=None, description="Slowest call in milliseconds"
+    )
+    p50_latency_ms: Optional[float] = Field(
+        default=None, description="Median call latency in milliseconds"
+    )
+    p95_latency_ms: Optional[float] = Field(
+        default=None, description="95th percentile call latency in milliseconds"
+    )
+    p99_latency_ms: Optional[float] = Field(
+        default=None, description="99th percentile call latency in milliseconds"
+    )
+    total_result_size: int = Field(
+        default=0, description="Total size of the results, in characters"
+    )
+
+    @property
+    def average_latency_ms(self) -> float:
+        """Average call latency in milliseconds."""
+        if not self.call_count:
+            return 0.0
+        return self.total_latency_ms / self.call_count
+
+    @property
+    def average_result_size(self) -> float:
+        """Average size of a successful result, in characters."""
+        successes = self.call_count - self.error_count
+        if successes <= 0:
+            return 0.0
+        return self.total_result_size / successes
+
+    @property
+    def error_rate(self) -> float:
+        """Fraction of calls that raised."""
+        if not self.call_count:
+            return 0.0
+        return self.error_count / self.call_count
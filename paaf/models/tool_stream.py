@@ -0,0 +1,47 @@
+from typing import Any, List, Optional
+from pydantic import BaseModel, Field
+
+
+class ToolStreamLimits(BaseModel):
+    """
+    Caps on how much of a generator tool's output an agent consumes.
+
+    Consumption stops as soon as any cap is reached and the tool's generator is closed,
+    so the tool doesn't keep fetching pages nobody will read.
+    """
+
+    max_items: Optional[int] = Field(
+        default=20, description="Maximum number of items to consume"
+    )
+    max_chars: Optional[int] = Field(
+        default=8000,
+        description="Maximum number of characters of the consumed items combined",
+    )
+    max_tokens: Optional[int] = Field(
+        default=None,
+        description="Maximum estimated number of tokens of the consumed items combined",
+    )
+
+
+class ToolStreamResult(BaseModel):
+    """
+    The consumed prefix of a generator tool's output.
+    """
+
+    items: List[Any] = Field(
+        default_factory=list, description="The items consumed from the tool"
+    )
+    truncated: bool = Field(
+        default=False,
+        description="Whether consumption stopped before the tool was exhausted",
+    )
+    stop_reason: Optional[str] = Field(
+        default=None, description="Which cap stopped consumption, if any"
+    )
+
+    def to_observation(self) -> str:
+        """Format the result as an observation for the agent's history."""
+        observation = str(self.items)
+        if self.truncated:
+            observation += f" (output truncated: {self.stop_reason})"
+        return observation
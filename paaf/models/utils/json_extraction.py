@@ -0,0 +1,243 @@
+from functools import lru_cache
+import json
+from typing import Any, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+
+# How many opening brackets are tried before giving up on a text
+MAX_CANDIDATES = 8
+
+_CLOSERS = {"{": "}", "[": "]"}
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_FAILED = object()
+
+
+class JSONExtractionError(ValueError):
+    """
+    Raised when no valid JSON value can be recovered from an LLM response.
+    """
+
+    def __init__(self, details: str, text: str):
+        self.details = details
+        self.text = text
+        super().__init__(details)
+
+
+def strip_code_fence(text: str) -> str:
+    """Remove the Markdown code fence (and `json` language tag) around a response."""
+    clean = text.strip().strip("`").strip()
+    if clean.startswith("json"):
+        clean = clean[4:].strip()
+    return clean
+
+
+def extract_json(text: str) -> Any:
+    """
+    Get the JSON value an LLM response contains.
+
+    The response is parsed as is first. If that fails, the first balanced JSON object
+    or array in it is used, which skips prose around it, and common defects are
+    repaired: trailing commas, Python literals (True, False, None) and output cut off
+    before its closing quotes and brackets.
+
+    Args:
+        text: The LLM response.
+
+    Returns:
+        Any: The parsed value.
+
+    Raises:
+        JSONExtractionError: If no JSON value can be recovered.
+    """
+    if not isinstance(text, str):
+        raise JSONExtractionError(f"Expected text, got {type(text).__name__}", text)
+
+    clean = strip_code_fence(text)
+    try:
+        return json.loads(clean)
+    except json.JSONDecodeError as e:
+        error = e
+
+    position = 0
+    for _ in range(MAX_CANDIDATES):
+        start = _find_opening(clean, position)
+        if start is None:
+            break
+
+        value = _parse_candidate(clean, start)
+        if value is not _FAILED:
+            return value
+        position = start + 1
+
+    raise JSONExtractionError(f"No valid JSON found in the response: {error}", text)
+
+
+def parse_json_as(text: str, target: Any) -> Any:
+    """
+    Extract the JSON value of an LLM response and validate it.
+
+    Args:
+        text: The LLM response.
+        target: The type to validate against, e.g. a pydantic model or `List[Model]`.
+
+    Returns:
+        Any: The validated value.
+
+    Raises:
+        JSONExtractionError: If no JSON value can be recovered.
+        pydantic.ValidationError: If the value doesn't match `target`.
+    """
+    return _type_adapter(target).validate_python(extract_json(text))
+
+
+@lru_cache(maxsize=128)
+def _type_adapter(target: Any) -> TypeAdapter:
+    return TypeAdapter(target)
+
+
+def _find_opening(text: str, position: int) -> Optional[int]:
+    """Index of the first `{` or `[` at or after `position`."""
+    starts = [
+        index
+        for index in (text.find("{", position), text.find("[", position))
+        if index != -1
+    ]
+    return min(starts) if starts else None
+
+
+def _parse_candidate(text: str, start: int) -> Any:
+    """Parse the JSON value starting at `start`, repairing it if needed."""
+    end = _balanced_end(text, start)
+    fragment = text[start:end] if end is not None else text[start:]
+
+    if end is not None:
+        try:
+            return json.loads(fragment)
+        except json.JSONDecodeError:
+            pass
+
+    repaired, stack, in_string, commas = _normalize(fragment)
+    attempts = [(repaired, stack, in_string)]
+    if end is None:
+        # Cut off output: also try dropping the last, possibly incomplete, members
+        for cut in reversed(commas[-2:]):
+            prefix, prefix_stack, prefix_in_string, _ = _normalize(repaired[:cut])
+            attempts.append((prefix, prefix_stack, prefix_in_string))
+
+    for candidate, open_brackets, open_string in attempts:
+        try:
+            return json.loads(_close(candidate, open_brackets, open_string))
+        except json.JSONDecodeError:
+            continue
+
+    return _FAILED
+
+
+def _balanced_end(text: str, start: int) -> Optional[int]:
+    """End index of the value opened at `start`, or None if it's never closed."""
+    stack = []
+    in_string = False
+    escaped = False
+
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in _CLOSERS:
+            stack.append(_CLOSERS[char])
+        elif char in "}]":
+            if not stack or stack.pop() != char:
+                return index + 1
+            if not stack:
+                return index + 1
+
+    return None
+
+
+def _normalize(fragment: str) -> Tuple[str, List[str], bool, List[int]]:
+    """
+    Fix what can be fixed in place in a JSON fragment.
+
+    Returns:
+        The fixed text, the closing brackets still expected, whether it ends inside a
+        string, and the positions of its commas outside strings.
+    """
+    out: List[str] = []
+    stack: List[str] = []
+    commas: List[int] = []
+    in_string = False
+    escaped = False
+    index = 0
+    written = 0
+    length = len(fragment)
+
+    while index < length:
+        char = fragment[index]
+
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            out.append(char)
+            written += 1
+            index += 1
+            continue
+
+        if char == '"':
+            in_string = True
+        elif char in _CLOSERS:
+            stack.append(_CLOSERS[char])
+        elif char in "}]":
+            if stack:
+                stack.pop()
+        elif char == ",":
+            following = index + 1
+            while following < length and fragment[following].isspace():
+                following += 1
+            if following < length and fragment[following] in "}]":
+                # Trailing comma
+                index += 1
+                continue
+            commas.append(written)
+        elif char.isalpha():
+            word_end = index
+            while word_end < length and fragment[word_end].isalnum():
+                word_end += 1
+            word = fragment[index:word_end]
+            word = _PYTHON_LITERALS.get(word, word)
+            out.append(word)
+            written += len(word)
+            index = word_end
+            continue
+
+        out.append(char)
+        written += 1
+        index += 1
+
+    return "".join(out), stack, in_string, commas
+
+
+def _close(fragment: str, stack: List[str], in_string: bool) -> str:
+    """Terminate a cut off fragment: close its string, then its open brackets."""
+    if in_string:
+        if fragment.endswith("\\"):
+            fragment = fragment[:-1]
+        fragment += '"'
+
+    fragment = fragment.rstrip()
+    if fragment.endswith(","):
+        fragment = fragment[:-1]
+    elif fragment.endswith(":"):
+        fragment += " null"
+
+    return fragment + "".join(reversed(stack))
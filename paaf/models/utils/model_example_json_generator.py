@@ -1,20 +1,56 @@
+import copy
 import random
 import string
+import threading
 from typing import Any, Dict, Type
+import weakref
 
 from pydantic import BaseModel
 
+# Examples already generated, per model class and seed. The core schema the example
+# was built from is kept alongside it, so a rebuilt model gets a fresh example.
+_example_cache: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_example_cache_lock = threading.Lock()
 
-def generate_example_json(model_class: Type[BaseModel]) -> Dict[str, Any]:
+
+def generate_example_json(
+    model_class: Type[BaseModel], seed: int = 0
+) -> Dict[str, Any]:
     """
     Automatically generates an example JSON-compatible dictionary for a given Pydantic model,
     handling nested models and various field types.
 
+    The example is deterministic: the same model and seed always give the same values,
+    so prompts built from it stay byte-identical between calls. It's only generated
+    once per model class and seed, and again if the model's schema is rebuilt.
+
     Args:
         model_class: The Pydantic model class.
+        seed: Seed of the generator picking the example values.
 
     Returns:
-        A dictionary representing an example of the model.
+        A dictionary representing an example of the model. It's a copy, so callers
+        are free to modify it.
+    """
+    core_schema = model_class.__dict__.get("__pydantic_core_schema__")
+
+    with _example_cache_lock:
+        cached = _example_cache.get(model_class, {}).get(seed)
+
+    if cached is None or cached[0] is not core_schema:
+        example = _build_example_json(model_class, random.Random(seed))
+        cached = (core_schema, example)
+        with _example_cache_lock:
+            _example_cache.setdefault(model_class, {})[seed] = cached
+
+    return copy.deepcopy(cached[1])
+
+
+def _build_example_json(
+    model_class: Type[BaseModel], rng: random.Random
+) -> Dict[str, Any]:
+    """
+    Walk the JSON schema of a model and build an example, drawing values from `rng`.
     """
     schema = model_class.model_json_schema()
     schema_definitions = schema.get("$defs", schema.get("definitions", {}))
@@ -135,7 +171,7 @@ def generate_example_json(model_class: Type[BaseModel]) -> Dict[str, Any]:
             # If it IS an empty array/object default that we want to populate, fall through.
 
         if enum_values:
-            return random.choice(enum_values)
+            return rng.choice(enum_values)
 
         if field_type == "string":
             fmt = actual_field_info.get("format")
@@ -149,25 +185,25 @@ def generate_example_json(model_class: Type[BaseModel]) -> Dict[str, Any]:
                 return "a1b2c3d4-e5f6-7890-1234-567890abcdef"
 
             if "role" in field_name:
-                return random.choice(["user", "assistant", "system", "function"])
+                return rng.choice(["user", "assistant", "system", "function"])
             if "name" in field_name.lower():
-                return random.choice(["Sample Name", "Test Project", "User Profile"])
+                return rng.choice(["Sample Name", "Test Project", "User Profile"])
             if "email" in field_name:
                 return "test.user.contact@example.com"
             if "id" in field_name.lower() or "identifier" in field_name.lower():
                 return "".join(
-                    random.choices(string.ascii_lowercase + string.digits, k=10)
+                    rng.choices(string.ascii_lowercase + string.digits, k=10)
                 )
             if "location" in field_name:
-                return random.choice(["New York", "London", "Paris", "Tokyo", "Lagos"])
+                return rng.choice(["New York", "London", "Paris", "Tokyo", "Lagos"])
             if "street" in field_name:
-                return f"{random.randint(1,1000)} Example St"
+                return f"{rng.randint(1,1000)} Example St"
             if "city" in field_name:
-                return random.choice(["Metropolis", "Gotham", "Star City"])
+                return rng.choice(["Metropolis", "Gotham", "Star City"])
             if "zip_code" in field_name:
-                return "".join(random.choices(string.digits, k=5))
+                return "".join(rng.choices(string.digits, k=5))
             if "country" in field_name:
-                return random.choice(["USA", "Canada", "UK", "Nigeria"])
+                return rng.choice(["USA", "Canada", "UK", "Nigeria"])
             if (
                 "content" in field_name
                 or "description" in field_name
@@ -175,7 +211,7 @@ def generate_example_json(model_class: Type[BaseModel]) -> Dict[str, Any]:
                 or "details" in field_name
             ):
                 return f"This is some sample text for '{field_name}'."
-            return "example_str_" + "".join(random.choices(string.ascii_lowercase, k=3))
+            return "example_str_" + "".join(rng.choices(string.ascii_lowercase, k=3))
 
         elif field_type == "integer":
             low = actual_field_info.get(
@@ -194,7 +230,7 @@ def generate_example_json(model_class: Type[BaseModel]) -> Dict[str, Any]:
                 high = 100
             if low > high:
                 low = high
-            return random.randint(low, high)
+            return rng.randint(low, high)
 
         elif field_type == "number":
             low = actual_field_info.get(
@@ -221,10 +257,10 @@ def generate_example_json(model_class: Type[BaseModel]) -> Dict[str, Any]:
                 high = 100.0
             if low > high:
                 low = high
-            return round(random.uniform(low, high), 2)
+            return round(rng.uniform(low, high), 2)
 
         elif field_type == "boolean":
-            return random.choice([True, False])
+            return rng.choice([True, False])
 
         elif field_type == "array":
             items_schema = actual_field_info.get("items", {})
@@ -249,7 +285,7 @@ def generate_example_json(model_class: Type[BaseModel]) -> Dict[str, Any]:
             if eff_min > eff_max:
                 eff_min = eff_max
 
-            num_items_to_generate = random.randint(eff_min, eff_max)
+            num_items_to_generate = rng.randint(eff_min, eff_max)
 
             if num_items_to_generate == 0:
                 return []
@@ -293,8 +329,8 @@ def generate_example_json(model_class: Type[BaseModel]) -> Dict[str, Any]:
             # Fallback for generic object, or if additionalProperties is true/missing
             return {
                 "generic_key_1": "some_value",
-                "generic_count": random.randint(1, 10),
-                "is_generic_flag": random.choice([True, False]),
+                "generic_count": rng.randint(1, 10),
+                "is_generic_flag": rng.choice([True, False]),
             }
 
         elif field_type == "null":
@@ -0,0 +1,114 @@
+import string
+from typing import Any, Dict, List, Set, Tuple, Union
+
+_formatter = string.Formatter()
+
+# (root name, full field name, conversion, format spec) of a replacement field
+_Field = Tuple[str, str, Any, str]
+_Segment = Union[str, _Field]
+
+
+def _merge_literals(segments: List[_Segment]) -> List[_Segment]:
+    """Join adjacent literal segments, so rendering has fewer pieces to concatenate."""
+    merged: List[_Segment] = []
+    for segment in segments:
+        if isinstance(segment, str) and merged and isinstance(merged[-1], str):
+            merged[-1] += segment
+        elif segment != "":
+            merged.append(segment)
+    return merged
+
+
+def _format_field(field: _Field, values: Dict[str, Any]) -> str:
+    """Render a single replacement field the same way `str.format` does."""
+    _, field_name, conversion, format_spec = field
+    value, _ = _formatter.get_field(field_name, (), values)
+    value = _formatter.convert_field(value, conversion)
+    if format_spec and "{" in format_spec:
+        format_spec = _formatter.vformat(format_spec, (), values)
+    return _formatter.format_field(value, format_spec)
+
+
+class CompiledTemplate:
+    """
+    A `str.format` style prompt template, parsed once.
+
+    Fields that stay the same across many prompts (system prompt, tool list, output
+    structures) can be filled in ahead of time with `partial`, which returns a new
+    template where they are already plain text. Rendering then only formats the fields
+    that are left and joins the pieces, instead of re-parsing the whole template.
+
+    Args:
+        template: The template text, with named `{field}` placeholders.
+    """
+
+    def __init__(self, template: str):
+        self.template = template
+        self._segments = self._parse(template)
+
+    @staticmethod
+    def _parse(template: str) -> List[_Segment]:
+        segments: List[_Segment] = []
+        for literal, field_name, format_spec, conversion in _formatter.parse(template):
+            segments.append(literal)
+            if field_name is None:
+                continue
+
+            if field_name == "" or field_name[0].isdigit():
+                raise ValueError(
+                    "Prompt templates only support named fields, not positional ones."
+                )
+
+            root = field_name.split(".", 1)[0].split("[", 1)[0]
+            segments.append((root, field_name, conversion, format_spec))
+
+        return _merge_literals(segments)
+
+    @property
+    def fields(self) -> Set[str]:
+        """The names of the fields still to be filled in."""
+        return {
+            segment[0] for segment in self._segments if not isinstance(segment, str)
+        }
+
+    def partial(self, **values) -> "CompiledTemplate":
+        """
+        Fill in some of the fields, keeping the others as placeholders.
+
+        Args:
+            **values: Values of the fields to render now.
+
+        Returns:
+            CompiledTemplate: A new template with the given fields rendered into its text.
+        """
+        segments = [
+            (
+                _format_field(segment, values)
+                if not isinstance(segment, str) and segment[0] in values
+                else segment
+            )
+            for segment in self._segments
+        ]
+
+        compiled = CompiledTemplate.__new__(CompiledTemplate)
+        compiled.template = self.template
+        compiled._segments = _merge_literals(segments)
+        return compiled
+
+    def render(self, **values) -> str:
+        """
+        Render the template with the remaining fields.
+
+        Args:
+            **values: Values of the remaining fields. Extra values are ignored.
+
+        Returns:
+            str: The rendered prompt.
+
+        Raises:
+            KeyError: If a remaining field has no value.
+        """
+        return "".join(
+            segment if isinstance(segment, str) else _format_field(segment, values)
+            for segment in self._segments
+        )
@@ -0,0 +1,21 @@
+import math
+from typing import Any
+
+# Rough average for English text with the tokenizers used by current LLMs
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(content: Any) -> int:
+    """
+    Estimate the number of tokens in some content without a tokenizer.
+
+    Args:
+        content: The content, converted to a string if it isn't one.
+
+    Returns:
+        int: The estimated number of tokens.
+    """
+    if content is None:
+        return 0
+    text = content if isinstance(content, str) else str(content)
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
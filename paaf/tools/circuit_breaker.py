@@ -0,0 +1,127 @@
+import threading
+import time
+
+from paaf.models.tool_metrics import CircuitState, ToolCircuitMetrics
+
+
+class CircuitBreaker:
+    """
+    Per-tool circuit breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls are
+    rejected without touching the tool. Once `recovery_timeout` seconds have passed,
+    up to `half_open_max_calls` probe calls are let through: a successful probe closes
+    the circuit again, a failed one re-opens it.
+
+    Args:
+        tool_name: Name of the tool being protected.
+        failure_threshold: Consecutive failures that open the circuit.
+        recovery_timeout: Seconds to wait before probing an open circuit.
+        half_open_max_calls: Probe calls allowed at once while half-open.
+    """
+
+    def __init__(
+        self,
+        tool_name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1.")
+
+        self.tool_name = tool_name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._rejected_calls = 0
+        self._times_opened = 0
+
+    def _recovery_due(self) -> bool:
+        return time.monotonic() - self._opened_at >= self.recovery_timeout
+
+    @property
+    def state(self) -> CircuitState:
+        """The current state of the circuit."""
+        with self._lock:
+            if self._state == CircuitState.OPEN and self._recovery_due():
+                return CircuitState.HALF_OPEN
+            return self._state
+
+    def is_available(self) -> bool:
+        """Whether a call could currently go through (the circuit isn't open)."""
+        return self.state != CircuitState.OPEN
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may go through, reserving a probe slot when half-open.
+
+        Returns:
+            bool: True if the call may proceed, False if it should be rejected.
+        """
+        with self._lock:
+            if self._state == CircuitState.OPEN and self._recovery_due():
+                self._state = CircuitState.HALF_OPEN
+                self._half_open_calls = 0
+
+            if self._state == CircuitState.CLOSED:
+                return True
+
+            if (
+                self._state == CircuitState.HALF_OPEN
+                and self._half_open_calls < self.half_open_max_calls
+            ):
+                self._half_open_calls += 1
+                return True
+
+            self._rejected_calls += 1
+            return False
+
+    def record_success(self):
+        """Record a successful call, closing the circuit if it was probing."""
+        with self._lock:
+            self._consecutive_failures = 0
+            self._half_open_calls = 0
+            self._state = CircuitState.CLOSED
+
+    def record_failure(self):
+        """Record a failed call, opening the circuit once the threshold is reached."""
+        with self._lock:
+            self._consecutive_failures += 1
+
+            if (
+                self._state == CircuitState.HALF_OPEN
+                or self._consecutive_failures >= self.failure_threshold
+            ):
+                if self._state != CircuitState.OPEN:
+                    self._times_opened += 1
+                self._state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
+                self._half_open_calls = 0
+
+    def reset(self):
+        """Close the circuit and forget previous failures."""
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._consecutive_failures = 0
+            self._half_open_calls = 0
+
+    def metrics(self) -> ToolCircuitMetrics:
+        """Get a snapshot of the circuit breaker."""
+        state = self.state
+        with self._lock:
+            return ToolCircuitMetrics(
+                tool_name=self.tool_name,
+                state=state,
+                consecutive_failures=self._consecutive_failures,
+                failure_threshold=self.failure_threshold,
+                recovery_timeout=self.recovery_timeout,
+                rejected_calls=self._rejected_calls,
+                times_opened=self._times_opened,
+            )
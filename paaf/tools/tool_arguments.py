@@ -0,0 +1,85 @@
+import inspect
+from typing import Any, Callable, Dict, Optional, Type
+
+from pydantic import BaseModel, ConfigDict, ValidationError, create_model
+
+from paaf.config.logging import get_logger
+
+
+logger = get_logger(__name__)
+
+
+def build_arguments_model(
+    func: Callable, tool_name: str
+) -> Optional[Type[BaseModel]]:
+    """
+    Build a pydantic model describing the parameters of a tool function.
+
+    The model is compiled once at registration, so every call afterwards only pays
+    for pydantic's (fast) validation instead of failing deep inside the tool.
+
+    Args:
+        func: The function implementing the tool.
+        tool_name: The name of the tool, used to name the generated model.
+
+    Returns:
+        The generated model, or None if the signature can't be expressed as one
+        (e.g. it takes *args/**kwargs or private parameter names).
+    """
+    try:
+        signature = inspect.signature(func)
+    except (TypeError, ValueError):
+        return None
+
+    fields: Dict[str, Any] = {}
+    for param in signature.parameters.values():
+        if param.kind in (
+            inspect.Parameter.VAR_POSITIONAL,
+            inspect.Parameter.VAR_KEYWORD,
+            inspect.Parameter.POSITIONAL_ONLY,
+        ):
+            return None
+
+        if param.name.startswith("_"):
+            return None
+
+        annotation = (
+            Any if param.annotation is inspect.Parameter.empty else param.annotation
+        )
+        default = ... if param.default is inspect.Parameter.empty else param.default
+        fields[param.name] = (annotation, default)
+
+    try:
+        return create_model(
+            f"{tool_name}_arguments",
+            __config__=ConfigDict(
+                extra="forbid",
+                arbitrary_types_allowed=True,
+                protected_namespaces=(),
+            ),
+            **fields,
+        )
+    except Exception as e:
+        logger.debug(f"Could not build an argument model for tool {tool_name}: {e}")
+        return None
+
+
+def format_validation_error(error: ValidationError) -> str:
+    """
+    Format a pydantic validation error as a short, LLM friendly message.
+
+    Args:
+        error: The validation error raised while validating tool arguments.
+
+    Returns:
+        str: One `argument: problem` entry per error, separated by semicolons.
+    """
+    problems = []
+    for item in error.errors():
+        location = ".".join(str(part) for part in item.get("loc", ())) or "arguments"
+        if item.get("type") == "extra_forbidden":
+            problems.append(f"{location}: unexpected argument")
+        else:
+            problems.append(f"{location}: {item.get('msg', 'invalid value')}")
+
+    return "; ".join(problems)
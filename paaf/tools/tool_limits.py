@@ -0,0 +1,146 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from paaf.models.tool_metrics import ToolQueueMetrics
+
+
+class TokenBucket:
+    """
+    Thread safe token bucket used to cap the call rate of a tool.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0.")
+
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        if self.capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._last_refill) * self.rate
+        )
+        self._last_refill = now
+
+    def acquire(self):
+        """
+        Take a token from the bucket, blocking until one is available.
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait_time = (1 - self._tokens) / self.rate
+
+            time.sleep(wait_time)
+
+
+class ToolLimiter:
+    """
+    Enforces the concurrency and rate limits of a single tool and tracks its queue.
+
+    Args:
+        tool_name: Name of the tool being limited.
+        max_concurrency: Maximum number of calls allowed to run at the same time.
+        rate_limit: Maximum number of calls started per second.
+        burst: Number of calls that may start back to back before the rate limit applies.
+    """
+
+    def __init__(
+        self,
+        tool_name: str,
+        max_concurrency: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        burst: Optional[int] = None,
+    ):
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        if burst is not None and rate_limit is None:
+            raise ValueError("burst only applies together with a rate_limit.")
+
+        self.tool_name = tool_name
+        self.max_concurrency = max_concurrency
+        self.rate_limit = rate_limit
+
+        self._semaphore = (
+            threading.BoundedSemaphore(max_concurrency)
+            if max_concurrency is not None
+            else None
+        )
+        self._bucket = (
+            TokenBucket(rate=rate_limit, capacity=burst)
+            if rate_limit is not None
+            else None
+        )
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._queued = 0
+        self._total_calls = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+
+    @contextmanager
+    def limit(self):
+        """
+        Hold a slot for the duration of a tool call, waiting for one if needed.
+        """
+        with self._lock:
+            self._queued += 1
+
+        start = time.monotonic()
+        acquired = False
+        try:
+            if self._semaphore is not None:
+                self._semaphore.acquire()
+                acquired = True
+            if self._bucket is not None:
+                self._bucket.acquire()
+        except BaseException:
+            if acquired:
+                self._semaphore.release()
+            with self._lock:
+                self._queued -= 1
+            raise
+
+        wait_time = time.monotonic() - start
+        with self._lock:
+            self._queued -= 1
+            self._in_flight += 1
+            self._total_calls += 1
+            self._total_wait_time += wait_time
+            self._max_wait_time = max(self._max_wait_time, wait_time)
+
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    def metrics(self) -> ToolQueueMetrics:
+        """Get a snapshot of the queueing metrics for the tool."""
+        with self._lock:
+            return ToolQueueMetrics(
+                tool_name=self.tool_name,
+                max_concurrency=self.max_concurrency,
+                rate_limit=self.rate_limit,
+                in_flight=self._in_flight,
+                queued=self._queued,
+                total_calls=self._total_calls,
+                total_wait_time=self._total_wait_time,
+                max_wait_time=self._max_wait_time,
+            )
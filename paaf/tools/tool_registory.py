@@ -1,5 +1,19 @@
-from typing import Dict, List
-from paaf.models.tool import Tool
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from paaf.config.logging import get_logger
+from paaf.models.shared_models import ToolChoice
+from paaf.models.tool import LazyTool, Tool
+from paaf.models.tool_metrics import (
+    ToolCircuitMetrics,
+    ToolInvocationStats,
+    ToolQueueMetrics,
+)
+from paaf.tools.circuit_breaker import CircuitBreaker
+from paaf.tools.tool_arguments import build_arguments_model
+from paaf.tools.tool_limits import ToolLimiter
+
+
+logger = get_logger(__name__)
 
 
 class ToolRegistry:
@@ -7,31 +21,78 @@ class ToolRegistry:
     Registry for tools that would be used by any Agent.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        failure_threshold: Optional[int] = None,
+        recovery_timeout: float = 30.0,
+    ):
+        """
+        Args:
+            failure_threshold: Default number of consecutive failures after which a tool's
+                circuit opens and it's hidden from agents. None, the default, disables
+                circuit breaking unless a tool sets its own threshold.
+            recovery_timeout: Default seconds an open circuit waits before probing the tool.
+        """
         self.tools: Dict[str, Tool] = {}
+        # Bumped on every registration, as a tool registered again keeps its id
+        self._version = 0
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
 
-    def tool(self):
+    def tool(self, **options):
         def decorator(func):
             """
             Decorator to mark a tool function
 
-            it registers a function as tool in the global context
+            it registers a function as tool in the global context.
+            Accepts the same options as `register_tool`.
             """
 
             if not callable(func):
                 raise ValueError("The decorated function must be callable.")
 
             # Register the function as a tool
-            tool_instance = self.register_tool(func)
+            tool_instance = self.register_tool(func, **options)
 
             return func
 
         return decorator
 
-    def register_tool(self, func):
+    def register_tool(
+        self,
+        func,
+        batch_callable: Optional[Callable] = None,
+        max_concurrency: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        burst: Optional[int] = None,
+        failure_threshold: Optional[int] = None,
+        recovery_timeout: Optional[float] = None,
+        side_effect_free: bool = False,
+    ):
         """
         Register a function as a tool in the registry.
+
+        Args:
+            func: The function implementing the tool.
+            batch_callable: Optional function taking a list of argument dicts and returning
+                one result per dict, in order. Agents use it to coalesce several pending
+                calls to this tool into a single invocation.
+            max_concurrency: Maximum number of calls to the tool allowed to run at once,
+                shared by every agent using this registry.
+            rate_limit: Maximum number of calls to the tool started per second.
+            burst: Number of calls allowed back to back before `rate_limit` applies.
+                Requires `rate_limit`.
+            failure_threshold: Consecutive failures that open the tool's circuit.
+                Defaults to the registry's `failure_threshold`, which disables circuit
+                breaking unless set.
+            recovery_timeout: Seconds an open circuit waits before probing the tool.
+                Defaults to the registry's `recovery_timeout`.
+            side_effect_free: Whether calling the tool changes nothing (a search, a read).
+                Only such tools may be called speculatively, before the agent asks for them.
         """
+        if batch_callable is not None and not callable(batch_callable):
+            raise ValueError("The batch implementation must be callable.")
+
         # Get the function name and description
         tool_name = func.__name__
         tool_description = func.__doc__ or "No description provided."
@@ -90,8 +151,314 @@ class ToolRegistry:
             arguments=arguments,
             returns=returns,
             callable=func,
+            argument_model=build_arguments_model(func, tool_name),
+            batch_callable=batch_callable,
+            limiter=self._build_limiter(tool_name, max_concurrency, rate_limit, burst),
+            circuit_breaker=self._build_circuit_breaker(
+                tool_name, failure_threshold, recovery_timeout
+            ),
+            side_effect_free=side_effect_free,
+        )
+
+        self._add(tool_instance)
+
+        return tool_instance
+
+    def register_lazy_tool(
+        self,
+        import_path: str,
+        name: Optional[str] = None,
+        batch_import_path: Optional[str] = None,
+        description: str = "No description provided.",
+        arguments: Optional[Dict[str, Any]] = None,
+        returns: Any = "No return type provided.",
+        max_concurrency: Optional[int] = None,
+        rate_limit: Optional[float] = None,
+        burst: Optional[int] = None,
+        failure_threshold: Optional[int] = None,
+        recovery_timeout: Optional[float] = None,
+        side_effect_free: bool = False,
+    ) -> LazyTool:
+        """
+        Register a tool by import path without importing its module.
+
+        The tool is listed to agents straight away using the given schema, and its module
+        is only imported the first time the tool is called. This keeps heavy SDK imports
+        off the startup path of workers.
+
+        Args:
+            import_path: Where the tool function lives, as `package.module:function`.
+            name: Name of the tool. Defaults to the function name in `import_path`.
+            batch_import_path: Where the batch implementation lives, if the tool has one.
+                It's imported the first time a batch is called.
+            description: Description of the tool shown to the LLM.
+            arguments: Arguments of the tool, in the same format `register_tool` extracts
+                (`{name: {"type": ..., "description": ...}}`).
+            returns: The return type of the tool.
+            max_concurrency, rate_limit, burst, failure_threshold, recovery_timeout,
+            side_effect_free: Same as for `register_tool`.
+
+        Returns:
+            LazyTool: The registered tool.
+        """
+        tool_name = name or import_path.replace(":", ".").rsplit(".", 1)[-1]
+
+        tool_instance = LazyTool(
+            import_path=import_path,
+            batch_import_path=batch_import_path,
+            name=tool_name,
+            description=description,
+            arguments=arguments,
+            returns=returns,
+            limiter=self._build_limiter(tool_name, max_concurrency, rate_limit, burst),
+            circuit_breaker=self._build_circuit_breaker(
+                tool_name, failure_threshold, recovery_timeout
+            ),
+            side_effect_free=side_effect_free,
         )
 
-        self.tools[tool_instance.tool_id] = tool_instance
+        self._add(tool_instance)
 
         return tool_instance
+
+    def _add(self, tool: Tool):
+        if tool.tool_id in self.tools:
+            logger.warning(f"Replacing the registered tool {tool.name}")
+        self.tools[tool.tool_id] = tool
+        self._version += 1
+
+    def get_tool(self, tool_choice: ToolChoice) -> Optional[Tool]:
+        """
+        Get the tool an agent chose.
+
+        Looked up by id, then by name, so choices made with ids of another version
+        (e.g. in an old checkpoint) or a mistyped id still find the tool.
+
+        Args:
+            tool_choice: The tool choice of the agent.
+
+        Returns:
+            Optional[Tool]: The tool, or None if no registered tool matches.
+        """
+        tool = self.tools.get(tool_choice.tool_id)
+        if tool is not None:
+            return tool
+
+        return next(
+            (tool for tool in self.tools.values() if tool.name == tool_choice.name),
+            None,
+        )
+
+    def export_tool_schemas(self) -> List[Dict[str, Any]]:
+        """
+        Export the schema of every tool in a JSON serializable form.
+
+        The result can be saved at build time and passed to `load_tool_schemas` on
+        startup, so workers can list their tools without importing them.
+
+        Returns:
+            List[Dict[str, Any]]: One schema per tool, including its import path.
+        """
+        schemas = []
+        for tool in self.tools.values():
+            if isinstance(tool, LazyTool):
+                import_path = tool.import_path
+                batch_import_path = tool.batch_import_path
+            else:
+                import_path = _import_path(tool.callable)
+                if import_path is None:
+                    logger.warning(
+                        f"Tool {tool.name} can't be imported by path and won't be exported."
+                    )
+                    continue
+
+                batch_import_path = None
+                if tool.batch_callable is not None:
+                    batch_import_path = _import_path(tool.batch_callable)
+                    if batch_import_path is None:
+                        logger.warning(
+                            f"The batch implementation of tool {tool.name} can't be imported by path and won't be exported."
+                        )
+
+            schemas.append(
+                {
+                    "name": tool.name,
+                    "import_path": import_path,
+                    "batch_import_path": batch_import_path,
+                    "description": tool.description,
+                    "arguments": {
+                        argument: {
+                            **details,
+                            "type": _type_name(details.get("type")),
+                        }
+                        for argument, details in tool.arguments.items()
+                    },
+                    "returns": _type_name(tool.returns),
+                    "side_effect_free": tool.side_effect_free,
+                }
+            )
+
+        return schemas
+
+    def save_tool_schemas(self, path: str):
+        """Save the schemas returned by `export_tool_schemas` to a JSON file."""
+        with open(path, "w") as file:
+            json.dump(self.export_tool_schemas(), file, indent=2)
+
+    def load_tool_schemas(
+        self, schemas: Union[str, List[Dict[str, Any]]], **options
+    ) -> List[LazyTool]:
+        """
+        Register lazy tools from exported schemas.
+
+        Args:
+            schemas: The schemas, or the path to a JSON file saved by `save_tool_schemas`.
+            **options: Limits and circuit breaker options applied to every loaded tool.
+
+        Returns:
+            List[LazyTool]: The registered tools.
+        """
+        if isinstance(schemas, str):
+            with open(schemas, "r") as file:
+                schemas = json.load(file)
+
+        return [
+            self.register_lazy_tool(
+                import_path=schema["import_path"],
+                name=schema.get("name"),
+                batch_import_path=schema.get("batch_import_path"),
+                description=schema.get("description", "No description provided."),
+                arguments=schema.get("arguments"),
+                returns=schema.get("returns", "No return type provided."),
+                **{
+                    "side_effect_free": schema.get("side_effect_free", False),
+                    **options,
+                },
+            )
+            for schema in schemas
+        ]
+
+    def _build_limiter(
+        self,
+        tool_name: str,
+        max_concurrency: Optional[int],
+        rate_limit: Optional[float],
+        burst: Optional[int],
+    ) -> Optional[ToolLimiter]:
+        """Build the limiter for a tool, or None if the tool isn't limited."""
+        if max_concurrency is None and rate_limit is None and burst is None:
+            return None
+
+        return ToolLimiter(
+            tool_name=tool_name,
+            max_concurrency=max_concurrency,
+            rate_limit=rate_limit,
+            burst=burst,
+        )
+
+    def _build_circuit_breaker(
+        self,
+        tool_name: str,
+        failure_threshold: Optional[int],
+        recovery_timeout: Optional[float],
+    ) -> Optional[CircuitBreaker]:
+        """Build the circuit breaker for a tool, or None if circuit breaking is disabled."""
+        failure_threshold = (
+            failure_threshold
+            if failure_threshold is not None
+            else self.failure_threshold
+        )
+        if failure_threshold is None:
+            return None
+
+        return CircuitBreaker(
+            tool_name=tool_name,
+            failure_threshold=failure_threshold,
+            recovery_timeout=(
+                recovery_timeout
+                if recovery_timeout is not None
+                else self.recovery_timeout
+            ),
+        )
+
+    def available_tools(self) -> List[Tool]:
+        """
+        Get the tools that can currently be called.
+
+        Tools whose circuit is open are left out, so agents don't offer them to the LLM
+        until the recovery timeout elapses and a probe call is allowed.
+
+        Returns:
+            List[Tool]: The available tools, in registration order.
+        """
+        return [tool for tool in self.tools.values() if tool.is_available]
+
+    def catalog_fingerprint(self) -> Tuple[Any, ...]:
+        """
+        Get a cheap, hashable key of the tools currently offered to agents.
+
+        It changes whenever a tool is registered, including again under the same name,
+        or a circuit opens or closes, so anything rendered from `available_tools()` can
+        be cached against it.
+
+        Returns:
+            Tuple[Any, ...]: The number of registrations so far, then the ids of the
+                available tools, in registration order.
+        """
+        return (self._version,) + tuple(tool.tool_id for tool in self.available_tools())
+
+    def get_circuit_metrics(self) -> Dict[str, ToolCircuitMetrics]:
+        """
+        Get the circuit breaker state of every tool in the registry.
+
+        Returns:
+            Dict[str, ToolCircuitMetrics]: The metrics keyed by tool name.
+        """
+        return {
+            tool.name: tool.circuit_breaker.metrics()
+            for tool in self.tools.values()
+            if tool.circuit_breaker is not None
+        }
+
+    def get_queue_metrics(self) -> Dict[str, ToolQueueMetrics]:
+        """
+        Get the queueing metrics of every limited tool in the registry.
+
+        Returns:
+            Dict[str, ToolQueueMetrics]: The metrics keyed by tool name.
+        """
+        return {
+            tool.name: tool.limiter.metrics()
+            for tool in self.tools.values()
+            if tool.limiter is not None
+        }
+
+    def get_stats(self) -> Dict[str, ToolInvocationStats]:
+        """
+        Get the invocation statistics of every tool in the registry.
+
+        Returns:
+            Dict[str, ToolInvocationStats]: Call counts, error counts, result sizes and
+                latency percentiles keyed by tool name.
+        """
+        return {tool.name: tool.stats.snapshot() for tool in self.tools.values()}
+
+    def reset_stats(self):
+        """Reset the invocation statistics of every tool in the registry."""
+        for tool in self.tools.values():
+            tool.stats.reset()
+
+
+def _type_name(value: Any) -> str:
+    """Get a JSON friendly name for a type annotation."""
+    if isinstance(value, type):
+        return value.__name__
+    return str(value)
+
+
+def _import_path(func: Callable) -> Optional[str]:
+    """The `package.module:function` path of a function, or None if it has none."""
+    qualname = getattr(func, "__qualname__", "")
+    if not qualname or "<locals>" in qualname:
+        return None
+    return f"{func.__module__}:{qualname}"
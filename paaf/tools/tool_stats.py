@@ -0,0 +1,131 @@
+import bisect
+import threading
+from typing import Any, List, Optional
+
+from paaf.models.tool_metrics import ToolInvocationStats
+
+# Upper bounds (in milliseconds) of the latency histogram buckets, roughly 1-2-5 spaced.
+LATENCY_BUCKETS_MS: List[float] = [
+    1,
+    2,
+    5,
+    10,
+    20,
+    50,
+    100,
+    200,
+    500,
+    1_000,
+    2_000,
+    5_000,
+    10_000,
+    20_000,
+    60_000,
+    120_000,
+]
+
+
+def result_size(result: Any) -> int:
+    """
+    Get the size of a tool result, in characters of its string form.
+    """
+    if result is None:
+        return 0
+    if isinstance(result, (str, bytes)):
+        return len(result)
+    return len(str(result))
+
+
+class ToolStats:
+    """
+    Thread safe call counters and latency histogram of a single tool.
+
+    Latencies are kept in fixed buckets, so recording a call is O(log buckets) and the
+    memory used doesn't grow with the number of calls. Percentiles are interpolated
+    within the bucket they fall in.
+    """
+
+    def __init__(self, tool_name: str):
+        self.tool_name = tool_name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget every recorded call."""
+        with self._lock:
+            self._call_count = 0
+            self._error_count = 0
+            self._total_latency_ms = 0.0
+            self._min_latency_ms: Optional[float] = None
+            self._max_latency_ms: Optional[float] = None
+            self._total_result_size = 0
+            # One extra bucket for calls slower than the last bound
+            self._buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, latency_ms: float, error: bool = False, size: int = 0):
+        """
+        Record a finished call.
+
+        Args:
+            latency_ms: How long the call took, in milliseconds.
+            error: Whether the call raised.
+            size: Size of the result, in characters.
+        """
+        bucket = bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)
+
+        with self._lock:
+            self._call_count += 1
+            if error:
+                self._error_count += 1
+            self._total_latency_ms += latency_ms
+            self._total_result_size += size
+            self._buckets[bucket] += 1
+
+            if self._min_latency_ms is None or latency_ms < self._min_latency_ms:
+                self._min_latency_ms = latency_ms
+            if self._max_latency_ms is None or latency_ms > self._max_latency_ms:
+                self._max_latency_ms = latency_ms
+
+    def _percentile(self, fraction: float) -> Optional[float]:
+        """Estimate a latency percentile from the histogram. Expects the lock held."""
+        if not self._call_count:
+            return None
+
+        rank = fraction * self._call_count
+        seen = 0
+        for index, count in enumerate(self._buckets):
+            if not count:
+                continue
+
+            if seen + count >= rank:
+                lower = LATENCY_BUCKETS_MS[index - 1] if index > 0 else 0.0
+                upper = (
+                    LATENCY_BUCKETS_MS[index]
+                    if index < len(LATENCY_BUCKETS_MS)
+                    else self._max_latency_ms
+                )
+                # Keep the estimate within what was actually observed
+                lower = max(lower, self._min_latency_ms)
+                upper = min(upper, self._max_latency_ms)
+                position = (rank - seen) / count
+                return lower + (upper - lower) * position
+
+            seen += count
+
+        return self._max_latency_ms
+
+    def snapshot(self) -> ToolInvocationStats:
+        """Get a snapshot of the statistics."""
+        with self._lock:
+            return ToolInvocationStats(
+                tool_name=self.tool_name,
+                call_count=self._call_count,
+                error_count=self._error_count,
+                total_latency_ms=self._total_latency_ms,
+                min_latency_ms=self._min_latency_ms,
+                max_latency_ms=self._max_latency_ms,
+                p50_latency_ms=self._percentile(0.50),
+                p95_latency_ms=self._percentile(0.95),
+                p99_latency_ms=self._percentile(0.99),
+                total_result_size=self._total_result_size,
+            )
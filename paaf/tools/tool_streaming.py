@@ -0,0 +1,136 @@
+import asyncio
+import inspect
+from typing import Any, AsyncIterator, Iterator, Optional
+
+from paaf.models.tool_stream import ToolStreamLimits, ToolStreamResult
+from paaf.models.utils.token_estimation import CHARS_PER_TOKEN
+
+
+def is_streaming_callable(func: Any) -> bool:
+    """Whether a tool implementation is a generator or async generator function."""
+    if inspect.isgeneratorfunction(func) or inspect.isasyncgenfunction(func):
+        return True
+
+    # Callable objects whose __call__ is a generator
+    call = getattr(type(func), "__call__", None)
+    return inspect.isgeneratorfunction(call) or inspect.isasyncgenfunction(call)
+
+
+class _StreamCollector:
+    """
+    Accumulates stream items until one of the limits is reached.
+    """
+
+    def __init__(self, limits: ToolStreamLimits):
+        self.limits = limits
+        self.result = ToolStreamResult()
+        self._chars = 0
+
+        char_caps = [limits.max_chars]
+        if limits.max_tokens is not None:
+            char_caps.append(limits.max_tokens * CHARS_PER_TOKEN)
+        caps = [cap for cap in char_caps if cap is not None]
+        self._max_chars: Optional[int] = min(caps) if caps else None
+
+    def add(self, item: Any) -> bool:
+        """
+        Add an item to the result.
+
+        Returns:
+            bool: True if more items should be consumed, False to stop.
+        """
+        if self._max_chars is not None:
+            size = len(item) if isinstance(item, str) else len(str(item))
+            remaining = self._max_chars - self._chars
+            if size > remaining:
+                # Always return something, even when the first item is over budget
+                if not self.result.items and isinstance(item, str):
+                    self.result.items.append(item[:remaining])
+                self._stop("size limit reached")
+                return False
+            self._chars += size
+
+        self.result.items.append(item)
+
+        if (
+            self.limits.max_items is not None
+            and len(self.result.items) >= self.limits.max_items
+        ):
+            self._stop("item limit reached")
+            return False
+
+        return True
+
+    def _stop(self, reason: str):
+        self.result.truncated = True
+        self.result.stop_reason = reason
+
+
+def _collect_sync(stream: Iterator, limits: ToolStreamLimits) -> ToolStreamResult:
+    collector = _StreamCollector(limits)
+    try:
+        for item in stream:
+            if not collector.add(item):
+                break
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+
+    return collector.result
+
+
+async def _collect_async(
+    stream: AsyncIterator, limits: ToolStreamLimits
+) -> ToolStreamResult:
+    collector = _StreamCollector(limits)
+    try:
+        async for item in stream:
+            if not collector.add(item):
+                break
+    finally:
+        aclose = getattr(stream, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    return collector.result
+
+
+def _run_coroutine(coroutine) -> Any:
+    """
+    Run a coroutine to completion from sync code.
+
+    Raises:
+        RuntimeError: If called from inside a running event loop, which waiting here
+            would block. Use `Tool.acollect` there instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    coroutine.close()
+    raise RuntimeError(
+        "Can't consume an async generator tool synchronously inside a running event "
+        "loop; use `await tool.acollect(...)` instead."
+    )
+
+
+def collect_stream(stream: Any, limits: ToolStreamLimits) -> ToolStreamResult:
+    """
+    Consume a generator (or async generator) tool result up to the given limits.
+
+    The generator is closed as soon as a limit is reached, so the tool stops producing
+    output nobody will read.
+
+    Args:
+        stream: The generator returned by the tool.
+        limits: The caps on how much of the stream to consume.
+
+    Returns:
+        ToolStreamResult: The consumed prefix of the stream.
+    """
+    if inspect.isasyncgen(stream) or hasattr(stream, "__aiter__"):
+        return _run_coroutine(_collect_async(stream, limits))
+
+    return _collect_sync(iter(stream), limits)
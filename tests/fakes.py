@@ -0,0 +1,68 @@
+import json
+from typing import Any, Callable, List, Optional, Union
+
+from paaf.llms.base_llm import BaseLLM
+
+
+class ScriptLLM(BaseLLM):
+    """
+    LLM returning scripted responses in order, recording the prompts it got.
+
+    Responses that aren't strings are sent as JSON; callables get the prompt.
+    """
+
+    def __init__(self, script: List[Union[str, Any, Callable[[str], Any]]]):
+        self.script = list(script)
+        self.prompts: List[str] = []
+
+    def generate(self, prompt: str, response_format: Any = None) -> str:
+        self.prompts.append(prompt)
+        if not self.script:
+            raise AssertionError(f"Unexpected LLM call:\n{prompt}")
+
+        response = self.script.pop(0)
+        if callable(response):
+            response = response(prompt)
+        return response if isinstance(response, str) else json.dumps(response)
+
+
+def rewoo_tool_plan(
+    step_id: Optional[str],
+    tool,
+    arguments: dict,
+    depends_on: Optional[List[str]] = None,
+) -> dict:
+    """A ReWOO tool call plan, as the planner would write it."""
+    return {
+        "step_id": step_id,
+        "depends_on": depends_on or [],
+        "reasoning": f"Call {tool.name}",
+        "action_type": "tool_call",
+        "tool_choice": {"name": tool.name, "tool_id": tool.tool_id, "reason": "needed"},
+        "tool_arguments": arguments,
+    }
+
+
+def rewoo_handoff_plan(step_id: Optional[str], agent_name: str, context: str) -> dict:
+    """A ReWOO handoff plan, as the planner would write it."""
+    return {
+        "step_id": step_id,
+        "reasoning": f"Ask {agent_name}",
+        "action_type": "handoff",
+        "handoff": {"agent_name": agent_name, "context": context},
+    }
+
+
+def react_tool_call(tool, arguments: dict) -> dict:
+    """A ReAct response calling a tool."""
+    return {
+        "reasoning": f"Call {tool.name}",
+        "action_type": "tool_call",
+        "tool_choice": {"name": tool.name, "tool_id": tool.tool_id, "reason": "needed"},
+        "tool_arguments": arguments,
+    }
+
+
+def react_answer(answer: str) -> dict:
+    """A ReAct response answering the query."""
+    return {"reasoning": "Done", "action_type": "answer", "answer": answer}
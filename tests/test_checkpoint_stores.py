@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+from paaf.checkpoints.file_checkpoint_store import FileCheckpointStore
+from paaf.checkpoints.sqlite_checkpoint_store import SQLiteCheckpointStore
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "file":
+        yield FileCheckpointStore(str(tmp_path / "checkpoints"))
+    else:
+        store = SQLiteCheckpointStore(str(tmp_path / "checkpoints.db"))
+        yield store
+        store.close()
+
+
+def test_save_load_and_overwrite(store):
+    assert store.load("run-1") is None
+
+    store.save("run-1", '{"step": 1}')
+    store.save("run-1", '{"step": 2}')
+
+    assert store.load("run-1") == '{"step": 2}'
+    assert store.list_runs() == ["run-1"]
+
+
+def test_delete(store):
+    store.save("run-1", "{}")
+    store.save("run-2", "{}")
+
+    store.delete("run-1")
+    store.delete("missing")
+
+    assert store.load("run-1") is None
+    assert store.list_runs() == ["run-2"]
+
+
+def test_file_store_rejects_run_ids_escaping_its_directory(tmp_path):
+    store = FileCheckpointStore(str(tmp_path))
+
+    with pytest.raises(ValueError):
+        store.save("../outside", "{}")
+
+
+def test_file_store_leaves_no_temporary_files(tmp_path):
+    store = FileCheckpointStore(str(tmp_path))
+    store.save("run-1", "{}")
+
+    assert os.listdir(tmp_path) == ["run-1.json"]
+
+
+def test_sqlite_store_is_shared_through_its_file(tmp_path):
+    path = str(tmp_path / "checkpoints.db")
+    writer = SQLiteCheckpointStore(path)
+    writer.save("run-1", "{}")
+    writer.close()
+
+    reader = SQLiteCheckpointStore(path)
+    assert reader.load("run-1") == "{}"
+    reader.close()
+
+
+def test_sqlite_store_rejects_invalid_table_names(tmp_path):
+    with pytest.raises(ValueError):
+        SQLiteCheckpointStore(str(tmp_path / "checkpoints.db"), table="runs; DROP")
@@ -0,0 +1,140 @@
+import threading
+
+from paaf.agents.event_bus import EventBus, StepEvent
+from paaf.agents.react.agent import ReactAgent
+from paaf.models.react.react_step_callback import ReactStepType
+from paaf.tools.tool_registory import ToolRegistry
+
+from fakes import ScriptLLM, react_answer, react_tool_call
+
+
+def make_event(name, payload_factory=None):
+    return StepEvent(
+        run_id="run", step=name, payload_factory=payload_factory or (lambda: name)
+    )
+
+
+def test_events_are_delivered_in_order_and_failing_subscribers_are_isolated():
+    bus = EventBus()
+    received = []
+
+    @bus.subscribe
+    def failing(event):
+        raise RuntimeError("subscriber bug")
+
+    bus.subscribe(lambda event: received.append(event.step))
+    for index in range(5):
+        bus.publish(make_event(index))
+
+    assert bus.flush(timeout=5)
+    assert received == [0, 1, 2, 3, 4]
+
+
+def test_payload_is_built_once_and_only_when_read():
+    builds = []
+    event = make_event("step", lambda: builds.append(1) or "payload")
+
+    assert builds == []
+    assert event.payload == "payload"
+    assert event.payload == "payload"
+    assert builds == [1]
+
+
+def test_full_bus_blocks_by_default():
+    bus = EventBus(max_queue_size=1)
+    gate, started = threading.Event(), threading.Event()
+    received = []
+
+    def slow(event):
+        started.set()
+        gate.wait()
+        received.append(event.step)
+
+    bus.subscribe(slow)
+    bus.publish(make_event(0))
+    started.wait(5)
+    bus.publish(make_event(1))
+
+    threading.Timer(0.1, gate.set).start()
+    bus.publish(make_event(2))
+
+    assert bus.flush(timeout=5)
+    assert received == [0, 1, 2]
+    assert bus.dropped_events == 0
+
+
+def test_dropping_bus_still_delivers_required_events():
+    bus = EventBus(max_queue_size=1, block_when_full=False)
+    gate, started = threading.Event(), threading.Event()
+    received = []
+
+    def slow(event):
+        started.set()
+        gate.wait()
+        received.append(event.step)
+
+    bus.subscribe(slow)
+    bus.publish(make_event(0))
+    started.wait(5)
+    bus.publish(make_event(1))
+    bus.publish(make_event(2))
+
+    threading.Timer(0.1, gate.set).start()
+    bus.publish(make_event("final"), required=True)
+
+    assert bus.flush(timeout=5)
+    assert received == [0, 1, "final"]
+    assert bus.dropped_events == 1
+
+
+def test_react_payloads_show_the_run_as_of_their_step():
+    registry = ToolRegistry()
+
+    def search(query: str) -> str:
+        """Search the web."""
+        return "Paris"
+
+    registry.register_tool(search)
+    tool = next(iter(registry.tools.values()))
+    agent = ReactAgent(
+        llm=ScriptLLM(
+            [react_tool_call(tool, {"query": "capital"}), react_answer("Paris")]
+        ),
+        tool_registry=registry,
+    )
+    events = []
+    agent.events.subscribe(events.append)
+
+    agent.run("capital of France?")
+    assert agent.events.flush(timeout=5)
+
+    first, last = events[0].payload, events[-1].payload
+    assert first.current_step.step_type == ReactStepType.THINK
+    assert first.execution_summary.final_response is None
+    assert first.execution_summary.end_time is None
+    assert len(first.execution_summary.steps) == 1
+
+    assert last.current_step.is_final_step
+    assert last.execution_summary.final_response == "Paris"
+    answer_events = [
+        event
+        for event in events
+        if event.payload.current_step.step_type == ReactStepType.FINAL
+    ]
+    assert answer_events[-1].metadata == {"is_final": True}
+
+
+def test_react_payloads_are_not_changed_by_later_steps():
+    agent = ReactAgent(llm=ScriptLLM([react_answer("Paris")]))
+    events = []
+    agent.events.subscribe(events.append)
+
+    session = agent.start("capital of France?")
+    agent.step(session)
+    assert agent.events.flush(timeout=5)
+    for step in session.execution_summary.steps:
+        step.error = "changed afterwards"
+
+    for event in events:
+        assert event.step.error is None
+        assert all(step.error is None for step in event.payload.execution_summary.steps)
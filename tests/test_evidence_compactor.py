@@ -0,0 +1,76 @@
+from paaf.agents.rewoo.evidence_compactor import EvidenceCompactor, render_plan
+from paaf.models.rewoo.rewoo_evidence_limits import RewooEvidenceLimits
+from paaf.models.rewoo.rewoo_models import RewooEvidence, RewooPlan
+
+FACT = "The Eiffel Tower is three hundred and thirty metres tall."
+
+
+def plan(step_id, query="eiffel tower"):
+    return RewooPlan(
+        step_id=step_id,
+        reasoning="Search",
+        action_type="tool_call",
+        tool_choice={"name": "search", "tool_id": "search", "reason": ""},
+        tool_arguments={"query": query},
+    )
+
+
+def compact(limits, *evidence, query="How tall is the Eiffel Tower?"):
+    pairs = [
+        (plan(f"E{index + 1}"), RewooEvidence(content=content))
+        for index, content in enumerate(evidence)
+    ]
+    return EvidenceCompactor(limits).compact(query, pairs)
+
+
+def test_plans_render_on_one_line():
+    assert render_plan(plan("E1")) == (
+        'Plan: Search\n#E1 = search({"query": "eiffel tower"})'
+    )
+
+
+def test_repeated_evidence_points_at_the_first_step():
+    text = compact(RewooEvidenceLimits(), FACT, FACT)
+
+    assert text.count(FACT) == 1
+    assert "#E2 = search" in text and "Evidence: (same as #E1)" in text
+
+
+def test_repeated_sentences_are_dropped():
+    text = compact(RewooEvidenceLimits(), FACT, f"{FACT} It opened in 1889.")
+
+    assert text.count(FACT) == 1
+    assert "It opened in 1889. [repeats of #E1 removed]" in text
+
+
+def test_short_sentences_are_not_treated_as_repeats():
+    text = compact(RewooEvidenceLimits(), "Yes.", "Yes.")
+
+    assert text.count("Evidence: Yes.") == 2
+
+
+def test_nothing_is_dropped_without_deduplication():
+    text = compact(RewooEvidenceLimits(deduplicate=False), FACT, FACT)
+
+    assert text.count(FACT) == 2
+
+
+def test_long_evidence_is_cut_to_its_opening():
+    text = compact(RewooEvidenceLimits(max_evidence_tokens=5), "x" * 100)
+
+    assert "Evidence: " + "x" * 20 + "... [truncated 80 characters]" in text
+
+
+def test_relevance_filter_keeps_the_sentences_about_the_query():
+    evidence = (
+        "Paris has many museums and parks to visit. "
+        f"{FACT} "
+        "The city hosts millions of visitors every single year."
+    )
+    text = compact(
+        RewooEvidenceLimits(max_evidence_tokens=20, relevance_filter=True), evidence
+    )
+
+    assert f"... {FACT} ..." in text
+    assert "museums" not in text
+    assert "kept the 1 of 3 sentences most relevant to the query" in text
@@ -0,0 +1,79 @@
+from paaf.agents.history_manager import HistoryManager
+from paaf.models.history import HistoryLimits, HistoryState
+from paaf.models.shared_models import Message
+
+
+def test_repeated_output_points_at_the_first_observation():
+    manager = HistoryManager()
+    messages, state = [], HistoryState()
+
+    manager.record_observation(messages, state, "search", "Paris")
+    manager.record_observation(messages, state, "search", "Paris")
+
+    assert messages[1].content == (
+        "[obs-2] Tool search returned the same result as [obs-1]."
+    )
+
+
+def test_repeat_of_a_summarized_observation_is_recorded_again():
+    manager = HistoryManager(
+        limits=HistoryLimits(summarize_after_tokens=1, keep_recent_messages=1)
+    )
+    messages, state = [], HistoryState()
+
+    manager.record_observation(messages, state, "search", "Paris is the capital")
+    messages.append(Message(role="assistant", content="Checking again"))
+    manager.compact(messages, state)
+    assert state.summarized_count == 1
+
+    manager.record_observation(messages, state, "search", "Paris is the capital")
+    rendered = manager.render(messages, state)
+
+    assert "[obs-2] Result from tool search: Paris is the capital" in rendered
+    assert "same result as" not in rendered
+
+
+def test_outputs_are_kept_whole_by_default():
+    manager = HistoryManager()
+    messages, state = [], HistoryState()
+
+    manager.record_observation(messages, state, "read", "x" * 10000)
+
+    assert messages[0].content.endswith("x" * 10000)
+    assert state.artifacts == {}
+
+
+def test_long_outputs_are_truncated_when_capped():
+    manager = HistoryManager(limits=HistoryLimits(max_observation_chars=10))
+    messages, state = [], HistoryState()
+
+    handle = manager.record_observation(messages, state, "read", "x" * 100)
+
+    assert "truncated 90 characters" in messages[0].content
+    assert state.artifacts[handle] == "x" * 100
+
+
+def test_compact_keeps_recent_messages_verbatim():
+    manager = HistoryManager(
+        limits=HistoryLimits(summarize_after_tokens=10, keep_recent_messages=2)
+    )
+    messages = [Message(role="user", content=f"message {i} " * 10) for i in range(5)]
+    state = HistoryState()
+
+    manager.compact(messages, state)
+    rendered = manager.render(messages, state)
+
+    assert state.summarized_count == 3
+    assert rendered.startswith("summary of earlier steps: ")
+    assert rendered.endswith(f"user: {messages[4].content}")
+
+
+def test_history_is_never_folded_by_default():
+    manager = HistoryManager()
+    messages = [Message(role="user", content="x" * 10000) for _ in range(20)]
+    state = HistoryState()
+
+    manager.compact(messages, state)
+
+    assert state.summarized_count == 0
+    assert state.summary is None
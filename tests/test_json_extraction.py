@@ -0,0 +1,71 @@
+from typing import List
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from paaf.agents.react.agent import ReactAgent
+from paaf.models.utils.json_extraction import (
+    JSONExtractionError,
+    extract_json,
+    parse_json_as,
+)
+
+from fakes import ScriptLLM
+
+
+class Step(BaseModel):
+    name: str
+    done: bool = False
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ('{"a": 1}', {"a": 1}),
+        ('```json\n{"a": 1}\n```', {"a": 1}),
+        ('Sure! Here it is: {"a": 1} Hope it helps.', {"a": 1}),
+        ('{"a": [1, 2,], "b": {"c": 3,},}', {"a": [1, 2], "b": {"c": 3}}),
+        ('{"a": True, "b": None}', {"a": True, "b": None}),
+        ('{"a": "braces } in [ strings"}', {"a": "braces } in [ strings"}),
+        ('[{"a": 1}, {"a": 2}', [{"a": 1}, {"a": 2}]),
+        ('{"a": 1, "b": "cut off', {"a": 1, "b": "cut off"}),
+        ('{"a": 1, "b":', {"a": 1, "b": None}),
+        ("not json {oops} then [1, 2]", [1, 2]),
+    ],
+)
+def test_extract_json(text, expected):
+    assert extract_json(text) == expected
+
+
+def test_extract_json_gives_up_on_text_without_json():
+    with pytest.raises(JSONExtractionError):
+        extract_json("no JSON here")
+
+    with pytest.raises(JSONExtractionError):
+        extract_json(None)
+
+
+def test_parse_json_as_validates():
+    steps = parse_json_as('[{"name": "a"}, {"name": "b", "done": true},]', List[Step])
+    assert steps == [Step(name="a"), Step(name="b", done=True)]
+
+    with pytest.raises(ValidationError):
+        parse_json_as('{"done": true}', Step)
+
+
+def test_llm_is_asked_to_correct_a_response_that_cant_be_parsed():
+    llm = ScriptLLM(['{"name": "fixed"}'])
+    agent = ReactAgent(llm=llm)
+
+    assert agent.parse_llm_json("no JSON here", Step) == Step(name="fixed")
+    assert "no JSON here" in llm.prompts[0]
+
+
+def test_llm_corrections_are_bounded():
+    llm = ScriptLLM(["still no JSON"] * 10)
+    agent = ReactAgent(llm=llm)
+
+    with pytest.raises(ValueError, match="Could not parse the LLM response as Step"):
+        agent.parse_llm_json("no JSON here", Step)
+
+    assert len(llm.prompts) == agent.max_json_repairs
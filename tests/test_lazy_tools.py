@@ -0,0 +1,92 @@
+import pytest
+
+from paaf.models.tool import LazyTool, ToolArgumentError
+from paaf.tools.tool_registory import ToolRegistry
+
+BATCHES = []
+
+
+def lookup(key: str) -> str:
+    """Look up a key."""
+    return f"value of {key}"
+
+
+def lookup_many(arguments_list):
+    BATCHES.append(arguments_list)
+    return [f"batch value of {arguments['key']}" for arguments in arguments_list]
+
+
+def test_lazy_tool_imports_on_first_call():
+    registry = ToolRegistry()
+    tool = registry.register_lazy_tool(f"{__name__}:lookup")
+
+    assert tool.name == "lookup"
+    assert not tool.is_loaded
+    assert tool(key="a") == "value of a"
+    assert tool.is_loaded
+
+
+def test_schema_round_trip_keeps_the_batch_implementation(tmp_path):
+    registry = ToolRegistry()
+    registry.register_tool(lookup, batch_callable=lookup_many, side_effect_free=True)
+    path = tmp_path / "tools.json"
+    registry.save_tool_schemas(str(path))
+
+    loaded = ToolRegistry().load_tool_schemas(str(path))
+
+    assert len(loaded) == 1
+    tool = loaded[0]
+    assert isinstance(tool, LazyTool)
+    assert tool.side_effect_free
+    assert tool.supports_batching
+    assert not tool.is_loaded
+
+    BATCHES.clear()
+    assert tool.call_batch([{"key": "a"}, {"key": "b"}]) == [
+        "batch value of a",
+        "batch value of b",
+    ]
+    assert BATCHES == [[{"key": "a"}, {"key": "b"}]]
+
+
+def test_lazy_tools_export_their_import_paths():
+    registry = ToolRegistry()
+    registry.register_lazy_tool(
+        f"{__name__}:lookup", batch_import_path=f"{__name__}:lookup_many"
+    )
+
+    (schema,) = registry.export_tool_schemas()
+
+    assert schema["import_path"] == f"{__name__}:lookup"
+    assert schema["batch_import_path"] == f"{__name__}:lookup_many"
+
+
+def test_local_functions_are_not_exported():
+    registry = ToolRegistry()
+
+    def local_tool(x: int) -> int:
+        """Local."""
+        return x
+
+    registry.register_tool(local_tool)
+
+    assert registry.export_tool_schemas() == []
+
+
+def test_loaded_schemas_validate_and_record_stats_once_imported(tmp_path):
+    registry = ToolRegistry()
+    registry.register_tool(lookup)
+    path = tmp_path / "tools.json"
+    registry.save_tool_schemas(str(path))
+
+    loaded = ToolRegistry()
+    (tool,) = loaded.load_tool_schemas(str(path))
+
+    assert tool.to_dict()["arguments"]["key"]["type"] == "str"
+    assert tool.description == "Look up a key."
+    assert not tool.is_loaded
+
+    with pytest.raises(ToolArgumentError):
+        tool(key=1)
+    assert tool(key="a") == "value of a"
+    assert loaded.get_stats()["lookup"].call_count == 1
@@ -0,0 +1,128 @@
+from pydantic import BaseModel
+
+from paaf.agents.react.agent import ReactAgent
+from paaf.agents.react.loop_detector import LoopDetector
+from paaf.models.react.react_loop_detection import ReactLoopLimits, ReactLoopState
+from paaf.tools.tool_registory import ToolRegistry
+
+from fakes import ScriptLLM, react_answer, react_tool_call
+
+
+class Capital(BaseModel):
+    city: str
+
+
+def make_registry(side_effect_free):
+    registry = ToolRegistry()
+    calls = []
+
+    def job_status(job: str) -> str:
+        """Get the status of a job."""
+        calls.append(job)
+        return f"{len(calls)} step(s) done"
+
+    registry.register_tool(job_status, side_effect_free=side_effect_free)
+    return registry, next(iter(registry.tools.values())), calls
+
+
+def run_twice(side_effect_free, loop_limits=None):
+    registry, tool, calls = make_registry(side_effect_free)
+    call = react_tool_call(tool, {"job": "build"})
+    agent = ReactAgent(
+        llm=ScriptLLM([call, call, react_answer("done")]),
+        tool_registry=registry,
+        loop_limits=loop_limits,
+    )
+    agent.run("is the build done?")
+    return calls
+
+
+def test_repeated_call_gets_a_hint_then_forces_an_answer():
+    detector = LoopDetector(ReactLoopLimits(max_hints=1))
+    state = ReactLoopState()
+    signature = detector.call_signature("search", {"query": "x"})
+
+    def record(observation):
+        return detector.record_call(
+            state, "search", signature, observation, side_effect_free=True
+        )
+
+    assert record("a") is None
+    assert "already called search" in record("b")
+    assert not state.force_answer
+
+    assert "Do not call any more tools" in record("c")
+    assert state.force_answer
+
+
+def test_calling_a_tool_with_side_effects_again_is_not_a_stall():
+    detector = LoopDetector(ReactLoopLimits(max_hints=0))
+    state = ReactLoopState()
+    signature = detector.call_signature("job_status", {"job": "build"})
+
+    for _ in range(5):
+        assert detector.record_call(state, "job_status", signature, "running") is None
+
+    assert not state.force_answer
+
+
+def test_cycling_between_tools_is_a_stall():
+    detector = LoopDetector()
+    state = ReactLoopState()
+
+    hints = [
+        detector.record_call(
+            state,
+            tool,
+            detector.call_signature(tool, {"n": n}),
+            tool,
+            side_effect_free=True,
+        )
+        for n, tool in enumerate(["a", "b", "a", "b"])
+    ]
+
+    assert hints[:3] == [None, None, None]
+    assert "cycling" in hints[3]
+
+
+def test_call_signature_ignores_argument_order():
+    assert LoopDetector.call_signature("t", {"a": 1, "b": 2}) == (
+        LoopDetector.call_signature("t", {"b": 2, "a": 1})
+    )
+
+
+def test_repeated_calls_run_again_by_default():
+    assert run_twice(side_effect_free=True) == ["build", "build"]
+
+
+def test_repeated_calls_reuse_side_effect_free_observations_when_enabled():
+    limits = ReactLoopLimits(reuse_observations=True)
+
+    assert run_twice(side_effect_free=True, loop_limits=limits) == ["build"]
+    assert run_twice(side_effect_free=False, loop_limits=limits) == [
+        "build",
+        "build",
+    ]
+
+
+def test_forced_answer_follows_the_output_format():
+    registry, tool, _ = make_registry(side_effect_free=True)
+    call = react_tool_call(tool, {"job": "build"})
+    llm = ScriptLLM([call, call, call, call, react_answer({"city": "Paris"})])
+    agent = ReactAgent(llm=llm, tool_registry=registry, output_format=Capital)
+
+    result = agent.run("capital of France?")
+
+    assert result.content == Capital(city="Paris")
+    assert "You may not call any more tools" in llm.prompts[-1]
+
+
+def test_polling_a_tool_with_side_effects_doesnt_end_the_run():
+    registry, tool, calls = make_registry(side_effect_free=False)
+    call = react_tool_call(tool, {"job": "build"})
+    llm = ScriptLLM([call, call, call, call, react_answer("done")])
+    agent = ReactAgent(llm=llm, tool_registry=registry)
+
+    assert agent.run("is the build done?").content == "done"
+    assert len(calls) == 4
+    assert "You may not call any more tools" not in llm.prompts[-1]
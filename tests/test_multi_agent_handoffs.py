@@ -0,0 +1,60 @@
+import json
+import threading
+
+from paaf.agents.multi_agent import MultiAgent
+from paaf.agents.react.agent import ReactAgent
+from paaf.agents.rewoo.rewoo_agent import ReWOOAgent
+from paaf.models.agent_handoff import HandoffCapability
+from paaf.tools.tool_registory import ToolRegistry
+
+from fakes import ScriptLLM, react_answer, rewoo_handoff_plan, rewoo_tool_plan
+
+
+class ExpertLLM(ScriptLLM):
+    """Answers every handoff with the topic it was given, waiting for two to arrive."""
+
+    def __init__(self):
+        super().__init__([])
+        self.both_started = threading.Barrier(2, timeout=5)
+
+    def generate(self, prompt, response_format=None):
+        self.prompts.append(prompt)
+        self.both_started.wait()
+        topic = "history" if "history" in prompt else "geography"
+        return json.dumps(react_answer(f"expert notes on {topic}"))
+
+
+def test_rewoo_runs_handoff_plans_through_the_multi_agent_executor():
+    registry = ToolRegistry()
+
+    def search(query: str) -> str:
+        """Search the web."""
+        return f"results for {query}"
+
+    registry.register_tool(search)
+    tool = next(iter(registry.tools.values()))
+    planner = ScriptLLM(
+        [
+            [
+                rewoo_handoff_plan("E1", "expert", "the history of Paris"),
+                rewoo_handoff_plan("E2", "expert", "the geography of Paris"),
+                rewoo_tool_plan("E3", tool, {"query": "paris"}),
+            ],
+            "answer",
+        ]
+    )
+    primary = ReWOOAgent(llm=planner, tool_registry=registry, max_workers=4)
+    expert_llm = ExpertLLM()
+    system = MultiAgent(primary)
+    system.register_agent(
+        ReactAgent(llm=expert_llm),
+        HandoffCapability(name="expert", description="Knows about cities"),
+    )
+
+    assert system.run("Tell me about Paris") == "answer"
+
+    solver_prompt = planner.prompts[-1]
+    assert "Evidence: expert notes on history" in solver_prompt
+    assert "Evidence: expert notes on geography" in solver_prompt
+    assert "Evidence: results for paris" in solver_prompt
+    assert len(expert_llm.prompts) == 2
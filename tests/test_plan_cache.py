@@ -0,0 +1,137 @@
+from paaf.agents.rewoo.plan_cache import PlanCache
+from paaf.agents.rewoo.rewoo_agent import ReWOOAgent
+from paaf.models.rewoo.rewoo_models import RewooPlan
+from paaf.tools.tool_registory import ToolRegistry
+
+from fakes import ScriptLLM, rewoo_tool_plan
+
+
+def plan(arguments, step_id="E1"):
+    return RewooPlan(
+        step_id=step_id,
+        reasoning=f"Look up {arguments}",
+        action_type="tool_call",
+        tool_choice={"name": "weather", "tool_id": "weather", "reason": ""},
+        tool_arguments=arguments,
+    )
+
+
+def make_agent(script, fail=False, plan_cache=None):
+    registry = ToolRegistry()
+
+    def weather(city: str) -> str:
+        """Get the weather of a city."""
+        if fail:
+            raise RuntimeError("service down")
+        return f"sunny in {city}"
+
+    registry.register_tool(weather)
+    tool = next(iter(registry.tools.values()))
+    llm = ScriptLLM(script(tool))
+    agent = ReWOOAgent(
+        llm=llm,
+        tool_registry=registry,
+        plan_cache=plan_cache or PlanCache(),
+        max_replans=0,
+    )
+    return agent, llm
+
+
+def test_queries_are_normalized():
+    cache = PlanCache()
+    cache.put("Weather in Paris?", "ctx", [plan({"city": "Paris"})])
+
+    assert cache.get("  weather in   paris", "ctx")[0].tool_arguments == {
+        "city": "Paris"
+    }
+    assert cache.get("weather in Paris", "other ctx") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = PlanCache(max_entries=2)
+    cache.put("a", "ctx", [plan({"city": "a"})])
+    cache.put("b", "ctx", [plan({"city": "b"})])
+    cache.get("a", "ctx")
+    cache.put("c", "ctx", [plan({"city": "c"})])
+
+    assert cache.get("b", "ctx") is None
+    assert cache.get("a", "ctx") is not None
+
+
+def test_query_templates_share_plans_across_parameters():
+    cache = PlanCache(query_templates=["weather in {city}"])
+    cache.put("weather in Paris", "ctx", [plan({"city": "Paris"})])
+
+    (cached,) = cache.get("weather in Rome", "ctx")
+
+    assert cached.tool_arguments == {"city": "Rome"}
+    assert cached.reasoning == "Look up {'city': 'Rome'}"
+
+
+def test_plans_not_using_the_parameters_are_cached_for_their_query_only():
+    cache = PlanCache(query_templates=["weather in {city}"])
+    cache.put("weather in Paris", "ctx", [plan({"city": "here"})])
+
+    assert cache.get("weather in Rome", "ctx") is None
+    assert cache.get("weather in Paris", "ctx") is not None
+
+
+def test_discard():
+    cache = PlanCache(query_templates=["weather in {city}"])
+    cache.put("weather in Paris", "ctx", [plan({"city": "Paris"})])
+
+    cache.discard("weather in Rome", "ctx")
+
+    assert cache.get("weather in Paris", "ctx") is None
+
+
+def test_rewoo_reuses_the_plans_of_a_run_that_worked():
+    cache = PlanCache()
+    agent, llm = make_agent(
+        lambda tool: [
+            [rewoo_tool_plan("E1", tool, {"city": "Paris"})],
+            "sunny",
+            "still sunny",
+        ],
+        plan_cache=cache,
+    )
+
+    agent.run("weather in Paris?")
+    agent.run("weather in Paris?")
+
+    assert len(llm.prompts) == 3
+    assert cache.hits == 1
+
+
+def test_rewoo_doesnt_cache_plans_that_failed():
+    cache = PlanCache()
+    agent, llm = make_agent(
+        lambda tool: [
+            [rewoo_tool_plan("E1", tool, {"city": "Paris"})],
+            "unknown",
+        ],
+        fail=True,
+        plan_cache=cache,
+    )
+
+    agent.run("weather in Paris?")
+
+    assert cache.get("weather in Paris?", agent._plan_cache_context()) is None
+
+
+def test_rewoo_evicts_cached_plans_that_fail():
+    cache = PlanCache()
+    agent, _ = make_agent(lambda tool: ["unknown"], fail=True, plan_cache=cache)
+    tool = next(iter(agent.tools_registry.tools.values()))
+    context = agent._plan_cache_context()
+    cache.put(
+        "weather in Paris?",
+        context,
+        [RewooPlan.model_validate(rewoo_tool_plan("E1", tool, {"city": "Paris"}))],
+    )
+
+    agent.run("weather in Paris?")
+
+    assert cache.hits == 1
+    assert cache.get("weather in Paris?", context) is None
@@ -0,0 +1,109 @@
+from paaf.agents.rewoo.plan_scheduler import (
+    acyclic_dependencies,
+    assign_step_ids,
+    dependent_steps,
+    resolve_arguments,
+    schedule_waves,
+)
+from paaf.agents.rewoo.rewoo_agent import ReWOOAgent
+from paaf.models.rewoo.rewoo_models import RewooPlan
+from paaf.tools.tool_registory import ToolRegistry
+
+from fakes import ScriptLLM, rewoo_tool_plan
+
+
+def plan(step_id=None, arguments=None, depends_on=None):
+    return RewooPlan(
+        step_id=step_id,
+        depends_on=depends_on or [],
+        reasoning="",
+        action_type="tool_call",
+        tool_choice={"name": "search", "tool_id": "search", "reason": ""},
+        tool_arguments=arguments or {},
+    )
+
+
+def test_missing_ids_are_numbered_by_position():
+    plans = [plan(), plan("E2"), plan()]
+    assign_step_ids(plans)
+
+    assert [p.step_id for p in plans] == ["E1", "E2", "E3"]
+
+
+def test_fallback_ids_skip_the_ids_in_use():
+    plans = [plan("E2"), plan(None)]
+    assign_step_ids(plans)
+    assert [p.step_id for p in plans] == ["E2", "E3"]
+
+    plans = [plan(None), plan("E1")]
+    assign_step_ids(plans)
+    assert [p.step_id for p in plans] == ["E2", "E1"]
+
+
+def test_duplicate_ids_are_renamed():
+    plans = [plan("E1"), plan("E1"), plan("E2")]
+    assign_step_ids(plans)
+
+    assert [p.step_id for p in plans] == ["E1", "E3", "E2"]
+
+
+def test_waves_follow_references_and_declared_dependencies():
+    plans = [
+        plan("E1"),
+        plan("E2"),
+        plan("E3", {"query": "about #E1"}),
+        plan("E4", depends_on=["E3"]),
+    ]
+
+    assert schedule_waves(plans) == [[0, 1], [2], [3]]
+    assert dependent_steps(plans, {"E1"}) == {"E3", "E4"}
+
+
+def test_cycles_fall_back_to_plan_order():
+    plans = [
+        plan("E1", {"query": "#E2"}),
+        plan("E2", {"query": "#E1"}),
+        plan("E3", {"query": "#E2"}),
+    ]
+
+    assert acyclic_dependencies(plans) == {"E1": set(), "E2": {"E1"}, "E3": {"E2"}}
+    assert schedule_waves(plans) == [[0], [1], [2]]
+
+
+def test_dependencies_on_later_steps_outside_a_cycle_are_kept():
+    plans = [plan("E1", {"query": "#E2"}), plan("E2")]
+
+    assert schedule_waves(plans) == [[1], [0]]
+
+
+def test_resolve_arguments():
+    evidence = {"E1": {"city": "Paris"}, "E2": 3}
+
+    assert resolve_arguments(
+        {"whole": "#E1", "inline": "weather in #E2 #E9", "nested": ["#E2"]}, evidence
+    ) == {
+        "whole": {"city": "Paris"},
+        "inline": "weather in 3 #E9",
+        "nested": [3],
+    }
+
+
+def test_rewoo_runs_cyclic_plans_in_plan_order():
+    registry = ToolRegistry()
+    calls = []
+
+    def search(query: str) -> str:
+        """Search the web."""
+        calls.append(query)
+        return f"results for {query}"
+
+    registry.register_tool(search)
+    tool = next(iter(registry.tools.values()))
+    plans = [
+        rewoo_tool_plan("E1", tool, {"query": "#E2"}),
+        rewoo_tool_plan("E2", tool, {"query": "#E1"}),
+    ]
+
+    ReWOOAgent(llm=ScriptLLM([plans, "answer"]), tool_registry=registry).run("q")
+
+    assert calls == ["#E2", "results for #E2"]
@@ -0,0 +1,83 @@
+import sys
+
+import pytest
+
+from paaf.agents.react.agent import ReactAgent
+from paaf.models.react.react_run_state import ReactPhase
+from paaf.tools.tool_registory import ToolRegistry
+
+from fakes import ScriptLLM, react_answer, react_tool_call
+
+
+def stack_depth() -> int:
+    depth = 0
+    frame = sys._getframe()
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+    return depth
+
+
+def make_counter():
+    registry = ToolRegistry()
+    depths = []
+
+    def count(n: int) -> int:
+        """Count."""
+        depths.append(stack_depth())
+        return n
+
+    registry.register_tool(count)
+    return registry, next(iter(registry.tools.values())), depths
+
+
+def test_steps_alternate_between_thinking_and_acting():
+    registry, tool, depths = make_counter()
+    llm = ScriptLLM([react_tool_call(tool, {"n": 1}), react_answer("1")])
+    agent = ReactAgent(llm=llm, tool_registry=registry)
+
+    session = agent.start("count to one")
+    assert session.phase == ReactPhase.THINK
+    assert llm.prompts == []
+
+    assert agent.step(session) is None
+    assert session.phase == ReactPhase.ACT
+    assert depths == []
+
+    assert agent.step(session) is None
+    assert session.phase == ReactPhase.THINK
+    assert len(depths) == 1
+
+    result = agent.step(session)
+    assert result.content == "1"
+    assert session.is_done
+    assert agent.step(session) is result
+
+
+def test_stack_doesnt_grow_with_the_number_of_iterations():
+    registry, tool, depths = make_counter()
+    iterations = 50
+    llm = ScriptLLM(
+        [react_tool_call(tool, {"n": n}) for n in range(iterations)]
+        + [react_answer("done")]
+    )
+    agent = ReactAgent(llm=llm, tool_registry=registry, max_iterations=iterations + 1)
+
+    assert agent.run("count").content == "done"
+
+    assert len(depths) == iterations
+    assert len(set(depths)) == 1
+
+
+def test_running_out_of_iterations_fails_the_run():
+    registry, tool, _ = make_counter()
+    llm = ScriptLLM([react_tool_call(tool, {"n": n}) for n in range(3)])
+    agent = ReactAgent(llm=llm, tool_registry=registry, max_iterations=2)
+
+    session = agent.start("count forever")
+    with pytest.raises(ValueError, match="Maximum number of iterations"):
+        while not session.is_done:
+            agent.step(session)
+
+    assert session.is_done
+    assert not session.execution_summary.success
@@ -0,0 +1,74 @@
+import threading
+import time
+
+from paaf.agents.rewoo.rewoo_agent import ReWOOAgent
+from paaf.tools.tool_registory import ToolRegistry
+
+from fakes import ScriptLLM, rewoo_tool_plan
+
+
+def run_searches(queries, max_workers, delays=None, **options):
+    registry = ToolRegistry()
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def search(query: str) -> str:
+        """Search the web."""
+        with lock:
+            running.append(query)
+            peak.append(len(running))
+        time.sleep((delays or {}).get(query, 0.05))
+        with lock:
+            running.remove(query)
+        return f"results for {query}"
+
+    tool = registry.register_tool(search, **options)
+    llm = ScriptLLM(
+        [
+            [
+                rewoo_tool_plan(f"E{index}", tool, {"query": query})
+                for index, query in enumerate(queries, start=1)
+            ],
+            "answer",
+        ]
+    )
+    agent = ReWOOAgent(llm=llm, tool_registry=registry, max_workers=max_workers)
+
+    assert agent.run("search everything").content == "answer"
+
+    return max(peak), llm.prompts[-1]
+
+
+def test_independent_calls_run_at_the_same_time():
+    peak, _ = run_searches(["a", "b", "c"], max_workers=3)
+
+    assert peak == 3
+
+
+def test_max_workers_caps_the_calls_in_flight():
+    peak, _ = run_searches(["a", "b", "c", "d"], max_workers=2)
+
+    assert peak == 2
+
+
+def test_one_worker_runs_the_calls_one_after_another():
+    peak, _ = run_searches(["a", "b", "c"], max_workers=1)
+
+    assert peak == 1
+
+
+def test_tool_limits_still_apply_to_parallel_calls():
+    peak, _ = run_searches(["a", "b", "c"], max_workers=3, max_concurrency=1)
+
+    assert peak == 1
+
+
+def test_evidence_keeps_plan_order_whatever_finishes_first():
+    _, solver_prompt = run_searches(
+        ["slow", "fast"], max_workers=2, delays={"slow": 0.1, "fast": 0}
+    )
+
+    assert solver_prompt.index("results for slow") < solver_prompt.index(
+        "results for fast"
+    )
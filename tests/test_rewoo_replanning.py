@@ -0,0 +1,60 @@
+from paaf.agents.rewoo.rewoo_agent import ReWOOAgent
+from paaf.tools.tool_registory import ToolRegistry
+
+from fakes import ScriptLLM, rewoo_handoff_plan, rewoo_tool_plan
+
+
+def make_registry():
+    registry = ToolRegistry()
+    calls = []
+
+    def search(query: str) -> str:
+        """Search the web."""
+        calls.append(query)
+        if query == "broken":
+            raise RuntimeError("search failed")
+        return f"results for {query}"
+
+    registry.register_tool(search)
+    return registry, next(iter(registry.tools.values())), calls
+
+
+def test_failed_steps_are_replanned_keeping_the_other_evidence():
+    registry, search, calls = make_registry()
+    llm = ScriptLLM(
+        [
+            [
+                rewoo_tool_plan("E1", search, {"query": "paris"}),
+                rewoo_tool_plan("E2", search, {"query": "broken"}),
+            ],
+            [rewoo_tool_plan("E2", search, {"query": "fixed"})],
+            "answer",
+        ]
+    )
+
+    ReWOOAgent(llm=llm, tool_registry=registry).run("q")
+
+    assert calls == ["paris", "broken", "fixed"]
+    assert "results for paris" in llm.prompts[1]
+    assert "results for fixed" in llm.prompts[2]
+
+
+def test_replanning_with_a_handoff_that_never_ran():
+    registry, search, calls = make_registry()
+    llm = ScriptLLM(
+        [
+            [
+                rewoo_handoff_plan("E1", "expert", "explain it"),
+                rewoo_tool_plan("E2", search, {"query": "broken"}),
+            ],
+            [rewoo_tool_plan("E2", search, {"query": "fixed"})],
+            "answer",
+        ]
+    )
+
+    ReWOOAgent(llm=llm, tool_registry=registry).run("q")
+
+    assert calls == ["broken", "fixed"]
+    assert "#E1 = handoff to expert: explain it\nEvidence: (not executed)" in (
+        llm.prompts[1]
+    )
@@ -0,0 +1,122 @@
+import json
+import re
+import threading
+
+from paaf.agents.react.agent import ReactAgent
+from paaf.agents.rewoo.rewoo_agent import ReWOOAgent
+from paaf.tools.tool_registory import ToolRegistry
+
+from fakes import ScriptLLM, react_answer, react_tool_call, rewoo_tool_plan
+
+CAPITALS = {"France": "Paris", "Japan": "Tokyo"}
+
+
+def make_registry():
+    registry = ToolRegistry()
+    both_called = threading.Barrier(2, timeout=5)
+
+    def capital(country: str) -> str:
+        """Get the capital of a country."""
+        # Both runs must be calling the tool at the same time to get past this
+        both_called.wait()
+        return f"capital found: {CAPITALS[country]}"
+
+    registry.register_tool(capital)
+    return registry, next(iter(registry.tools.values()))
+
+
+class CountryLLM(ScriptLLM):
+    """Responds with `respond(country, capitals found so far, prompt)` for the query."""
+
+    def __init__(self, respond):
+        super().__init__([])
+        self.respond = respond
+        self.lock = threading.Lock()
+
+    def generate(self, prompt, response_format=None):
+        with self.lock:
+            self.prompts.append(prompt)
+        country = re.search(r"capital of (\w+)\?", prompt).group(1)
+        found = re.findall(r"capital found: (\w+)", prompt)
+        response = self.respond(country, found, prompt)
+        return response if isinstance(response, str) else json.dumps(response)
+
+
+def run_concurrently(agent, queries):
+    results = {}
+
+    def run(query):
+        results[query] = agent.run(query).content
+
+    threads = [threading.Thread(target=run, args=(query,)) for query in queries]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return results
+
+
+def test_concurrent_react_runs_keep_their_own_state():
+    registry, tool = make_registry()
+
+    def respond(country, found, prompt):
+        if found:
+            return react_answer(", ".join(found))
+        return react_tool_call(tool, {"country": country})
+
+    agent = ReactAgent(llm=CountryLLM(respond), tool_registry=registry)
+
+    results = run_concurrently(agent, ["capital of France?", "capital of Japan?"])
+
+    assert results == {"capital of France?": "Paris", "capital of Japan?": "Tokyo"}
+
+
+def test_interleaved_react_sessions_keep_their_own_state():
+    registry = ToolRegistry()
+
+    def capital(country: str) -> str:
+        """Get the capital of a country."""
+        return f"capital found: {CAPITALS[country]}"
+
+    tool = registry.register_tool(capital)
+    agent = ReactAgent(
+        llm=ScriptLLM(
+            [
+                react_tool_call(tool, {"country": "France"}),
+                react_tool_call(tool, {"country": "Japan"}),
+                react_answer("Paris"),
+                react_answer("Tokyo"),
+            ]
+        ),
+        tool_registry=registry,
+    )
+
+    france = agent.start("capital of France?")
+    japan = agent.start("capital of Japan?")
+    results = {}
+    while not (france.is_done and japan.is_done):
+        for session in (france, japan):
+            result = agent.step(session)
+            if result is not None:
+                results[session.query] = result.content
+
+    assert results == {"capital of France?": "Paris", "capital of Japan?": "Tokyo"}
+    assert "capital found: Tokyo" not in str(france.messages)
+    assert "capital found: Paris" not in str(japan.messages)
+    assert france.run_id != japan.run_id
+
+
+def test_concurrent_rewoo_runs_keep_their_own_evidence():
+    registry, tool = make_registry()
+
+    def respond(country, found, prompt):
+        if "Evidence:" in prompt:
+            return ", ".join(found)
+        return [rewoo_tool_plan("E1", tool, {"country": country})]
+
+    agent = ReWOOAgent(llm=CountryLLM(respond), tool_registry=registry)
+
+    results = run_concurrently(agent, ["capital of France?", "capital of Japan?"])
+
+    assert results == {"capital of France?": "Paris", "capital of Japan?": "Tokyo"}
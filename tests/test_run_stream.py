@@ -0,0 +1,135 @@
+import asyncio
+import time
+
+import pytest
+
+from paaf.agents.react.agent import ReactAgent
+from paaf.agents.rewoo.rewoo_agent import ReWOOAgent
+from paaf.models.agent_response import AgentResponse
+from paaf.models.react.react_step_callback import ReactStepType
+from paaf.tools.tool_registory import ToolRegistry
+
+from fakes import ScriptLLM, react_answer, react_tool_call, rewoo_tool_plan
+
+
+def make_counting_agent(calls: int, max_iterations: int = 20):
+    registry = ToolRegistry()
+    counted = []
+
+    def count(n: int) -> int:
+        """Count."""
+        counted.append(n)
+        return n
+
+    tool = registry.register_tool(count)
+    llm = ScriptLLM(
+        [react_tool_call(tool, {"n": n}) for n in range(calls)] + [react_answer("done")]
+    )
+    agent = ReactAgent(llm=llm, tool_registry=registry, max_iterations=max_iterations)
+    return agent, llm, counted
+
+
+def test_react_stream_yields_each_step_then_the_response():
+    agent, _, _ = make_counting_agent(1)
+
+    items = list(agent.run_stream("count once"))
+
+    assert [item.step_type for item in items[:-1]] == [
+        ReactStepType.THINK,
+        ReactStepType.ACT,
+        ReactStepType.OBSERVE,
+        ReactStepType.THINK,
+        ReactStepType.FINAL,
+    ]
+    assert items[-2].is_final_step
+    assert isinstance(items[-1], AgentResponse)
+    assert items[-1].content == "done"
+
+
+def test_rewoo_stream_reports_plans_evidence_and_the_answer():
+    registry = ToolRegistry()
+
+    def search(query: str) -> str:
+        """Search the web."""
+        return f"results for {query}"
+
+    tool = registry.register_tool(search)
+    agent = ReWOOAgent(
+        llm=ScriptLLM([[rewoo_tool_plan("E1", tool, {"query": "paris"})], "Paris"]),
+        tool_registry=registry,
+    )
+
+    items = list(agent.run_stream("capital of France?"))
+
+    assert [item.step_type for item in items[:-1]] == ["plan", "evidence", "solve"]
+    assert items[-1].content == "Paris"
+
+
+def test_closing_the_stream_stops_the_run():
+    agent, llm, counted = make_counting_agent(5)
+
+    stream = agent.run_stream("count to five")
+    assert next(stream).step_type == ReactStepType.THINK
+    stream.close()
+
+    assert len(llm.prompts) == 1
+    assert counted == []
+
+
+def test_async_stream_yields_the_same_items():
+    agent, _, _ = make_counting_agent(1)
+
+    async def consume():
+        return [item async for item in agent.arun_stream("count once")]
+
+    items = asyncio.run(consume())
+
+    assert len(items) == 6
+    assert items[-1].content == "done"
+
+
+def test_a_slow_async_consumer_pauses_the_run():
+    agent, llm, counted = make_counting_agent(10)
+
+    async def consume():
+        stream = agent.arun_stream("count to ten", max_buffer=1)
+        first = await stream.__anext__()
+        # Room for one step in the buffer and one waiting to be handed over
+        await asyncio.sleep(0.2)
+        prompts_while_paused = len(llm.prompts)
+        await stream.aclose()
+        return first, prompts_while_paused
+
+    first, prompts_while_paused = asyncio.run(consume())
+
+    assert first.step_type == ReactStepType.THINK
+    assert prompts_while_paused == 1
+    assert len(llm.prompts) == 1
+    assert len(counted) <= 1
+
+
+def test_closing_the_async_stream_stops_the_run():
+    agent, llm, counted = make_counting_agent(10)
+
+    async def consume():
+        async for item in agent.arun_stream("count to ten", max_buffer=1):
+            if item.step_type == ReactStepType.OBSERVE:
+                break
+
+    asyncio.run(consume())
+    prompts = len(llm.prompts)
+    time.sleep(0.1)
+
+    # The run stopped after at most the step in progress, well before the answer
+    assert len(llm.prompts) == prompts <= 2
+    assert len(counted) <= 2
+
+
+def test_async_stream_raises_the_error_of_the_run():
+    agent = ReactAgent(llm=ScriptLLM([]))
+
+    async def consume():
+        return [item async for item in agent.arun_stream("anything")]
+
+    with pytest.raises(AssertionError, match="Unexpected LLM call"):
+        asyncio.run(consume())
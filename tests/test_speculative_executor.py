@@ -0,0 +1,137 @@
+from paaf.agents.react.agent import ReactAgent
+from paaf.agents.react.speculative_executor import HeuristicToolPredictor
+from paaf.models.react.react_loop_detection import ReactLoopLimits
+from paaf.models.react.react_run_state import ReactSession
+from paaf.models.react.react_step_callback import (
+    ReactExecutionSummary,
+    ReactStepSummary,
+    ReactStepType,
+)
+from paaf.tools.tool_registory import ToolRegistry
+
+from fakes import ScriptLLM, react_answer, react_tool_call
+
+
+def make_registry():
+    registry = ToolRegistry()
+    calls = []
+
+    def search(query: str) -> str:
+        """Search the web."""
+        calls.append(query)
+        return f"results for {query}"
+
+    registry.register_tool(search, side_effect_free=True)
+    return registry, next(iter(registry.tools.values())), calls
+
+
+def make_agent(script, predicted_queries, loop_limits=None):
+    """An agent predicting a search for `predicted_queries[n]` before its nth step."""
+    registry, tool, calls = make_registry()
+    predictions = list(predicted_queries)
+
+    def predictor(session, tools):
+        query = predictions.pop(0) if predictions else None
+        return [(tool, {"query": query})] if query else []
+
+    agent = ReactAgent(
+        llm=ScriptLLM(script(tool)),
+        tool_registry=registry,
+        tool_predictor=predictor,
+        loop_limits=loop_limits,
+    )
+    return agent, calls
+
+
+def session(query, steps=(), last_observation=None):
+    session = ReactSession(
+        query=query,
+        execution_summary=ReactExecutionSummary(query=query, agent_name="ReactAgent"),
+    )
+    session.execution_summary.steps.extend(steps)
+    session.loop.last_observation = last_observation
+    return session
+
+
+def test_predictor_looks_up_the_query_first():
+    _, tool, _ = make_registry()
+
+    assert HeuristicToolPredictor()(session("Who is Ada Lovelace?"), [tool]) == [
+        (tool, {"query": "Who is Ada Lovelace?"})
+    ]
+
+
+def test_predictor_looks_up_the_names_an_observation_mentions():
+    _, tool, _ = make_registry()
+    act = ReactStepSummary(
+        step_type=ReactStepType.ACT, step_number=1, tool_used="search"
+    )
+    state = session(
+        "Who is Ada Lovelace?",
+        steps=[act],
+        last_observation="She worked with Charles Babbage in London.",
+    )
+    state.loop.call_counts['search:{"query": "London"}'] = 1
+
+    assert HeuristicToolPredictor()(state, [tool]) == [
+        (tool, {"query": "Charles Babbage"})
+    ]
+
+
+def test_predicted_call_is_used_when_the_model_asks_for_it():
+    agent, calls = make_agent(
+        lambda tool: [react_tool_call(tool, {"query": "paris"}), react_answer("done")],
+        ["paris"],
+    )
+
+    agent.run("q")
+
+    assert calls == ["paris"]
+    stats = agent.get_speculation_stats()
+    assert (stats.launched, stats.hits, stats.wasted) == (1, 1, 0)
+
+
+def test_wrong_prediction_is_wasted_and_the_tool_is_called():
+    agent, calls = make_agent(
+        lambda tool: [react_tool_call(tool, {"query": "paris"}), react_answer("done")],
+        ["rome"],
+    )
+
+    agent.run("q")
+
+    assert sorted(calls) == ["paris", "rome"]
+    stats = agent.get_speculation_stats()
+    assert (stats.launched, stats.hits, stats.wasted) == (1, 0, 1)
+
+
+def test_predictions_left_when_the_run_ends_are_discarded():
+    agent, _ = make_agent(lambda tool: [react_answer("done")], ["paris"])
+
+    agent.run("q")
+
+    stats = agent.get_speculation_stats()
+    assert (stats.launched, stats.hits, stats.wasted) == (1, 0, 1)
+    assert not agent.speculative_executor._pending
+
+
+def test_reused_observation_doesnt_take_a_prediction():
+    agent, calls = make_agent(
+        lambda tool: [
+            react_tool_call(tool, {"query": "paris"}),
+            react_tool_call(tool, {"query": "paris"}),
+            react_answer("done"),
+        ],
+        [None, "rome"],
+        loop_limits=ReactLoopLimits(reuse_observations=True),
+    )
+    taken = []
+    take = agent.speculative_executor.take
+    agent.speculative_executor.take = lambda *args: taken.append(args) or take(*args)
+
+    agent.run("q")
+
+    assert len(taken) == 1
+
+    assert calls.count("paris") == 1
+    stats = agent.get_speculation_stats()
+    assert (stats.launched, stats.hits, stats.wasted) == (1, 0, 1)
@@ -0,0 +1,164 @@
+import threading
+
+from paaf.agents.rewoo.rewoo_agent import ReWOOAgent
+from paaf.agents.rewoo.step_runner import StepRunner
+from paaf.models.rewoo.rewoo_early_solve import LateEvidenceMode, RewooEarlySolveLimits
+from paaf.models.rewoo.rewoo_models import RewooPlan
+from paaf.tools.tool_registory import ToolRegistry
+
+from fakes import ScriptLLM, rewoo_handoff_plan, rewoo_tool_plan
+
+
+def plan(step_id, query=""):
+    return RewooPlan(
+        step_id=step_id,
+        reasoning="",
+        action_type="tool_call",
+        tool_choice={"name": "search", "tool_id": "search", "reason": ""},
+        tool_arguments={"query": query},
+    )
+
+
+def run_all(plans, finished=(), evidence=None, gates=None):
+    seen = {}
+
+    def execute(plan, evidence):
+        if gates and plan.step_id in gates:
+            gates[plan.step_id].wait(5)
+        seen[plan.step_id] = evidence
+        return f"evidence of {plan.step_id}"
+
+    runner = StepRunner(
+        plans,
+        finished=set(finished),
+        evidence=evidence or {},
+        execute=execute,
+        max_workers=4,
+    )
+    return runner, seen
+
+
+def test_steps_start_once_the_steps_they_use_are_done():
+    runner, seen = run_all([plan("E1"), plan("E2", "#E1"), plan("E3")])
+
+    runner.run_until(lambda: False)
+    runner.close()
+
+    assert seen["E2"]["E1"] == "evidence of E1"
+    assert set(runner.completed) == {"E1", "E2", "E3"}
+    assert runner.completed.index("E1") < runner.completed.index("E2")
+    assert not runner.pending
+
+
+def test_finished_steps_are_not_run_again():
+    runner, seen = run_all(
+        [plan("E1"), plan("E2", "#E1")],
+        finished={"E1"},
+        evidence={"E1": "from before"},
+    )
+
+    runner.run_until(lambda: False)
+    runner.close()
+
+    assert runner.completed == ["E2"]
+    assert seen["E2"] == {"E1": "from before"}
+
+
+def test_run_until_returns_once_there_is_enough_evidence():
+    gate = threading.Event()
+    runner, _ = run_all([plan("E1"), plan("E2")], gates={"E2": gate})
+
+    runner.run_until(lambda: "E1" in runner.evidence)
+    assert runner.completed == ["E1"]
+    assert runner.pending
+
+    gate.set()
+    runner.run_until(lambda: False)
+    runner.close()
+    assert runner.completed == ["E1", "E2"]
+
+
+def test_cyclic_steps_run_in_plan_order():
+    runner, seen = run_all([plan("E1", "#E2"), plan("E2", "#E1")])
+
+    runner.run_until(lambda: False)
+    runner.close()
+
+    assert runner.completed == ["E1", "E2"]
+    assert seen["E1"] == {}
+
+
+def make_agent(late_evidence, script, gate):
+    registry = ToolRegistry()
+
+    def search(query: str) -> str:
+        """Search the web."""
+        if query == "slow":
+            gate.wait(5)
+        return f"results for {query}"
+
+    registry.register_tool(search)
+    tool = next(iter(registry.tools.values()))
+    plans = [
+        rewoo_tool_plan("E1", tool, {"query": "fast"}),
+        rewoo_tool_plan("E2", tool, {"query": "slow"}),
+    ]
+    llm = ScriptLLM([plans, *script])
+    agent = ReWOOAgent(
+        llm=llm,
+        tool_registry=registry,
+        early_solve=RewooEarlySolveLimits(quorum=0.5, late_evidence=late_evidence),
+    )
+    return agent, llm
+
+
+def test_solver_starts_on_a_quorum_and_ignores_late_evidence():
+    gate = threading.Event()
+    agent, llm = make_agent(LateEvidenceMode.IGNORE, ["draft"], gate)
+
+    try:
+        result = agent.run("q")
+    finally:
+        gate.set()
+
+    assert result.content == "draft"
+    assert "results for fast" in llm.prompts[1]
+    assert "results for slow" not in llm.prompts[1]
+
+
+def test_late_evidence_refines_the_answer():
+    gate = threading.Event()
+
+    def solve(prompt):
+        gate.set()
+        return "draft"
+
+    agent, llm = make_agent(LateEvidenceMode.REFINE, [solve, "refined"], gate)
+
+    result = agent.run("q")
+
+    assert result.content == "refined"
+    assert "results for slow" not in llm.prompts[1]
+    assert "draft" in llm.prompts[2] and "results for slow" in llm.prompts[2]
+
+
+def test_required_steps_are_waited_for():
+    gate = threading.Event()
+    threading.Timer(0.1, gate.set).start()
+    agent, llm = make_agent(LateEvidenceMode.IGNORE, ["answer"], gate)
+    agent.early_solve = RewooEarlySolveLimits(quorum=0.5, required_steps=["#E2"])
+
+    agent.run("q")
+
+    assert "results for slow" in llm.prompts[1]
+
+
+def test_solver_answers_when_no_plan_can_be_executed():
+    for early_solve in (RewooEarlySolveLimits(), None):
+        llm = ScriptLLM([[rewoo_handoff_plan("E1", "expert", "explain it")], "answer"])
+        agent = ReWOOAgent(llm=llm, early_solve=early_solve)
+
+        assert agent.run("q").content == "answer"
+        assert "#E1 = handoff to expert: explain it\nEvidence: No Evidence Found" in (
+            llm.prompts[-1]
+        )
@@ -0,0 +1,77 @@
+import pytest
+
+from paaf.agents.react.agent import ReactAgent
+from paaf.models.tool import ToolArgumentError
+from paaf.tools.tool_registory import ToolRegistry
+
+from fakes import ScriptLLM, react_answer, react_tool_call
+
+
+def make_registry():
+    registry = ToolRegistry()
+    calls = []
+
+    def add(a: int, b: int = 1) -> int:
+        """Add two numbers."""
+        calls.append((a, b))
+        return a + b
+
+    registry.register_tool(add)
+    return registry, next(iter(registry.tools.values())), calls
+
+
+def test_arguments_are_coerced_to_the_signature():
+    _, tool, calls = make_registry()
+
+    assert tool(a="2", b="3") == 5
+    assert calls == [(2, 3)]
+
+
+def test_defaults_of_the_function_still_apply():
+    _, tool, calls = make_registry()
+
+    assert tool.validate_arguments({"a": "2"}) == {"a": 2}
+    assert tool(a=2) == 3
+    assert calls == [(2, 1)]
+
+
+def test_invalid_arguments_never_reach_the_tool():
+    _, tool, calls = make_registry()
+
+    with pytest.raises(ToolArgumentError) as error:
+        tool(a="two", c=1)
+
+    assert "a:" in error.value.details
+    assert "c: unexpected argument" in error.value.details
+    assert calls == []
+
+
+def test_functions_without_a_model_are_called_as_is():
+    registry = ToolRegistry()
+
+    def echo(**kwargs) -> dict:
+        """Echo the arguments."""
+        return kwargs
+
+    tool = registry.register_tool(echo)
+
+    assert tool.argument_model is None
+    assert tool(anything="goes") == {"anything": "goes"}
+
+
+def test_react_feeds_the_validation_error_back_to_the_llm():
+    registry, tool, calls = make_registry()
+    llm = ScriptLLM(
+        [
+            react_tool_call(tool, {"a": "two"}),
+            react_tool_call(tool, {"a": 2}),
+            react_answer("3"),
+        ]
+    )
+    agent = ReactAgent(llm=llm, tool_registry=registry)
+
+    assert agent.run("what is 2 + 1?").content == "3"
+
+    assert calls == [(2, 1)]
+    assert "Invalid arguments for tool add" in llm.prompts[1]
+    assert "Fix the arguments" in llm.prompts[1]
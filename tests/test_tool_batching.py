@@ -0,0 +1,66 @@
+from paaf.agents.rewoo.rewoo_agent import NO_EVIDENCE, ReWOOAgent
+from paaf.tools.tool_registory import ToolRegistry
+
+from fakes import ScriptLLM, rewoo_tool_plan
+
+
+def make_registry(batches):
+    registry = ToolRegistry()
+
+    def lookup_many(arguments_list):
+        batches.append(arguments_list)
+        return [f"value of {arguments['key']}" for arguments in arguments_list]
+
+    @registry.tool(batch_callable=lookup_many)
+    def lookup(key: str) -> str:
+        """Look up a key."""
+        return f"value of {key}"
+
+    return registry, next(iter(registry.tools.values()))
+
+
+def test_call_batch_without_batch_implementation_calls_one_by_one():
+    registry = ToolRegistry()
+
+    @registry.tool()
+    def double(x: int) -> int:
+        """Double a number."""
+        return x * 2
+
+    tool = next(iter(registry.tools.values()))
+    assert tool.call_batch([{"x": 1}, {"x": "2"}]) == [2, 4]
+
+
+def test_rewoo_coalesces_calls_into_one_batch():
+    batches = []
+    registry, lookup = make_registry(batches)
+    plans = [
+        rewoo_tool_plan("E1", lookup, {"key": "a"}),
+        rewoo_tool_plan("E2", lookup, {"key": "b"}),
+    ]
+    llm = ScriptLLM([plans, "done"])
+
+    ReWOOAgent(llm=llm, tool_registry=registry).run("query")
+
+    assert batches == [[{"key": "a"}, {"key": "b"}]]
+    assert "value of a" in llm.prompts[-1] and "value of b" in llm.prompts[-1]
+
+
+def test_rewoo_batch_validates_arguments_once_and_skips_invalid_sets():
+    batches = []
+    registry, lookup = make_registry(batches)
+    validations = []
+    validate = lookup.validate_arguments
+
+    def counting_validate(arguments):
+        validations.append(arguments)
+        return validate(arguments)
+
+    lookup.validate_arguments = counting_validate
+    agent = ReWOOAgent(llm=ScriptLLM([]), tool_registry=registry)
+
+    results = agent._call_tool_batch(lookup, [{"key": "a"}, {"wrong": 1}, {"key": "c"}])
+
+    assert results == ["value of a", NO_EVIDENCE, "value of c"]
+    assert len(validations) == 3
+    assert batches == [[{"key": "a"}, {"key": "c"}]]
@@ -0,0 +1,135 @@
+import uuid
+
+from paaf.agents.react.agent import ReactAgent
+from paaf.agents.rewoo.rewoo_agent import ReWOOAgent
+from paaf.checkpoints.file_checkpoint_store import FileCheckpointStore
+from paaf.tools.tool_registory import ToolRegistry
+
+from fakes import ScriptLLM, react_answer, react_tool_call, rewoo_tool_plan
+
+
+class WorkerDied(BaseException):
+    """Stands in for the process running the agent being killed mid-run."""
+
+
+def make_registry(crash=False):
+    """A registry with a `search` tool, as a newly started process would build it."""
+    registry = ToolRegistry()
+
+    def search(query: str) -> str:
+        """Search the web."""
+        if crash:
+            raise WorkerDied()
+        return f"results for {query}"
+
+    registry.register_tool(search)
+    return registry, next(iter(registry.tools.values()))
+
+
+def test_tool_ids_only_depend_on_the_name():
+    _, first = make_registry()
+    _, second = make_registry()
+
+    assert first.tool_id == second.tool_id
+    assert first.to_dict() == second.to_dict()
+
+
+def test_react_prompts_are_identical_across_separately_built_agents():
+    prompts = []
+    for _ in range(2):
+        registry, search = make_registry()
+        llm = ScriptLLM(
+            [react_tool_call(search, {"query": "paris"}), react_answer("Paris")]
+        )
+        ReactAgent(llm=llm, tool_registry=registry).run("capital of France?")
+        prompts.append(llm.prompts)
+
+    assert prompts[0] == prompts[1]
+
+
+def test_rewoo_prompts_are_identical_across_separately_built_agents():
+    prompts = []
+    for _ in range(2):
+        registry, search = make_registry()
+        llm = ScriptLLM([[rewoo_tool_plan("E1", search, {"query": "paris"})], "Paris"])
+        ReWOOAgent(llm=llm, tool_registry=registry).run("capital of France?")
+        prompts.append(llm.prompts)
+
+    assert prompts[0] == prompts[1]
+
+
+def stale_tool_ids(store, run_id, tool):
+    """Rewrite a checkpoint as if it was written by a version with other tool ids."""
+    state = store.load(run_id).replace(tool.tool_id, str(uuid.uuid4()))
+    store.save(run_id, state)
+
+
+def test_react_resumes_with_a_fresh_registry(tmp_path):
+    store = FileCheckpointStore(str(tmp_path))
+    registry, search = make_registry(crash=True)
+    agent = ReactAgent(
+        llm=ScriptLLM([react_tool_call(search, {"query": "paris"})]),
+        tool_registry=registry,
+        checkpoint_store=store,
+    )
+    try:
+        agent.run("capital of France?")
+    except WorkerDied:
+        pass
+    (run_id,) = store.list_runs()
+    stale_tool_ids(store, run_id, search)
+
+    registry, _ = make_registry()
+    llm = ScriptLLM([react_answer("Paris")])
+    agent = ReactAgent(llm=llm, tool_registry=registry, checkpoint_store=store)
+
+    assert agent.resume(run_id).content == "Paris"
+    assert "results for paris" in llm.prompts[0]
+
+
+def test_rewoo_resumes_with_a_fresh_registry(tmp_path):
+    store = FileCheckpointStore(str(tmp_path))
+    registry, search = make_registry(crash=True)
+    agent = ReWOOAgent(
+        llm=ScriptLLM([[rewoo_tool_plan("E1", search, {"query": "paris"})]]),
+        tool_registry=registry,
+        checkpoint_store=store,
+    )
+    try:
+        agent.run("capital of France?")
+    except WorkerDied:
+        pass
+    (run_id,) = store.list_runs()
+    stale_tool_ids(store, run_id, search)
+
+    registry, _ = make_registry()
+    llm = ScriptLLM(["Paris"])
+    agent = ReWOOAgent(llm=llm, tool_registry=registry, checkpoint_store=store)
+
+    agent.resume(run_id)
+    assert "results for paris" in llm.prompts[0]
+
+
+def test_registering_a_tool_again_refreshes_the_prompts():
+    registry = ToolRegistry()
+
+    def search(query: str) -> str:
+        """Old description."""
+        return query
+
+    registry.register_tool(search)
+    agent = ReactAgent(llm=ScriptLLM([]), tool_registry=registry)
+    session = agent.start("q")
+    assert "Old description." in agent._build_prompt(session)
+    rewoo = ReWOOAgent(llm=ScriptLLM([]), tool_registry=registry)
+    plan_context = rewoo._plan_cache_context()
+
+    def search(query: str) -> str:
+        """New description."""
+        return query
+
+    registry.register_tool(search)
+
+    prompt = agent._build_prompt(session)
+    assert "New description." in prompt and "Old description." not in prompt
+    assert rewoo._plan_cache_context() != plan_context
@@ -0,0 +1,84 @@
+import threading
+import time
+
+import pytest
+
+from paaf.tools.tool_limits import TokenBucket, ToolLimiter
+from paaf.tools.tool_registory import ToolRegistry
+
+
+def test_concurrent_calls_never_exceed_max_concurrency():
+    registry = ToolRegistry()
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def fetch(url: str) -> str:
+        """Fetch a page."""
+        with lock:
+            running.append(url)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.remove(url)
+        return url
+
+    tool = registry.register_tool(fetch, max_concurrency=2)
+    threads = [threading.Thread(target=tool, kwargs={"url": str(i)}) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) == 2
+    metrics = registry.get_queue_metrics()["fetch"]
+    assert metrics.total_calls == 6
+    assert metrics.in_flight == 0
+    assert metrics.queued == 0
+    assert metrics.max_wait_time > 0
+
+
+def test_rate_limit_spaces_calls_after_the_burst():
+    bucket = TokenBucket(rate=50, capacity=2)
+
+    start = time.monotonic()
+    for _ in range(4):
+        bucket.acquire()
+
+    # Two calls go through right away, the other two wait for a token each
+    assert time.monotonic() - start >= 0.035
+
+
+def test_a_failed_call_releases_its_slot():
+    registry = ToolRegistry()
+
+    def fail() -> None:
+        """Always fails."""
+        raise RuntimeError("down")
+
+    tool = registry.register_tool(fail, max_concurrency=1)
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            tool()
+
+    assert registry.get_queue_metrics()["fail"].in_flight == 0
+
+
+def test_unlimited_tools_have_no_queue_metrics():
+    registry = ToolRegistry()
+
+    def search(query: str) -> str:
+        """Search."""
+        return query
+
+    registry.register_tool(search)
+
+    assert registry.get_queue_metrics() == {}
+
+
+@pytest.mark.parametrize(
+    "options", [{"max_concurrency": 0}, {"burst": 2}, {"rate_limit": 0}]
+)
+def test_invalid_limits_are_rejected(options):
+    with pytest.raises(ValueError):
+        ToolLimiter("search", **options)
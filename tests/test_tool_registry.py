@@ -0,0 +1,63 @@
+import pytest
+
+from paaf.models.tool import ToolUnavailableError
+from paaf.tools.tool_registory import ToolRegistry
+
+
+def register_failing(registry, **options):
+    @registry.tool(**options)
+    def flaky(x: int) -> int:
+        """Always fails."""
+        raise RuntimeError("down")
+
+    return next(iter(registry.tools.values()))
+
+
+def test_circuit_breaking_is_off_by_default():
+    registry = ToolRegistry()
+    tool = register_failing(registry)
+
+    for _ in range(10):
+        with pytest.raises(RuntimeError):
+            tool(x=1)
+
+    assert tool.circuit_breaker is None
+    assert registry.available_tools() == [tool]
+
+
+def test_circuit_opens_after_the_opted_in_threshold():
+    registry = ToolRegistry()
+    tool = register_failing(registry, failure_threshold=2, recovery_timeout=60)
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            tool(x=1)
+
+    assert registry.available_tools() == []
+    with pytest.raises(ToolUnavailableError):
+        tool(x=1)
+
+
+def test_registry_wide_threshold_applies_to_every_tool():
+    registry = ToolRegistry(failure_threshold=1)
+    tool = register_failing(registry)
+
+    with pytest.raises(RuntimeError):
+        tool(x=1)
+
+    assert not tool.is_available
+
+
+def test_burst_requires_a_rate_limit():
+    registry = ToolRegistry()
+
+    def search(query: str) -> str:
+        """Search."""
+        return query
+
+    with pytest.raises(ValueError, match="rate_limit"):
+        registry.register_tool(search, burst=3)
+
+    tool = registry.register_tool(search, rate_limit=100, burst=3)
+    assert tool.limiter is not None
+    assert tool(query="q") == "q"
@@ -0,0 +1,115 @@
+import time
+
+import pytest
+
+from paaf.agents.react.agent import ReactAgent
+from paaf.models.react.react_step_callback import ReactStepType
+from paaf.tools.tool_registory import ToolRegistry
+from paaf.tools.tool_stats import ToolStats
+
+from fakes import ScriptLLM, react_answer, react_tool_call
+
+
+def test_calls_errors_and_result_sizes_are_counted():
+    registry = ToolRegistry()
+
+    def lookup(key: str) -> str:
+        """Look up a key."""
+        if key == "missing":
+            raise KeyError(key)
+        return f"value of {key}"
+
+    tool = registry.register_tool(lookup)
+    tool(key="a")
+    tool(key="bb")
+    with pytest.raises(KeyError):
+        tool(key="missing")
+
+    stats = registry.get_stats()["lookup"]
+    assert stats.call_count == 3
+    assert stats.error_count == 1
+    assert stats.total_result_size == len("value of a") + len("value of bb")
+    assert stats.min_latency_ms <= stats.p50_latency_ms <= stats.max_latency_ms
+
+
+def test_invalid_arguments_are_not_counted_as_calls():
+    registry = ToolRegistry()
+
+    def lookup(key: str) -> str:
+        """Look up a key."""
+        return key
+
+    tool = registry.register_tool(lookup)
+    with pytest.raises(ValueError):
+        tool(other="a")
+
+    assert registry.get_stats()["lookup"].call_count == 0
+
+
+def test_percentiles_follow_the_latency_histogram():
+    stats = ToolStats("search")
+    for _ in range(90):
+        stats.record(3)
+    for _ in range(10):
+        stats.record(400)
+
+    snapshot = stats.snapshot()
+    assert snapshot.call_count == 100
+    # Estimates are only as precise as the bucket they fall in (2-5ms)
+    assert 3 <= snapshot.p50_latency_ms <= 5
+    assert 200 < snapshot.p95_latency_ms <= 400
+    assert snapshot.p99_latency_ms <= snapshot.max_latency_ms == 400
+    assert snapshot.min_latency_ms == 3
+
+
+def test_latencies_above_the_last_bucket_stay_within_the_observed_range():
+    stats = ToolStats("export")
+    stats.record(500_000)
+
+    snapshot = stats.snapshot()
+    assert snapshot.p50_latency_ms == snapshot.p99_latency_ms == 500_000
+
+
+def test_reset_forgets_every_call():
+    registry = ToolRegistry()
+
+    def ping() -> str:
+        """Ping."""
+        return "pong"
+
+    tool = registry.register_tool(ping)
+    tool()
+    registry.reset_stats()
+
+    stats = registry.get_stats()["ping"]
+    assert stats.call_count == 0
+    assert stats.p50_latency_ms is None
+
+
+def test_react_steps_report_the_tool_duration():
+    registry = ToolRegistry()
+
+    def slow_search(query: str) -> str:
+        """Search slowly."""
+        time.sleep(0.01)
+        return "Paris"
+
+    tool = registry.register_tool(slow_search)
+    agent = ReactAgent(
+        llm=ScriptLLM(
+            [react_tool_call(tool, {"query": "capital"}), react_answer("Paris")]
+        ),
+        tool_registry=registry,
+    )
+
+    session = agent.start("capital of France?")
+    while not session.is_done:
+        agent.step(session)
+
+    (act,) = [
+        step
+        for step in session.execution_summary.steps
+        if step.step_type == ReactStepType.ACT
+    ]
+    assert act.duration_ms >= 10
+    assert registry.get_stats()["slow_search"].call_count == 1
@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from paaf.models.tool_stream import ToolStreamLimits
+from paaf.tools.tool_registory import ToolRegistry
+
+
+def register(func):
+    registry = ToolRegistry()
+    return registry.register_tool(func)
+
+
+def test_generator_tool_stops_at_the_item_limit():
+    produced = []
+
+    def numbers(count: int):
+        """Yield numbers."""
+        for number in range(count):
+            produced.append(number)
+            yield number
+
+    tool = register(numbers)
+    result = tool.collect({"count": 100}, ToolStreamLimits(max_items=3))
+
+    assert result.items == [0, 1, 2]
+    assert result.truncated
+    assert produced == [0, 1, 2]
+
+
+def test_async_generator_tool_is_collected_from_sync_code():
+    async def words(text: str):
+        """Yield words."""
+        for word in text.split():
+            yield word
+
+    tool = register(words)
+    result = tool.collect({"text": "a b c"}, ToolStreamLimits(max_items=10))
+
+    assert result.items == ["a", "b", "c"]
+    assert not result.truncated
+
+
+def test_async_generator_tool_inside_a_running_loop():
+    async def words(text: str):
+        """Yield words."""
+        for word in text.split():
+            yield word
+
+    tool = register(words)
+    limits = ToolStreamLimits(max_items=2)
+
+    async def main():
+        with pytest.raises(RuntimeError, match="acollect"):
+            tool.collect({"text": "a b c"}, limits)
+        return await tool.acollect({"text": "a b c"}, limits)
+
+    result = asyncio.run(main())
+
+    assert result.items == ["a", "b"]
+    assert result.truncated